@@ -110,7 +110,8 @@ def main():
             model,
             name,
             output_dir="outputs/cadquery",
-            create_projections=False  # 大量の2D投影は省略
+            create_projections=False,  # 大量の2D投影は省略
+            use_cache=True  # モデルが変わっていなければ書き出しを省略
         )
 
     print("\n[SUCCESS] すべてのモデル生成が完了しました!")
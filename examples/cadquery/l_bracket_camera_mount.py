@@ -166,7 +166,8 @@ def main():
         bracket,
         "l_bracket_camera_mount",
         output_dir="outputs/l_bracket",
-        create_projections=True
+        create_projections=True,
+        use_cache=True  # モデルが変わっていなければ書き出しを省略
     )
 
     print("\n=== 生成完了 ===")
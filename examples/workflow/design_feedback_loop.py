@@ -14,8 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import cadquery as cq
 from scripts.cadquery_utils import export_step, export_stl, export_dxf, export_svg
-from scripts.dxf_parser import parse_dxf
-from scripts.svg_parser import parse_svg
+from scripts.analysis_result import result_from_dict, save_results
+from scripts.parse_batch import parse_many
 
 
 def design_simple_bracket(width=80, height=60, thickness=10, hole_diameter=8):
@@ -90,52 +90,64 @@ def export_design(model, name_prefix: str, output_dir: str):
     return results
 
 
-def analyze_exports(exported_files: dict, report_dir: str):
+def report_path_for(report_dir: str, key: str) -> str:
+    """解析結果のキー（dxf_XY / svg 等）に対応する個別レポートのパス"""
+    return f"{report_dir}/{key}_report.txt"
+
+
+def analyze_exports(exported_files: dict, report_dir: str, workers: int = None):
     """
     エクスポートされたファイルを解析してレポート生成
 
+    DXF（各平面）とSVGはプロセスプールで並行して解析する。
+
     Args:
         exported_files: エクスポートされたファイルのパス辞書
         report_dir: レポート出力ディレクトリ
+        workers: 解析のワーカープロセス数（Noneならファイル数とCPU数の小さい方）
 
     Returns:
-        dict: 生成されたレポートのパス
+        dict: 解析に成功したファイルの解析結果 {キー: DXFAnalysis | SVGAnalysis}
     """
     Path(report_dir).mkdir(parents=True, exist_ok=True)
 
     print(f"\n=== エクスポートファイルを解析 ===")
 
-    reports = {}
-
-    # DXFファイルを解析
+    # 解析対象: {レポートのキー: (ファイルパス, レポートパス)}
+    jobs = {}
     for key, path in exported_files.items():
         if key.startswith("dxf_"):
             plane = key.split("_")[1].upper()
-            report_path = f"{report_dir}/dxf_{plane}_report.txt"
-            print(f"\n--- DXF解析: {plane}平面 ---")
-            parser = parse_dxf(path, report_path)
-            if parser:
-                reports[f"dxf_{plane}"] = report_path
-
-    # SVGファイルを解析
+            jobs[f"dxf_{plane}"] = (path, report_path_for(report_dir, f"dxf_{plane}"))
     if "svg" in exported_files:
-        report_path = f"{report_dir}/svg_report.txt"
-        print(f"\n--- SVG解析 ---")
-        parser = parse_svg(exported_files["svg"], report_path)
-        if parser:
-            reports["svg"] = report_path
+        jobs["svg"] = (exported_files["svg"], report_path_for(report_dir, "svg"))
 
-    print(f"\n[SUCCESS] {len(reports)} 個のレポートを生成しました")
-    return reports
+    results = parse_many(
+        [path for path, _ in jobs.values()],
+        workers=workers,
+        report_paths=[report_path for _, report_path in jobs.values()]
+    )
 
+    analyses = {}
+    for key, result in zip(jobs, results):
+        if result["status"] == "success":
+            analyses[key] = result_from_dict(result["data"])
+            print(f"  - {key}: {Path(result['path']).name} ({result['seconds']:.2f}s)")
 
-def generate_summary_report(exported_files: dict, reports: dict, output_path: str):
+    print(f"\n[SUCCESS] {len(analyses)} 個のレポートを生成しました")
+    return analyses
+
+
+def generate_summary_report(exported_files: dict, analyses: dict, report_dir: str, output_path: str):
     """
     統合サマリーレポートを生成
 
+    各ファイルの詳細は解析結果から描画する（個別レポートのファイルは読み戻さない）。
+
     Args:
         exported_files: エクスポートされたファイル辞書
-        reports: 生成されたレポート辞書
+        analyses: analyze_exports()の解析結果 {キー: DXFAnalysis | SVGAnalysis}
+        report_dir: 個別レポートの出力ディレクトリ
         output_path: サマリーレポート出力先
     """
     lines = []
@@ -153,18 +165,24 @@ def generate_summary_report(exported_files: dict, reports: dict, output_path: st
 
     # 解析レポート一覧
     lines.append("## 生成された解析レポート")
-    for key, path in sorted(reports.items()):
-        lines.append(f"- {key}: {path}")
+    for key in sorted(analyses):
+        lines.append(f"- {key}: {report_path_for(report_dir, key)}")
+    lines.append("")
+
+    # 解析結果の概要（構造化データから集計）
+    lines.append("## 解析結果概要")
+    for key, analysis in sorted(analyses.items()):
+        row = analysis.to_row()
+        lines.append(f"- {key}: 要素数 {row['entity_count']}, 円 {row['circle_count']} 個")
     lines.append("")
 
     # レポート内容を統合
     lines.append("## 解析結果詳細")
     lines.append("")
-    for key, report_path in sorted(reports.items()):
+    for key, analysis in sorted(analyses.items()):
         lines.append(f"### {key.upper()} 解析結果")
         lines.append("")
-        with open(report_path, 'r', encoding='utf-8') as f:
-            lines.append(f.read())
+        lines.append(analysis.to_report())
         lines.append("")
         lines.append("-" * 80)
         lines.append("")
@@ -211,11 +229,12 @@ def main():
     exported_files = export_design(bracket, "feedback_bracket", output_dir)
 
     # ステップ3: 解析
-    reports = analyze_exports(exported_files, report_dir)
+    analyses = analyze_exports(exported_files, report_dir)
+    save_results(list(analyses.values()), f"{report_dir}/analyses.json")
 
     # ステップ4: 統合レポート生成
     summary_path = f"{report_dir}/SUMMARY_REPORT.txt"
-    summary = generate_summary_report(exported_files, reports, summary_path)
+    summary = generate_summary_report(exported_files, analyses, report_dir, summary_path)
 
     # サマリーを表示
     print("\n" + "=" * 80)
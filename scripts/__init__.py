@@ -7,48 +7,60 @@ OpenSCAD Sandbox Scripts Package
 - solidpython_utils: SolidPython共通ユーティリティ
 - dxf_parser: DXFファイル解析モジュール
 - svg_parser: SVGファイル解析モジュール
+- analysis_result: DXF/SVG解析結果の構造化データ（JSON/MessagePack/Arrow）
+- parse_batch: DXF/SVGの並列一括解析
+
+公開名は初めて参照されたときにモジュールを読み込む（遅延インポート）。
+例えば `from scripts import SVGParser` ではcadquery/OCP・solid2・ezdxfは読み込まれない。
 """
 
-from .renderer import OpenSCADRenderer, render_multiple_views
-from .cadquery_utils import (
-    export_step,
-    export_stl,
-    export_all_formats,
-    convert_to_openscad,
-    create_2d_projections,
-    save_model_with_openscad_support,
-)
-from .solidpython_utils import (
-    save_scad_3d,
-    create_2d_projection_scad,
-    save_model_with_2d,
-    create_multiple_2d_projections,
-    batch_save_models,
-)
-from .dxf_parser import DXFParser, parse_dxf
-from .svg_parser import SVGParser, parse_svg
-
-__all__ = [
+import importlib
+
+# 公開名 → 定義しているモジュール
+_EXPORTS = {
     # renderer
-    "OpenSCADRenderer",
-    "render_multiple_views",
+    "OpenSCADRenderer": "renderer",
+    "render_multiple_views": "renderer",
     # cadquery_utils
-    "export_step",
-    "export_stl",
-    "export_all_formats",
-    "convert_to_openscad",
-    "create_2d_projections",
-    "save_model_with_openscad_support",
+    "export_step": "cadquery_utils",
+    "export_stl": "cadquery_utils",
+    "export_all_formats": "cadquery_utils",
+    "convert_to_openscad": "cadquery_utils",
+    "create_2d_projections": "cadquery_utils",
+    "save_model_with_openscad_support": "cadquery_utils",
     # solidpython_utils
-    "save_scad_3d",
-    "create_2d_projection_scad",
-    "save_model_with_2d",
-    "create_multiple_2d_projections",
-    "batch_save_models",
+    "save_scad_3d": "solidpython_utils",
+    "create_2d_projection_scad": "solidpython_utils",
+    "save_model_with_2d": "solidpython_utils",
+    "create_multiple_2d_projections": "solidpython_utils",
+    "batch_save_models": "solidpython_utils",
     # dxf_parser
-    "DXFParser",
-    "parse_dxf",
+    "DXFParser": "dxf_parser",
+    "parse_dxf": "dxf_parser",
     # svg_parser
-    "SVGParser",
-    "parse_svg",
-]
+    "SVGParser": "svg_parser",
+    "parse_svg": "svg_parser",
+    # analysis_result
+    "DXFAnalysis": "analysis_result",
+    "SVGAnalysis": "analysis_result",
+    "save_results": "analysis_result",
+    "load_results": "analysis_result",
+    # parse_batch
+    "parse_many": "parse_batch",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # 2回目以降は通常の属性として参照される
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+DXF/SVG解析結果の構造化データ
+
+DXFParser / SVGParser の解析結果（エンティティ数・バウンディングボックス・形状統計・
+先頭のエンティティ情報等）を型付きのデータクラスとして保持する。
+テキストレポートはこのデータクラスから描画するため、下流のツールはレポート本文を
+再解析せずにJSON / MessagePack / Arrowで結果を受け取れる。
+
+MessagePackとArrowはオプション依存（msgpack / pyarrow）で、使う時のみインポートする。
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+# レポートに表示するエンティティ数（種類ごと）
+REPORT_SAMPLE_SIZE = 5
+
+
+def _point(value) -> tuple:
+    """座標をタプルに戻す（JSON等を経由するとリストになるため）"""
+    return tuple(value)
+
+
+def _details(lines: List[str], title: str, count: int, samples: List[Dict], format_record):
+    """詳細情報の節（先頭のエンティティと残りの個数）"""
+    if not count:
+        return
+    lines.append(f"\n### {title}: {count} 個")
+    for i, record in enumerate(samples[:REPORT_SAMPLE_SIZE], 1):
+        lines.append(f"  {i}. {format_record(record)}")
+    if count > REPORT_SAMPLE_SIZE:
+        lines.append(f"  ... 他 {count - REPORT_SAMPLE_SIZE} 個")
+
+
+class _Serializable:
+    """to_dict()を持つ解析結果のシリアライズ"""
+
+    def to_dict(self) -> dict:
+        """
+        辞書に変換（JSON / MessagePackにそのまま書き出せる値のみ）
+
+        Returns:
+            dict: 解析結果の辞書（"kind"で種類を判別する）
+        """
+        return asdict(self)
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """JSON文字列に変換"""
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def to_msgpack(self) -> bytes:
+        """MessagePackのバイト列に変換"""
+        return _msgpack().packb(self.to_dict())
+
+    def save_report(self, output_path: str) -> str:
+        """
+        テキストレポートを描画して保存
+
+        Args:
+            output_path: レポート出力先パス
+
+        Returns:
+            str: レポートテキスト
+        """
+        report = self.to_report()
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"[SUCCESS] レポート保存: {output_path}")
+        return report
+
+
+@dataclass
+class DXFAnalysis(_Serializable):
+    """DXFファイルの解析結果"""
+
+    path: str
+    # ファイルサイズ（バイト）
+    file_size: int
+    dxfversion: Optional[str] = None
+    entity_count: int = 0
+    entity_types: Dict[str, int] = field(default_factory=dict)
+    # {"min": (X, Y), "max": (X, Y), "width", "height"}（エンティティがない場合はNone）
+    bbox: Optional[Dict] = None
+    # 形状統計 {"LINE": {...}, "CIRCLE": {...}, "ARC": {...}}
+    statistics: Dict[str, Dict] = field(default_factory=dict)
+    # 全ての円 [{center, radius, diameter}, ...]（穴の検証用）
+    circles: List[Dict] = field(default_factory=list)
+    # エンティティタイプごとの先頭 REPORT_SAMPLE_SIZE 個（DXFParser.get_*()と同じ形式）
+    samples: Dict[str, List[Dict]] = field(default_factory=dict)
+    # 輪郭の概要（輪郭を復元していない場合はNone）
+    # {"count", "outlines", "holes", "open_edges",
+    #  "samples": [{area, perimeter, is_hole, parent, hole_count}, ...]}（parentは0始まり、なしはNone）
+    contours: Optional[Dict] = None
+    kind: str = "dxf"
+
+    def to_row(self) -> dict:
+        """Arrowの表の1行（ARROW_COLUMNSの値）"""
+        bbox_min, bbox_max = (self.bbox["min"], self.bbox["max"]) if self.bbox else ((None, None), (None, None))
+        circle_stats = self.statistics.get("CIRCLE", {})
+        return {
+            "kind": self.kind,
+            "path": self.path,
+            "file_size": self.file_size,
+            "entity_count": self.entity_count,
+            "bbox_min_x": bbox_min[0],
+            "bbox_min_y": bbox_min[1],
+            "bbox_max_x": bbox_max[0],
+            "bbox_max_y": bbox_max[1],
+            "circle_count": len(self.circles),
+            "min_circle_diameter": circle_stats.get("min_diameter") if self.circles else None,
+            "max_circle_diameter": circle_stats.get("max_diameter") if self.circles else None,
+            "hole_count": self.contours["holes"] if self.contours else None,
+            "entity_types": sorted(self.entity_types.items()),
+            "data": self.to_json(),
+        }
+
+    def to_report(self) -> str:
+        """
+        テキストレポートを描画（DXFParser.generate_report()と同じ内容）
+
+        Returns:
+            str: レポートテキスト
+        """
+        lines = []
+        lines.append("=" * 80)
+        lines.append(f"DXF解析レポート: {Path(self.path).name}")
+        lines.append("=" * 80)
+        lines.append("")
+
+        # ファイル情報
+        lines.append("## ファイル情報")
+        lines.append(f"- ファイルパス: {self.path}")
+        lines.append(f"- ファイルサイズ: {self.file_size / 1024:.1f} KB")
+        lines.append(f"- DXFバージョン: {self.dxfversion}")
+        lines.append("")
+
+        # エンティティ統計
+        lines.append("## エンティティ統計")
+        lines.append(f"- 総エンティティ数: {self.entity_count}")
+        for entity_type, count in sorted(self.entity_types.items()):
+            lines.append(f"  - {entity_type}: {count}")
+        lines.append("")
+
+        # バウンディングボックス
+        if self.bbox:
+            lines.append("## バウンディングボックス")
+            lines.append(f"- 最小座標 (X, Y): ({self.bbox['min'][0]:.2f}, {self.bbox['min'][1]:.2f})")
+            lines.append(f"- 最大座標 (X, Y): ({self.bbox['max'][0]:.2f}, {self.bbox['max'][1]:.2f})")
+            lines.append(f"- 幅 x 高さ: {self.bbox['width']:.2f} x {self.bbox['height']:.2f}")
+            lines.append("")
+
+        # 形状統計
+        line_stats = self.statistics.get("LINE", {})
+        circle_stats = self.statistics.get("CIRCLE", {})
+        arc_stats = self.statistics.get("ARC", {})
+        if line_stats.get("count") or circle_stats.get("count") or arc_stats.get("count"):
+            lines.append("## 形状統計")
+            if line_stats.get("count"):
+                lines.append(f"- 線分: 総長 {line_stats['total_length']:.2f}, "
+                             f"長さ {line_stats['min_length']:.2f} - {line_stats['max_length']:.2f}")
+            if circle_stats.get("count"):
+                lines.append(f"- 円: 直径 {circle_stats['min_diameter']:.2f} - {circle_stats['max_diameter']:.2f}")
+            if arc_stats.get("count"):
+                lines.append(f"- 円弧: 総長 {arc_stats['total_length']:.2f}, "
+                             f"半径 {arc_stats['min_radius']:.2f} - {arc_stats['max_radius']:.2f}")
+            lines.append("")
+
+        # 輪郭（輪郭を復元した場合）
+        if self.contours is not None:
+            contours = self.contours
+            lines.append("## 輪郭")
+            lines.append(f"- 閉じた輪郭: {contours['count']} 個"
+                         f"（外形 {contours['outlines']}, 穴 {contours['holes']}）")
+            if contours["open_edges"]:
+                lines.append(f"- 閉じていない辺: {contours['open_edges']} 本")
+            for i, contour in enumerate(contours["samples"][:REPORT_SAMPLE_SIZE], 1):
+                if contour["is_hole"]:
+                    lines.append(f"  {i}. 穴 面積 {contour['area']:.2f}, 周長 {contour['perimeter']:.2f}, "
+                                 f"外側の輪郭 #{contour['parent'] + 1}")
+                else:
+                    lines.append(f"  {i}. 外形 面積 {contour['area']:.2f}, 周長 {contour['perimeter']:.2f}, "
+                                 f"穴 {contour['hole_count']} 個")
+            if contours["count"] > REPORT_SAMPLE_SIZE:
+                lines.append(f"  ... 他 {contours['count'] - REPORT_SAMPLE_SIZE} 個")
+            lines.append("")
+
+        # 詳細エンティティ情報（先頭のエンティティのみ表示）
+        lines.append("## 詳細エンティティ情報")
+
+        def add_details(dxftype, title, format_record):
+            _details(lines, title, self.entity_types.get(dxftype, 0),
+                     self.samples.get(dxftype, []), format_record)
+
+        # 線分
+        add_details("LINE", "線分（LINE）", lambda line: (
+            f"始点 {_point(line['start'])}, 終点 {_point(line['end'])}, 長さ {line['length']:.2f}"
+        ))
+
+        # 円
+        add_details("CIRCLE", "円（CIRCLE）", lambda circle: (
+            f"中心 {_point(circle['center'])}, 半径 {circle['radius']:.2f}, 直径 {circle['diameter']:.2f}"
+        ))
+
+        # 円弧
+        add_details("ARC", "円弧（ARC）", lambda arc: (
+            f"中心 {_point(arc['center'])}, 半径 {arc['radius']:.2f}, "
+            f"角度 {arc['start_angle']:.1f}°-{arc['end_angle']:.1f}°"
+        ))
+
+        # ポリライン
+        add_details("LWPOLYLINE", "ポリライン（LWPOLYLINE）", lambda pl: (
+            f"頂点数 {pl['vertex_count']}, 状態 {'閉' if pl['is_closed'] else '開'}"
+        ))
+
+        # 寸法
+        add_details("DIMENSION", "寸法（DIMENSION）", lambda dim: (
+            f"タイプ {dim['type']}, 測定値 {dim['measurement']:.2f}, テキスト '{dim['text']}'"
+        ))
+
+        lines.append("")
+        lines.append("=" * 80)
+        lines.append("[完了] DXF解析完了")
+        lines.append("=" * 80)
+
+        return "\n".join(lines)
+
+
+@dataclass
+class SVGAnalysis(_Serializable):
+    """SVGファイルの解析結果"""
+
+    path: str
+    # ファイルサイズ（バイト）
+    file_size: int
+    width: Optional[float] = None
+    height: Optional[float] = None
+    # {"min_x", "min_y", "width", "height"}（viewBoxがない場合はNone）
+    viewbox: Optional[Dict[str, float]] = None
+    # タグ名ごとの要素数（ルート要素を含む）
+    element_types: Dict[str, int] = field(default_factory=dict)
+    # 形状要素の個数 {"path", "circle", "rect", "line", "text"}
+    shape_counts: Dict[str, int] = field(default_factory=dict)
+    # 全てのcircle要素 [{cx, cy, r, diameter}, ...]
+    circles: List[Dict] = field(default_factory=list)
+    # 形状要素ごとの先頭 REPORT_SAMPLE_SIZE 個（SVGParser.get_*()と同じ形式、pathのdは含めない）
+    samples: Dict[str, List[Dict]] = field(default_factory=dict)
+    kind: str = "svg"
+
+    def to_row(self) -> dict:
+        """Arrowの表の1行（ARROW_COLUMNSの値）"""
+        viewbox = self.viewbox
+        diameters = [circle["diameter"] for circle in self.circles]
+        return {
+            "kind": self.kind,
+            "path": self.path,
+            "file_size": self.file_size,
+            "entity_count": sum(self.element_types.values()),
+            "bbox_min_x": viewbox["min_x"] if viewbox else None,
+            "bbox_min_y": viewbox["min_y"] if viewbox else None,
+            "bbox_max_x": viewbox["min_x"] + viewbox["width"] if viewbox else None,
+            "bbox_max_y": viewbox["min_y"] + viewbox["height"] if viewbox else None,
+            "circle_count": len(self.circles),
+            "min_circle_diameter": min(diameters) if diameters else None,
+            "max_circle_diameter": max(diameters) if diameters else None,
+            "hole_count": None,
+            "entity_types": sorted(self.element_types.items()),
+            "data": self.to_json(),
+        }
+
+    def to_report(self) -> str:
+        """
+        テキストレポートを描画（SVGParser.generate_report()と同じ内容）
+
+        Returns:
+            str: レポートテキスト
+        """
+        lines = []
+        lines.append("=" * 80)
+        lines.append(f"SVG解析レポート: {Path(self.path).name}")
+        lines.append("=" * 80)
+        lines.append("")
+
+        # ファイル情報
+        lines.append("## ファイル情報")
+        lines.append(f"- ファイルパス: {self.path}")
+        lines.append(f"- ファイルサイズ: {self.file_size / 1024:.1f} KB")
+        if self.width and self.height:
+            lines.append(f"- 幅 x 高さ: {self.width} x {self.height}")
+        lines.append("")
+
+        # viewBox情報
+        if self.viewbox:
+            lines.append("## viewBox情報")
+            lines.append(f"- 最小座標 (X, Y): ({self.viewbox['min_x']:.2f}, {self.viewbox['min_y']:.2f})")
+            lines.append(f"- 幅 x 高さ: {self.viewbox['width']:.2f} x {self.viewbox['height']:.2f}")
+            lines.append("")
+
+        # 要素統計
+        lines.append("## 要素統計")
+        lines.append(f"- 総要素数: {sum(self.element_types.values())}")
+        for elem_type, count in sorted(self.element_types.items()):
+            if count > 0:
+                lines.append(f"  - {elem_type}: {count}")
+        lines.append("")
+
+        # 詳細要素情報
+        lines.append("## 詳細要素情報")
+
+        def add_details(tag, format_record):
+            _details(lines, f"{tag}要素", self.shape_counts.get(tag, 0),
+                     self.samples.get(tag, []), format_record)
+
+        add_details("path", lambda path: (
+            f"コマンド数 {path['command_count']}" + (f", id='{path['id']}'" if path['id'] else "")
+        ))
+        add_details("circle", lambda circle: (
+            f"中心 ({circle['cx']:.2f}, {circle['cy']:.2f}), 半径 {circle['r']:.2f}, 直径 {circle['diameter']:.2f}"
+        ))
+        add_details("rect", lambda rect: (
+            f"位置 ({rect['x']:.2f}, {rect['y']:.2f}), サイズ {rect['width']:.2f} x {rect['height']:.2f}"
+        ))
+        add_details("line", lambda line: (
+            f"({line['x1']:.2f}, {line['y1']:.2f}) → ({line['x2']:.2f}, {line['y2']:.2f}), 長さ {line['length']:.2f}"
+        ))
+        add_details("text", lambda text: (
+            f"位置 ({text['x']:.2f}, {text['y']:.2f}), テキスト '{text['text']}'"
+        ))
+
+        lines.append("")
+        lines.append("=" * 80)
+        lines.append("[完了] SVG解析完了")
+        lines.append("=" * 80)
+
+        return "\n".join(lines)
+
+
+AnalysisResult = Union[DXFAnalysis, SVGAnalysis]
+
+_RESULT_CLASSES = {"dxf": DXFAnalysis, "svg": SVGAnalysis}
+
+# Arrowの表の列（1ファイル1行。dataは to_json() の全体）
+ARROW_COLUMNS = (
+    "kind", "path", "file_size", "entity_count",
+    "bbox_min_x", "bbox_min_y", "bbox_max_x", "bbox_max_y",
+    "circle_count", "min_circle_diameter", "max_circle_diameter", "hole_count",
+    "entity_types", "data",
+)
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack is required for MessagePack output (pip install msgpack)")
+    return msgpack
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow output (pip install pyarrow)")
+    return pyarrow
+
+
+def result_from_dict(data: dict) -> AnalysisResult:
+    """
+    to_dict()の辞書から解析結果を復元
+
+    Args:
+        data: 解析結果の辞書（"kind"が"dxf"または"svg"）
+
+    Returns:
+        DXFAnalysis | SVGAnalysis: 解析結果
+    """
+    kind = data.get("kind")
+    if kind not in _RESULT_CLASSES:
+        raise ValueError(f"Unknown analysis kind: {kind}")
+    return _RESULT_CLASSES[kind](**data)
+
+
+def results_to_arrow(results: List[AnalysisResult]):
+    """
+    解析結果をArrowの表に変換（1ファイル1行、集計用の列と全体のJSONを持つ）
+
+    Args:
+        results: 解析結果のリスト
+
+    Returns:
+        pyarrow.Table: ARROW_COLUMNSの列を持つ表
+    """
+    pa = _pyarrow()
+    schema = pa.schema([
+        ("kind", pa.string()),
+        ("path", pa.string()),
+        ("file_size", pa.int64()),
+        ("entity_count", pa.int64()),
+        ("bbox_min_x", pa.float64()),
+        ("bbox_min_y", pa.float64()),
+        ("bbox_max_x", pa.float64()),
+        ("bbox_max_y", pa.float64()),
+        ("circle_count", pa.int64()),
+        ("min_circle_diameter", pa.float64()),
+        ("max_circle_diameter", pa.float64()),
+        ("hole_count", pa.int64()),
+        ("entity_types", pa.map_(pa.string(), pa.int64())),
+        ("data", pa.string()),
+    ])
+    return pa.Table.from_pylist([result.to_row() for result in results], schema=schema)
+
+
+def save_results(results: List[AnalysisResult], output_path: str):
+    """
+    解析結果をまとめて保存（形式は拡張子で決める）
+
+    - .json: to_dict()のリスト
+    - .msgpack: to_dict()のリスト（MessagePack）
+    - .arrow: results_to_arrow()の表（Arrow IPCファイル）
+
+    Args:
+        results: 解析結果のリスト
+        output_path: 出力先パス
+    """
+    suffix = Path(output_path).suffix.lower()
+    if suffix == ".json":
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump([result.to_dict() for result in results], f, indent=2, ensure_ascii=False)
+    elif suffix == ".msgpack":
+        with open(output_path, 'wb') as f:
+            f.write(_msgpack().packb([result.to_dict() for result in results]))
+    elif suffix == ".arrow":
+        pa = _pyarrow()
+        table = results_to_arrow(results)
+        with pa.OSFile(str(output_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported results format: {suffix or output_path}")
+    print(f"[SUCCESS] {len(results)} 件の解析結果を保存: {output_path}")
+
+
+def load_results(input_path: str) -> List[AnalysisResult]:
+    """
+    save_results()で保存した解析結果を読み込み
+
+    Args:
+        input_path: .json / .msgpack / .arrow ファイルのパス
+
+    Returns:
+        List[DXFAnalysis | SVGAnalysis]: 解析結果のリスト
+    """
+    suffix = Path(input_path).suffix.lower()
+    if suffix == ".json":
+        with open(input_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+    elif suffix == ".msgpack":
+        with open(input_path, 'rb') as f:
+            records = _msgpack().unpackb(f.read())
+    elif suffix == ".arrow":
+        pa = _pyarrow()
+        with pa.memory_map(str(input_path), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        records = [json.loads(data) for data in table.column("data").to_pylist()]
+    else:
+        raise ValueError(f"Unsupported results format: {suffix or input_path}")
+    return [result_from_dict(record) for record in records]
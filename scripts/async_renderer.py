@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+OpenSCAD非同期レンダリングモジュール
+
+asyncioベースのサービスから、ジョブごとにスレッドを消費せずに
+多数のOpenSCADレンダリングを駆動するためのモジュール。
+"""
+
+import asyncio
+import inspect
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    from .renderer import DEFAULT_VIEWS, OpenSCADRenderer, build_render_options
+    from .render_cache import RenderCache
+    from .xvfb_pool import XvfbDisplayPool
+    from .render_metrics import RenderMetricsRecorder, RenderResult, parse_phases
+    from .render_backends import resolve_backend
+except ImportError:
+    # scripts/async_renderer.py として直接実行された場合
+    from renderer import DEFAULT_VIEWS, OpenSCADRenderer, build_render_options
+    from render_cache import RenderCache
+    from xvfb_pool import XvfbDisplayPool
+    from render_metrics import RenderMetricsRecorder, RenderResult, parse_phases
+    from render_backends import resolve_backend
+
+
+class AsyncOpenSCADRenderer:
+    """
+    asyncio.create_subprocess_execでOpenSCADを実行する非同期レンダラー
+
+    同時実行数はセマフォで制限し、タイムアウト・タスクのキャンセル・on_progressの例外で
+    レンダリングが中断された場合はOpenSCADの子プロセスをkillする。
+    子プロセスの回収はイベントループが行うため、計測値のピークRSSは取得しない。
+
+    Usage:
+        async with AsyncOpenSCADRenderer(max_concurrency=8) as renderer:
+            await renderer.render("model.scad", "output.png")
+            results = await renderer.render_views("model.scad", "outputs/model")
+    """
+
+    def __init__(
+        self,
+        display: int = 99,
+        pool: XvfbDisplayPool = None,
+        cache: RenderCache = None,
+        backend: str = None,
+        max_concurrency: int = 4,
+        metrics: RenderMetricsRecorder = None
+    ):
+        """
+        Args:
+            display: Xvfbディスプレイ番号（デフォルト: 99）
+            pool: Xvfbディスプレイプール（指定時はXvfbを起動せずプールから借りる）
+            cache: レンダリングキャッシュ
+            backend: 描画バックエンド（"xvfb", "egl", "software", "auto"）
+            max_concurrency: 同時に実行するOpenSCADプロセス数の上限
+            metrics: レンダリング計測値の記録先
+        """
+        # ディスプレイ・バックエンドの管理は同期版レンダラーに任せる
+        self._renderer = OpenSCADRenderer(
+            display=display, pool=pool, cache=cache, backend=backend, metrics=metrics
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    @property
+    def cache(self) -> Optional[RenderCache]:
+        return self._renderer.cache
+
+    @property
+    def metrics(self) -> Optional[RenderMetricsRecorder]:
+        return self._renderer.metrics
+
+    async def __aenter__(self):
+        """非同期コンテキストマネージャー: Xvfbを起動（またはプールから借りる）"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.to_thread(self._renderer.__enter__)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """非同期コンテキストマネージャー: Xvfbを停止（またはプールへ返却）"""
+        await asyncio.to_thread(self._renderer.__exit__, exc_type, exc_val, exc_tb)
+
+    async def render(
+        self,
+        scad_file: str,
+        output_file: str,
+        imgsize: tuple = (1920, 1080),
+        colorscheme: str = "Tomorrow",
+        projection: str = "p",
+        render_mode: bool = True,
+        camera: tuple = None,
+        autocenter: bool = True,
+        viewall: bool = True,
+        timeout: float = None,
+        on_progress: Callable[[str], None] = None
+    ) -> RenderResult:
+        """
+        OpenSCADファイルを非同期にレンダリングして画像を生成
+
+        Args:
+            scad_file: 入力SCADファイルパス
+            output_file: 出力画像ファイルパス
+            imgsize: 画像サイズ (width, height)
+            colorscheme: カラースキーム
+            projection: 投影タイプ（"p"=透視投影, "o"=平行投影）
+            render_mode: True=完全レンダリング, False=プレビューモード
+            camera: カメラ位置 (x,y,z,rx,ry,rz,d) または None
+            autocenter: 自動センタリング
+            viewall: 全体表示
+            timeout: タイムアウト秒数（超過時はOpenSCADをkillして失敗扱い）
+            on_progress: OpenSCADのstderrを1行ずつ受け取るコールバック（コルーチン関数も可）
+
+        Returns:
+            RenderResult: 結果と計測値（真偽値として評価すると成功可否）
+        """
+        result = await self._render(
+            scad_file, output_file, imgsize, colorscheme, projection, render_mode,
+            camera, autocenter, viewall, timeout, on_progress
+        )
+        if self.metrics is not None:
+            await asyncio.to_thread(self.metrics.record, result)
+        return result
+
+    async def _render(
+        self,
+        scad_file: str,
+        output_file: str,
+        imgsize: tuple,
+        colorscheme: str,
+        projection: str,
+        render_mode: bool,
+        camera: tuple,
+        autocenter: bool,
+        viewall: bool,
+        timeout: float,
+        on_progress: Callable[[str], None]
+    ) -> RenderResult:
+        """render()の本体（計測値の記録は行わない）"""
+        if self._semaphore is None:
+            raise RuntimeError("AsyncOpenSCADRenderer must be used with 'async with'")
+
+        options = build_render_options(
+            imgsize, colorscheme, projection, render_mode, camera, autocenter, viewall
+        )
+        cmd = ["openscad", "-o", output_file, *options, scad_file]
+
+        async with self._semaphore:
+            # キャッシュ確認（依存ファイルのハッシュ計算はブロッキングI/Oのためスレッドで実行）
+            cache_key = None
+            if self.cache is not None:
+                start_time = time.monotonic()
+                cache_key = await asyncio.to_thread(
+                    self.cache.compute_key, scad_file, options, Path(output_file).suffix,
+                    backend=resolve_backend(self._renderer.backend)
+                )
+                if await asyncio.to_thread(self.cache.fetch, cache_key, output_file):
+                    print(f"[CACHE HIT] {scad_file} -> {output_file}")
+                    return RenderResult(
+                        success=True,
+                        scad_file=scad_file,
+                        output_file=output_file,
+                        cache_hit=True,
+                        wall_seconds=time.monotonic() - start_time,
+                        output_bytes=Path(output_file).stat().st_size
+                    )
+
+            print(f"Rendering {scad_file} (async)...")
+            start_time = time.monotonic()
+
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                env=self._renderer.openscad_env(),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+
+            stderr_lines = []
+            timed_out = False
+            try:
+                await asyncio.wait_for(
+                    self._stream_stderr(process, stderr_lines, on_progress, start_time),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                timed_out = True
+            finally:
+                # タイムアウト・キャンセル・コールバックの例外のいずれでも子プロセスを残さない
+                if process.returncode is None:
+                    await self._kill(process)
+
+            elapsed_time = time.monotonic() - start_time
+
+        result = RenderResult(
+            success=process.returncode == 0 and not timed_out,
+            scad_file=scad_file,
+            output_file=output_file,
+            wall_seconds=elapsed_time,
+            phases=parse_phases(stderr_lines, elapsed_time),
+            stderr="".join(line for _, line in stderr_lines)
+        )
+
+        if timed_out:
+            result.error = f"Timed out after {timeout}s"
+            print(f"[FAILED] Rendering failed")
+            print(f"  Error: {result.error}")
+        elif result.success:
+            if cache_key is not None:
+                await asyncio.to_thread(self.cache.store, cache_key, output_file, elapsed_time)
+            result.output_bytes = Path(output_file).stat().st_size
+            print(f"[SUCCESS] Rendered successfully: {output_file}")
+            print(f"  File size: {result.output_bytes / 1024:.1f} KB")
+            print(f"  Time: {elapsed_time:.2f}s")
+        else:
+            result.error = result.stderr
+            print(f"[FAILED] Rendering failed")
+            print(f"  Error: {result.error}")
+
+        return result
+
+    @staticmethod
+    async def _stream_stderr(process, stderr_lines: list, on_progress, start_time: float):
+        """stderrを1行ずつ（起動からの経過秒と共に）読み、コールバックに渡しながらプロセス終了を待つ"""
+        async for raw_line in process.stderr:
+            line = raw_line.decode(errors="replace")
+            stderr_lines.append((time.monotonic() - start_time, line))
+            if on_progress is not None:
+                result = on_progress(line.rstrip("\n"))
+                if inspect.isawaitable(result):
+                    await result
+        await process.wait()
+
+    @staticmethod
+    async def _kill(process):
+        """子プロセスをkillして回収"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    async def render_views(
+        self,
+        scad_file: str,
+        output_prefix: str,
+        views: dict = None,
+        **kwargs
+    ) -> dict:
+        """
+        複数のビューを並行にレンダリング（同時実行数はセマフォで制限）
+
+        Args:
+            scad_file: 入力SCADファイル
+            output_prefix: 出力ファイル名のプレフィックス
+            views: ビュー設定の辞書 {"view_name": {"camera": (...), ...}}
+            **kwargs: render()の共通オプション
+
+        Returns:
+            dict: {"view_name": "output_file_path", ...}
+        """
+        if views is None:
+            views = DEFAULT_VIEWS
+
+        outputs = {name: f"{output_prefix}_{name}.png" for name in views}
+        successes = await asyncio.gather(*(
+            self.render(scad_file, outputs[name], **{**kwargs, **settings})
+            for name, settings in views.items()
+        ))
+
+        return {
+            name: outputs[name]
+            for name, success in zip(views, successes)
+            if success
+        }
@@ -5,23 +5,244 @@ CadQuery共通ユーティリティモジュール
 CadQueryモデルの保存、エクスポート、OpenSCAD連携のための再利用可能な関数。
 """
 
-import cadquery as cq
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 
+import cadquery as cq
+from cadquery.occ_impl.exporters.dxf import DxfDocument
+from OCP.BRep import BRep_Builder, BRep_Tool
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Section
+from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeFace
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.StlAPI import StlAPI_Writer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS_Compound
+from OCP.gp import gp_Dir, gp_Pln, gp_Pnt
+
+try:
+    from .export_cache import ExportManifest, brep_bytes, export_key, shape_hash, worker_context
+    from .hlr_projection import create_native_projections
+except ImportError:
+    # scripts/cadquery_utils.py として直接実行された場合
+    from export_cache import ExportManifest, brep_bytes, export_key, shape_hash, worker_context
+    from hlr_projection import create_native_projections
+
+
+# STL/3MFの三角形分割の許容差（cq.exporters.exportのデフォルトと同じ）
+DEFAULT_TOLERANCE = 0.1
+DEFAULT_ANGULAR_TOLERANCE = 0.1
+
+# 適応モードの三角形分割: 弦誤差（mm）をバウンディングボックス対角長の比率で決め、上下限で丸める。
+# 大きな平面の多い部品は粗く、小さな穴・フィレットは角度許容差で分割数を確保する
+ADAPTIVE_DEFLECTION_RATIO = 0.001
+ADAPTIVE_DEFLECTION_MIN = 0.01
+ADAPTIVE_DEFLECTION_MAX = 0.5
+ADAPTIVE_ANGULAR_TOLERANCE = 0.3
+
+# 1回のBRepAlgoAPI_Sectionにまとめる平面の最小間隔。これより近い平面は交線が
+# どちらか一方にまとめられてしまうため、別の演算で切る
+_SECTION_MIN_SPACING = 1e-5
+
+# 断面平面ごとの回転（回転後のモデルをZ=高さで切ると、その平面の断面になる）
+_SECTION_ROTATIONS = {
+    "XY": None,
+    "XZ": ((1, 0, 0), 90),
+    "YZ": ((0, 1, 0), 90),
+}
+
+
+def _model_shape(model) -> cq.Shape:
+    """CadQueryモデル（WorkplaneまたはShape）を1つのShapeにまとめる"""
+    if isinstance(model, cq.Shape):
+        return model
+    shapes = [v for v in model.vals() if isinstance(v, cq.Shape)]
+    if len(shapes) == 1:
+        return shapes[0]
+    return cq.Compound.makeCompound(shapes)
+
+
+def tessellation_params(
+    model,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False
+) -> dict:
+    """
+    三角形分割の許容差を決める
+
+    通常はCadQueryと同じ相対許容差（エッジ長に対する比率）を使う。
+    adaptive=True の場合はバウンディングボックスの大きさから絶対許容差（mm）を決める。
+
+    Args:
+        model: CadQueryモデル
+        tolerance: 線形許容差（Noneならデフォルト、適応モードでは自動）
+        angular_tolerance: 角度許容差（ラジアン、Noneならデフォルト）
+        adaptive: バウンディングボックスから許容差を決める
+
+    Returns:
+        dict: {"tolerance", "angular_tolerance", "relative"}
+    """
+    if not adaptive:
+        return {
+            "tolerance": DEFAULT_TOLERANCE if tolerance is None else tolerance,
+            "angular_tolerance": (
+                DEFAULT_ANGULAR_TOLERANCE if angular_tolerance is None else angular_tolerance
+            ),
+            "relative": True,
+        }
+
+    if tolerance is None:
+        diagonal = _model_shape(model).BoundingBox().DiagonalLength
+        tolerance = min(
+            max(diagonal * ADAPTIVE_DEFLECTION_RATIO, ADAPTIVE_DEFLECTION_MIN),
+            ADAPTIVE_DEFLECTION_MAX
+        )
+    return {
+        "tolerance": round(tolerance, 6),
+        "angular_tolerance": (
+            ADAPTIVE_ANGULAR_TOLERANCE if angular_tolerance is None else angular_tolerance
+        ),
+        "relative": False,
+    }
+
+
+def tessellate_model(
+    model,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False
+) -> cq.Shape:
+    """
+    モデルを一度だけ三角形分割する
+
+    三角形分割の結果は戻り値のShapeの各面に保持されるため、
+    export_stl() / export_3mf() / convert_to_openscad() に mesh として渡すと
+    メッシュを再計算せずに書き出せる。
+
+    Args:
+        model: CadQueryモデル
+        tolerance: 線形許容差（通常はエッジ長に対する相対値、適応モードではmm）
+        angular_tolerance: 角度許容差（ラジアン）
+        adaptive: バウンディングボックスから許容差を決める（tessellation_params()参照）
+
+    Returns:
+        cq.Shape: 三角形分割済みのShape
+    """
+    shape = _model_shape(model)
+    params = tessellation_params(shape, tolerance, angular_tolerance, adaptive)
+    # OCCTは既存の分割より粗い指定では再分割しないため、許容差が変わったら分割を破棄する。
+    # 許容差の記録がないShape（複数ソリッドのWorkplaneから毎回作るCompoundや、
+    # 他で分割されたShape）は既存の分割の許容差が分からないため、同じく破棄する
+    if getattr(shape, "_tessellation_params", None) != params:
+        BRepTools.Clean_s(shape.wrapped)
+    BRepMesh_IncrementalMesh(
+        shape.wrapped, params["tolerance"], params["relative"], params["angular_tolerance"], True
+    )
+    shape._tessellation_params = params
+    return shape
+
+
+def _mesh_for_export(
+    model,
+    mesh: cq.Shape,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False
+):
+    """
+    書き出しに使う三角形分割と、キャッシュキーに使う許容差を決める
+
+    tessellate_model()の戻り値はその許容差を使う。許容差の記録がないShapeは
+    既存の分割の許容差が分からないため、指定の許容差で分割し直す前提でキャッシュキーを作る。
+
+    Args:
+        model: CadQueryモデル
+        mesh: tessellate_model()の戻り値（None可）
+        tolerance, angular_tolerance, adaptive: meshの許容差が分からない場合の指定
+            （tessellation_params()参照）
+
+    Returns:
+        tuple: (再利用できる分割済みShapeまたはNone, 分割し直す場合の元Shape, 許容差dict)
+    """
+    if mesh is not None and getattr(mesh, "_tessellation_params", None) is not None:
+        return mesh, None, mesh._tessellation_params
+    source = model if mesh is None else mesh
+    return None, source, tessellation_params(source, tolerance, angular_tolerance, adaptive)
+
+
+def mesh_statistics(mesh: cq.Shape) -> dict:
+    """
+    三角形分割済みShapeの三角形数・頂点数
+
+    Args:
+        mesh: tessellate_model()の戻り値
+
+    Returns:
+        dict: {"triangles", "nodes"}
+    """
+    triangles = nodes = 0
+    for face in mesh.Faces():
+        triangulation = BRep_Tool.Triangulation_s(face.wrapped, TopLoc_Location())
+        if triangulation is not None:
+            triangles += triangulation.NbTriangles()
+            nodes += triangulation.NbNodes()
+    return {"triangles": triangles, "nodes": nodes}
+
+
+def _export_cache_lookup(
+    model,
+    output_path: str,
+    export_format: str,
+    options: dict = None,
+    digest: str = None
+):
+    """
+    エクスポートキャッシュを確認
 
-def export_step(model, output_path: str):
+    Args:
+        digest: shape_hash(model)の計算済みの値（複数ファイルを確認する場合の再利用用）
+
+    Returns:
+        tuple: (キャッシュヒットしたか, 書き出し成功後に呼ぶ記録関数)
+    """
+    if digest is None:
+        digest = shape_hash(model)
+    key = export_key(digest, export_format, options)
+    manifest = ExportManifest(Path(output_path).parent)
+    if manifest.restore(key, output_path):
+        print(f"[CACHED] {export_format.upper()} export: {output_path}")
+        return True, None
+    manifest.prepare(output_path)
+    return False, lambda: manifest.record(key, output_path, digest)
+
+
+def export_step(model, output_path: str, use_cache: bool = False):
     """
     STEP形式でエクスポート（CADソフトで編集可能な高品質形式）
 
     Args:
         model: CadQueryモデル
         output_path: 出力ファイルパス
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
 
     Returns:
         bool: 成功時True
     """
+    record = None
+    if use_cache:
+        hit, record = _export_cache_lookup(model, output_path, "step")
+        if hit:
+            return True
+
     try:
         cq.exporters.export(model, output_path)
+        if record is not None:
+            record()
         file_size = Path(output_path).stat().st_size / 1024
         print(f"[SUCCESS] STEP export: {output_path} ({file_size:.1f} KB)")
         return True
@@ -30,28 +251,120 @@ def export_step(model, output_path: str):
         return False
 
 
-def export_stl(model, output_path: str):
+def export_stl(
+    model,
+    output_path: str,
+    mesh: cq.Shape = None,
+    use_cache: bool = False,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False,
+    ascii: bool = False
+):
     """
     STL形式でエクスポート（3Dプリント用）
 
+    デフォルトはバイナリSTL。StlAPI_WriterがOCCTの三角形分割から直接（Pythonの
+    オブジェクトを作らずに）書き出す。ASCII形式は約5倍のサイズになり、書き出しも
+    OpenSCADでのimport()も遅いため、テキストで確認したい場合のみ指定する。
+
+    フィレットの多い部品はデフォルトの許容差では三角形が多すぎ、小さな穴は粗くなりやすい。
+    adaptive=True でバウンディングボックスに応じた許容差を使うと、STLが小さくなり
+    OpenSCADのimport()も速くなる。
+
     Args:
         model: CadQueryモデル
         output_path: 出力ファイルパス
+        mesh: tessellate_model()の戻り値（指定時は三角形分割を再利用し、許容差の指定は無視。
+            許容差の記録がないShapeは指定の許容差で分割し直す）
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
+        tolerance: 線形許容差（通常はエッジ長に対する相対値、適応モードではmm）
+        angular_tolerance: 角度許容差（ラジアン）
+        adaptive: バウンディングボックスから許容差を決める
+        ascii: ASCII形式で書き出す
 
     Returns:
         bool: 成功時True
     """
+    mesh, source, params = _mesh_for_export(model, mesh, tolerance, angular_tolerance, adaptive)
+
+    record = None
+    if use_cache:
+        options = {**params, "ascii": True} if ascii else params
+        hit, record = _export_cache_lookup(model, output_path, "stl", options)
+        if hit:
+            return True
+
     try:
-        cq.exporters.export(model, output_path)
+        start_time = time.time()
+        if mesh is None:
+            mesh = tessellate_model(
+                source, params["tolerance"], params["angular_tolerance"], adaptive
+            )
+        writer = StlAPI_Writer()
+        writer.ASCIIMode = ascii
+        if not writer.Write(mesh.wrapped, output_path):
+            raise RuntimeError("StlAPI_Writer failed")
+        elapsed = time.time() - start_time
+        if record is not None:
+            record()
         file_size = Path(output_path).stat().st_size / 1024
-        print(f"[SUCCESS] STL export: {output_path} ({file_size:.1f} KB)")
+        triangles = mesh_statistics(mesh)["triangles"]
+        print(f"[SUCCESS] STL export: {output_path} ({file_size:.1f} KB, "
+              f"{triangles} triangles, {elapsed:.2f}s)")
         return True
     except Exception as e:
         print(f"[FAILED] STL export failed: {e}")
         return False
 
 
-def export_dxf(model, output_path: str, section_plane: str = "XY", section_height: float = 0.0):
+def export_3mf(model, output_path: str, mesh: cq.Shape = None, use_cache: bool = False):
+    """
+    3MF形式でエクスポート（スライサー用）
+
+    Args:
+        model: CadQueryモデル
+        output_path: 出力ファイルパス
+        mesh: tessellate_model()の戻り値（指定時は三角形分割を再利用。
+            許容差の記録がないShapeはデフォルトの許容差で分割し直す）
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
+
+    Returns:
+        bool: 成功時True
+    """
+    mesh, source, params = _mesh_for_export(model, mesh)
+
+    record = None
+    if use_cache:
+        hit, record = _export_cache_lookup(model, output_path, "3mf", params)
+        if hit:
+            return True
+
+    try:
+        if mesh is None:
+            mesh = tessellate_model(source, params["tolerance"], params["angular_tolerance"])
+        # 分割時と同じ許容差を渡し、既存の三角形分割をそのまま書き出させる
+        cq.exporters.export(
+            mesh, output_path, "3MF",
+            tolerance=params["tolerance"], angularTolerance=params["angular_tolerance"]
+        )
+        if record is not None:
+            record()
+        file_size = Path(output_path).stat().st_size / 1024
+        print(f"[SUCCESS] 3MF export: {output_path} ({file_size:.1f} KB)")
+        return True
+    except Exception as e:
+        print(f"[FAILED] 3MF export failed: {e}")
+        return False
+
+
+def export_dxf(
+    model,
+    output_path: str,
+    section_plane: str = "XY",
+    section_height: float = 0.0,
+    use_cache: bool = False
+):
     """
     DXF形式でエクスポート（2D断面専用）
 
@@ -63,10 +376,18 @@ def export_dxf(model, output_path: str, section_plane: str = "XY", section_heigh
         output_path: 出力ファイルパス
         section_plane: 断面平面 ("XY", "XZ", "YZ")
         section_height: 断面の高さ（デフォルト: 0.0）
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
 
     Returns:
         bool: 成功時True
     """
+    record = None
+    if use_cache:
+        options = {"section_plane": section_plane, "section_height": section_height}
+        hit, record = _export_cache_lookup(model, output_path, "dxf", options)
+        if hit:
+            return True
+
     try:
         # 3Dソリッドがあるかチェック
         try:
@@ -111,13 +432,194 @@ def export_dxf(model, output_path: str, section_plane: str = "XY", section_heigh
             cq.exporters.export(model, output_path)
             print(f"[SUCCESS] DXF export (2D): {output_path}")
 
+        if record is not None:
+            record()
         return True
     except Exception as e:
         print(f"[WARNING] DXF export failed: {e}")
         return False
 
 
-def export_svg(model, output_path: str, svg_opts: dict = None):
+def section_stack(model, heights, section_plane: str = "XY") -> dict:
+    """
+    複数の高さの断面を一度に計算
+
+    モデルの回転は一度だけ行い、全高さの平面をまとめた1回のBRepAlgoAPI_Sectionで
+    交線を求めてから高さごとに振り分ける（高さごとにモデルを複製・移動しない）。
+    間隔が_SECTION_MIN_SPACING未満の高さは別の演算に分ける。
+
+    Args:
+        model: CadQueryモデル（3Dソリッドを含むこと）
+        heights: 断面の高さのリスト
+        section_plane: 断面平面 ("XY", "XZ", "YZ")
+
+    Returns:
+        dict: {高さ: 断面のエッジ（Z=0の平面上に移動済み、断面がなければNone）}
+    """
+    solids = model.solids().vals() if isinstance(model, cq.Workplane) else model.Solids()
+    if not solids:
+        raise ValueError("section_stack requires a 3D solid")
+    shape = solids[0] if len(solids) == 1 else cq.Compound.makeCompound(solids)
+
+    rotation = _SECTION_ROTATIONS.get(section_plane)
+    if rotation is not None:
+        axis, angle = rotation
+        shape = shape.rotate(cq.Vector(0, 0, 0), cq.Vector(*axis), angle)
+
+    heights = list(dict.fromkeys(float(h) for h in heights))
+    if not heights:
+        return {}
+
+    # 平面の間隔が十分な高さごとのバッチに分ける（通常は1バッチ）
+    batches = []
+    for height in sorted(heights):
+        for batch in batches:
+            if height - batch[-1] >= _SECTION_MIN_SPACING:
+                batch.append(height)
+                break
+        else:
+            batches.append([height])
+
+    # モデル全体を覆う有限の平面を高さごとに作り、バッチごとに1つのCompoundにまとめる
+    bb = shape.BoundingBox()
+    extent = max(abs(bb.xmin), abs(bb.xmax), abs(bb.ymin), abs(bb.ymax)) + 1.0
+    edges = {height: [] for height in heights}
+    for batch in batches:
+        builder = BRep_Builder()
+        planes = TopoDS_Compound()
+        builder.MakeCompound(planes)
+        for height in batch:
+            face = BRepBuilderAPI_MakeFace(
+                gp_Pln(gp_Pnt(0, 0, height), gp_Dir(0, 0, 1)), -extent, extent, -extent, extent
+            ).Face()
+            builder.Add(planes, face)
+
+        operation = BRepAlgoAPI_Section(shape.wrapped, planes, False)
+        operation.SetRunParallel(True)
+        operation.Build()
+        if not operation.IsDone():
+            raise RuntimeError("BRepAlgoAPI_Section failed")
+
+        # 交線はいずれかの平面上にあるため、バッチ内で最も近い高さに振り分ける
+        for edge in cq.Shape.cast(operation.Shape()).Edges():
+            z = edge.Center().z
+            edges[min(batch, key=lambda h: abs(h - z))].append(edge)
+
+    return {
+        height: (
+            cq.Compound.makeCompound(height_edges).translate(cq.Vector(0, 0, -height))
+            if height_edges else None
+        )
+        for height, height_edges in edges.items()
+    }
+
+
+def _height_label(height: float) -> str:
+    """
+    断面の高さの表記（ファイル名・DXFレイヤー名用、異なる高さは必ず異なる表記になる）
+
+    整数はそのまま（"-24"）、それ以外は往復変換で元の値に戻る最短表記（"1.0000001", "1e-07"）。
+    指数の "+" はファイル名に使いにくいため除く（"1.5e20"）。
+    """
+    if height.is_integer():
+        return str(int(height))
+    return repr(height).replace("+", "")
+
+
+def _section_layer_name(section_plane: str, height: float) -> str:
+    """断面のDXFレイヤー名（例: "XZ_-24"）"""
+    return f"{section_plane}_{_height_label(height)}"
+
+
+def export_section_stack(
+    model,
+    output_path: str,
+    heights,
+    section_plane: str = "XY",
+    separate_files: bool = False,
+    use_cache: bool = False
+) -> dict:
+    """
+    複数の高さの断面をDXF形式でエクスポート
+
+    export_dxf()を高さごとに呼ぶ代わりに、section_stack()で全断面を一度に計算する。
+    既定では1つのDXFに高さごとのレイヤー（例: "XY_1.5"）として書き出し、
+    separate_files=True の場合は高さごとに "<名前>_h<高さ>.dxf" を書き出す
+    （高さはレイヤー名と同じく丸めない表記のため、近い高さも別のレイヤー・ファイルになる）。
+
+    Args:
+        model: CadQueryモデル（3Dソリッドを含むこと）
+        output_path: 出力ファイルパス（separate_files時は各ファイル名の元）
+        heights: 断面の高さのリスト
+        section_plane: 断面平面 ("XY", "XZ", "YZ")
+        separate_files: 高さごとに別ファイルに書き出す
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
+
+    Returns:
+        dict: {高さ: 出力ファイルパス}（失敗時は空）
+    """
+    heights = list(dict.fromkeys(float(h) for h in heights))
+    output = Path(output_path)
+    if separate_files:
+        # ファイル名の高さはレイヤー名と同じ書式（"_h1.21", "_h-24"）
+        paths = {
+            h: str(output.with_name(f"{output.stem}_h{_height_label(h)}{output.suffix}"))
+            for h in heights
+        }
+    else:
+        paths = {h: str(output) for h in heights}
+
+    records = []
+    pending = heights
+    if use_cache:
+        digest = shape_hash(model)
+        pending = []
+        if separate_files:
+            for height in heights:
+                options = {"section_plane": section_plane, "section_height": height, "stack": True}
+                hit, record = _export_cache_lookup(model, paths[height], "dxf", options, digest)
+                if not hit:
+                    pending.append(height)
+                    records.append(record)
+        else:
+            options = {"section_plane": section_plane, "section_heights": heights}
+            hit, record = _export_cache_lookup(model, str(output), "dxf", options, digest)
+            if not hit:
+                pending = heights
+                records.append(record)
+
+    try:
+        sections = section_stack(model, pending, section_plane) if pending else {}
+
+        if separate_files:
+            for height, section in sections.items():
+                document = DxfDocument()
+                if section is not None:
+                    # Shapeを直接渡すとスプライン（斜めのフィレットの断面等）の変換に失敗する
+                    document.add_shape(cq.Workplane("XY").newObject([section]))
+                document.document.saveas(paths[height])
+        elif sections:
+            document = DxfDocument()
+            for height, section in sections.items():
+                layer = _section_layer_name(section_plane, height)
+                document.add_layer(layer)
+                if section is not None:
+                    document.add_shape(cq.Workplane("XY").newObject([section]), layer=layer)
+            document.document.saveas(str(output))
+
+        for record in records:
+            record()
+        if sections:
+            target = f"{len(sections)} files" if separate_files else output
+            print(f"[SUCCESS] DXF section stack export ({section_plane}, "
+                  f"{len(sections)} heights): {target}")
+        return paths
+    except Exception as e:
+        print(f"[FAILED] DXF section stack export failed: {e}")
+        return {}
+
+
+def export_svg(model, output_path: str, svg_opts: dict = None, use_cache: bool = False):
     """
     SVG形式でエクスポート（2D図面、ブラウザで表示可能）
 
@@ -125,6 +627,7 @@ def export_svg(model, output_path: str, svg_opts: dict = None):
         model: CadQueryモデル
         output_path: 出力ファイルパス
         svg_opts: SVG出力オプション
+        use_cache: モデルが前回から変わっていなければ書き出しを省略する
 
     Returns:
         bool: 成功時True
@@ -140,8 +643,16 @@ def export_svg(model, output_path: str, svg_opts: dict = None):
             "strokeWidth": 0.25,
         }
 
+    record = None
+    if use_cache:
+        hit, record = _export_cache_lookup(model, output_path, "svg", svg_opts)
+        if hit:
+            return True
+
     try:
         cq.exporters.export(model, output_path, opt=svg_opts)
+        if record is not None:
+            record()
         print(f"[SUCCESS] SVG export: {output_path}")
         return True
     except Exception as e:
@@ -149,46 +660,158 @@ def export_svg(model, output_path: str, svg_opts: dict = None):
         return False
 
 
-def export_all_formats(model, name_prefix: str, output_dir: str = "outputs/cadquery"):
+def _serialize_model(model) -> bytes:
+    """モデルをBRep形式のバイト列に変換（ワーカープロセスへの受け渡し用）"""
+    return brep_bytes(model)
+
+
+def _deserialize_model(data: bytes) -> cq.Workplane:
+    """_serialize_model()の逆変換（元のオブジェクト列を持つWorkplaneを復元）"""
+    compound = cq.Shape.importBrep(io.BytesIO(data))
+    return cq.Workplane("XY").newObject(list(compound))
+
+
+# プロセスプールで書き出す形式（三角形分割を使わない書き出し）
+_POOL_EXPORTERS = {"step": export_step, "dxf": export_dxf, "svg": export_svg}
+
+
+def _export_in_worker(kind: str, data: bytes, output_path: str, use_cache: bool = False) -> tuple:
+    """
+    ワーカープロセスでSTEP/DXF/SVGを書き出す
+
+    Returns:
+        tuple: (成功可否, 書き出し中の標準出力)（呼び出し元のstdoutに出すため）
+    """
+    log = io.StringIO()
+    with redirect_stdout(log):
+        ok = _POOL_EXPORTERS[kind](_deserialize_model(data), output_path, use_cache=use_cache)
+    return ok, log.getvalue()
+
+
+def _run_exports(
+    model,
+    jobs: dict,
+    workers: int = 1,
+    mesh_exports=None,
+    use_cache: bool = False
+) -> dict:
+    """
+    メッシュを使わない書き出し（STEP/DXF/SVG）を実行（workers指定時はプロセスプールで並行実行）
+
+    プールを使う場合、ワーカーが書き出している間にメインプロセスでmesh_exports（三角形分割と
+    STL/3MF/OpenSCAD用ファイルの書き出し）を実行する。
+    ワーカーはforkせずに起動する（export_cache.worker_context()参照）。最初のプールの起動に
+    数秒かかるため、書き出しがそれより長くかかる大きなモデル・アセンブリでのみ有効。
+
+    Args:
+        model: CadQueryモデル
+        jobs: {"step" | "dxf" | "svg": 出力パス}
+        workers: ワーカープロセス数（1以下なら逐次実行、Noneなら書き出し数とCPU数の小さい方）
+        mesh_exports: メインプロセスで実行する関数（引数なし、戻り値は {形式: 成功可否}）
+        use_cache: エクスポートキャッシュを使用する
+
+    Returns:
+        dict: {形式: 成功可否}
+    """
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+    outcomes = {}
+    if workers <= 1 or not jobs:
+        if mesh_exports is not None:
+            outcomes.update(mesh_exports())
+        for kind, path in jobs.items():
+            outcomes[kind] = _POOL_EXPORTERS[kind](model, path, use_cache=use_cache)
+        return outcomes
+
+    data = _serialize_model(model)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+        futures = {
+            kind: executor.submit(_export_in_worker, kind, data, path, use_cache)
+            for kind, path in jobs.items()
+        }
+        if mesh_exports is not None:
+            outcomes.update(mesh_exports())
+        for kind, future in futures.items():
+            try:
+                outcomes[kind], log = future.result()
+                print(log, end="")
+            except Exception as e:
+                print(f"[FAILED] {kind.upper()} export failed in worker: {e}")
+                outcomes[kind] = False
+    return outcomes
+
+
+def export_all_formats(
+    model,
+    name_prefix: str,
+    output_dir: str = "outputs/cadquery",
+    formats: tuple = ("step", "stl", "dxf", "svg"),
+    workers: int = 1,
+    use_cache: bool = False
+):
     """
     モデルを各種形式で一括エクスポート
 
+    三角形分割は一度だけ行ってSTL/3MFで共有する。workersを2以上（またはNone）にすると
+    STEP/DXF/SVGをプロセスプールで並行に書き出す（大きなモデル向け、_run_exports()参照）。
+    use_cache=True の場合、モデルと出力オプションが前回と同じ形式は書き出しを省略する。
+
     Args:
         model: CadQueryモデル
         name_prefix: ファイル名のプレフィックス
         output_dir: 出力ディレクトリ
+        formats: 出力形式（"step", "stl", "3mf", "dxf", "svg"）
+        workers: STEP/DXF/SVG書き出しのワーカープロセス数（デフォルトの1なら逐次実行、
+            Noneなら書き出し数とCPU数の小さい方）
+        use_cache: エクスポートキャッシュを使用する
 
     Returns:
         dict: エクスポートされたファイルのパス {"format": "path"}
     """
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    results = {}
-
-    # STEP形式
-    step_path = f"{output_dir}/{name_prefix}.step"
-    if export_step(model, step_path):
-        results["step"] = step_path
-
-    # STL形式
-    stl_path = f"{output_dir}/{name_prefix}.stl"
-    if export_stl(model, stl_path):
-        results["stl"] = stl_path
-
-    # DXF形式（オプション）
-    dxf_path = f"{output_dir}/{name_prefix}_top.dxf"
-    if export_dxf(model, dxf_path):
-        results["dxf"] = dxf_path
-
-    # SVG形式（オプション）
-    svg_path = f"{output_dir}/{name_prefix}_top.svg"
-    if export_svg(model, svg_path):
-        results["svg"] = svg_path
-
-    return results
-
-
-def convert_to_openscad(model, output_scad_path: str, output_dir: str = None):
+    paths = {
+        "step": f"{output_dir}/{name_prefix}.step",
+        "stl": f"{output_dir}/{name_prefix}.stl",
+        "3mf": f"{output_dir}/{name_prefix}.3mf",
+        # DXF/SVGはトップビュー（オプション）
+        "dxf": f"{output_dir}/{name_prefix}_top.dxf",
+        "svg": f"{output_dir}/{name_prefix}_top.svg",
+    }
+
+    def mesh_exports():
+        outcomes = {}
+        if "stl" in formats or "3mf" in formats:
+            # キャッシュ使用時はヒットした形式のために分割しないよう、各書き出しに任せる
+            # （分割結果はShapeの面に残るため、2回目の分割は再計算されない）
+            mesh = None if use_cache else tessellate_model(model)
+            if "stl" in formats:
+                outcomes["stl"] = export_stl(model, paths["stl"], mesh=mesh, use_cache=use_cache)
+            if "3mf" in formats:
+                outcomes["3mf"] = export_3mf(model, paths["3mf"], mesh=mesh, use_cache=use_cache)
+        return outcomes
+
+    jobs = {kind: paths[kind] for kind in ("step", "dxf", "svg") if kind in formats}
+    outcomes = _run_exports(model, jobs, workers, mesh_exports, use_cache)
+
+    return {
+        kind: paths[kind]
+        for kind in paths
+        if outcomes.get(kind)
+    }
+
+
+def convert_to_openscad(
+    model,
+    output_scad_path: str,
+    output_dir: str = None,
+    mesh: cq.Shape = None,
+    use_cache: bool = False,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False
+):
     """
     CadQueryモデルをSTL経由でOpenSCADで使用可能にする
 
@@ -196,6 +819,11 @@ def convert_to_openscad(model, output_scad_path: str, output_dir: str = None):
         model: CadQueryモデル
         output_scad_path: 出力するSCADファイルのパス
         output_dir: STLファイルの出力ディレクトリ（Noneの場合はSCADと同じ）
+        mesh: tessellate_model()の戻り値（指定時は三角形分割を再利用）
+        use_cache: モデルが前回から変わっていなければSTLの書き出しを省略する
+        tolerance: STLの線形許容差（export_stl()参照）
+        angular_tolerance: STLの角度許容差（ラジアン）
+        adaptive: バウンディングボックスからSTLの許容差を決める
 
     Returns:
         tuple: (scad_path, stl_path)
@@ -209,9 +837,17 @@ def convert_to_openscad(model, output_scad_path: str, output_dir: str = None):
     stl_filename = scad_path.stem + ".stl"
     stl_path = Path(output_dir) / stl_filename
 
-    export_stl(model, str(stl_path))
+    export_stl(
+        model, str(stl_path), mesh=mesh, use_cache=use_cache,
+        tolerance=tolerance, angular_tolerance=angular_tolerance, adaptive=adaptive
+    )
+    _write_import_scad(scad_path, stl_filename)
+
+    return str(scad_path), str(stl_path)
+
 
-    # STLをインポートするOpenSCADコードを生成
+def _write_import_scad(scad_path: Path, stl_filename: str):
+    """STLをインポートするOpenSCADコードを書き出す"""
     scad_code = f"""// CadQueryから生成されたモデル
 // STLファイルをインポート
 
@@ -223,8 +859,6 @@ import("{stl_filename}");
 
     print(f"[SUCCESS] OpenSCAD file created: {scad_path}")
 
-    return str(scad_path), str(stl_path)
-
 
 def create_2d_projections(stl_path: str, output_dir: str = None):
     """
@@ -310,16 +944,34 @@ def save_model_with_openscad_support(
     model,
     name_prefix: str,
     output_dir: str = "outputs/cadquery",
-    create_projections: bool = True
+    create_projections: bool = True,
+    workers: int = 1,
+    use_cache: bool = False,
+    tolerance: float = None,
+    angular_tolerance: float = None,
+    adaptive: bool = False,
+    native_projections: bool = False
 ):
     """
     モデルをSTEP/STL形式で保存し、OpenSCAD連携ファイルも生成
 
+    STLは一度だけ書き出してOpenSCADのimport()先と共有する。workersを2以上（またはNone）にすると
+    STEPはその間にワーカープロセスで書き出す。
+    native_projections=True の場合、2D投影はSTL+OpenSCADのprojection()ではなく
+    BRepの隠線処理で直接DXF/SVGに書き出す（hlr_projection.create_native_projections()）。
+
     Args:
         model: CadQueryモデル
         name_prefix: ファイル名のプレフィックス
         output_dir: 出力ディレクトリ
         create_projections: 2D投影ファイルも作成するか
+        workers: STEP書き出し・ネイティブ2D投影のワーカープロセス数（デフォルトの1なら逐次実行）
+        use_cache: モデルが前回から変わっていなければSTEP/STLの書き出しを省略する
+        tolerance: STLの線形許容差（export_stl()参照）
+        angular_tolerance: STLの角度許容差（ラジアン）
+        adaptive: バウンディングボックスからSTLの許容差を決める（2D投影のimport()も軽くなる）
+        native_projections: 2D投影をBRepから直接DXF/SVGで生成する
+            （結果の"projections"は {"view_name": {"dxf": パス, "svg": パス}}）
 
     Returns:
         dict: 生成されたファイルのパス
@@ -332,21 +984,34 @@ def save_model_with_openscad_support(
     print(f"\n=== Exporting {name_prefix} ===")
 
     step_path = f"{output_dir}/{name_prefix}.step"
-    if export_step(model, step_path):
-        results["step"] = step_path
-
     stl_path = f"{output_dir}/{name_prefix}.stl"
-    if export_stl(model, stl_path):
+    scad_path = f"{output_dir}/{name_prefix}.scad"
+
+    def mesh_exports():
+        # STLはOpenSCADのimport()先を兼ねるため、一度だけ書き出す
+        stl_ok = export_stl(
+            model, stl_path, use_cache=use_cache,
+            tolerance=tolerance, angular_tolerance=angular_tolerance, adaptive=adaptive
+        )
+        _write_import_scad(Path(scad_path), Path(stl_path).name)
+        return {"stl": stl_ok}
+
+    # STEPはワーカープロセスで書き出し、その間にSTL/SCADを生成
+    outcomes = _run_exports(model, {"step": step_path}, workers, mesh_exports, use_cache)
+    if outcomes.get("step"):
+        results["step"] = step_path
+    if outcomes.get("stl"):
         results["stl"] = stl_path
 
-    # OpenSCAD用ファイル生成
-    scad_path = f"{output_dir}/{name_prefix}.scad"
-    scad_file, stl_file = convert_to_openscad(model, scad_path, output_dir)
-    results["scad"] = scad_file
+    # OpenSCAD用ファイル
+    results["scad"] = scad_path
 
     # 2D投影ファイル生成
     if create_projections:
-        projections = create_2d_projections(stl_path, output_dir)
+        if native_projections:
+            projections = create_native_projections(model, name_prefix, output_dir, workers=workers)
+        else:
+            projections = create_2d_projections(stl_path, output_dir)
         results["projections"] = projections
 
     return results
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+DXFの輪郭（閉ループ）復元
+
+export_dxf()の断面DXFはLINE/ARCがばらばらのエンティティとして出力されるため、
+端点を許容差でスナップしてグラフを作り、閉ループをたどって輪郭を復元する。
+
+- 端点のスナップ: 許容差のグリッドで量子化し、隣接セルの近い点を同じ節点に統合
+- ループの復元: 全節点の次数が2の連結成分をたどる（分岐・端点のある部分は閉じていない辺として数える）
+- 面積・周長: Greenの定理による辺ごとの寄与（円弧は厳密）を一括で合計
+- 包含関係: 円弧を分割した近似ポリゴンで内外判定し、最も小さい外側の輪郭を親とする
+  （候補は輪郭のバウンディングボックスの空間索引で絞り込む）
+
+CIRCLEはそれ自体を1つの輪郭、LWPOLYLINEは線分の集まりとして扱う（ふくらみは考慮しない）。
+SPLINE・ELLIPSE等を含むループは閉じていない辺として扱う。
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+try:
+    from .spatial_index import GridIndex
+except ImportError:
+    # scripts/contours.py として直接実行された場合
+    from spatial_index import GridIndex
+
+
+# 端点を同じ節点とみなす距離のデフォルト値
+DEFAULT_TOLERANCE = 1e-4
+
+# 包含判定用の近似ポリゴンで円弧を分割する角度（度）
+ARC_SEGMENT_DEGREES = 5.0
+
+# 辺の元エンティティのタイプ（edge_types の値）
+EDGE_SOURCE_TYPES = ("LINE", "ARC", "LWPOLYLINE", "CIRCLE")
+
+
+def _collect_edges(
+    lines: Dict[str, np.ndarray],
+    arcs: Dict[str, np.ndarray],
+    polylines: Dict[str, np.ndarray],
+    tolerance: float
+) -> Dict[str, np.ndarray]:
+    """LINE・ARC・LWPOLYLINEの線分を辺の配列にまとめる（長さが許容差以下の線分は除く）"""
+    # LWPOLYLINEの頂点i→i+1（閉じている場合は最後→最初も）を線分にする
+    points, offsets, closed = polylines["points"], polylines["offsets"], polylines["closed"]
+    counts = np.diff(offsets)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    is_last = np.zeros(len(points), dtype=bool)
+    is_last[offsets[1:][counts > 0] - 1] = True
+    seg_from = np.flatnonzero(~is_last)
+    seg_to = seg_from + 1
+    closing = np.flatnonzero(closed & (counts > 2))
+    seg_from = np.concatenate([seg_from, offsets[1:][closing] - 1])
+    seg_to = np.concatenate([seg_to, offsets[:-1][closing]])
+    seg_owner = np.concatenate([owners[~is_last], closing])
+
+    arc_starts = np.radians(arcs["start_angles"])
+    arc_sweeps = np.radians(np.mod(arcs["end_angles"] - arcs["start_angles"], 360.0))
+    arc_sweeps[arc_sweeps == 0] = 2 * math.pi
+
+    def arc_point(angles):
+        return arcs["centers"] + arcs["radii"][:, None] * np.column_stack([np.cos(angles), np.sin(angles)])
+
+    starts = np.concatenate([lines["starts"], arc_point(arc_starts), points[seg_from]])
+    ends = np.concatenate([lines["ends"], arc_point(arc_starts + arc_sweeps), points[seg_to]])
+    n_lines, n_arcs, n_segments = len(lines["starts"]), len(arcs["radii"]), len(seg_from)
+    edges = {
+        "starts": starts,
+        "ends": ends,
+        "types": np.repeat([0, 1, 2], [n_lines, n_arcs, n_segments]),
+        "ids": np.concatenate([np.arange(n_lines), np.arange(n_arcs), seg_owner]),
+        "is_arc": np.repeat([False, True, False], [n_lines, n_arcs, n_segments]),
+        "centers": np.concatenate([np.zeros((n_lines, 2)), arcs["centers"], np.zeros((n_segments, 2))]),
+        "radii": np.concatenate([np.zeros(n_lines), arcs["radii"], np.zeros(n_segments)]),
+        "start_angles": np.concatenate([np.zeros(n_lines), arc_starts, np.zeros(n_segments)]),
+        "sweeps": np.concatenate([np.zeros(n_lines), arc_sweeps, np.zeros(n_segments)]),
+    }
+    keep = edges["is_arc"] | (np.linalg.norm(ends - starts, axis=1) > tolerance)
+    return {name: values[keep] for name, values in edges.items()}
+
+
+def snap_points(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    許容差以内の点を同じ節点にまとめる
+
+    Args:
+        points: 点の座標 (N, 2)
+        tolerance: 同じ節点とみなす距離
+
+    Returns:
+        np.ndarray: 各点の節点番号 (N,)（0から連番）
+    """
+    if not len(points):
+        return np.empty(0, dtype=np.intp)
+    cells = np.floor(points / tolerance).astype(np.int64)
+    keys, first, inverse = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    representatives = points[first]
+
+    # セル番号を1つの整数にまとめて、隣接セルを二分探索で引く（keysは辞書順にソート済み）
+    kx = keys[:, 0] - keys[:, 0].min()
+    ky = keys[:, 1] - keys[:, 1].min() + 1
+    span = int(ky.max()) + 2
+    codes = kx * span + ky
+    pairs = []
+    for dx, dy in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        targets = (kx + dx) * span + (ky + dy)
+        pos = np.minimum(np.searchsorted(codes, targets), len(codes) - 1)
+        found = np.flatnonzero(codes[pos] == targets)
+        near = np.linalg.norm(representatives[found] - representatives[pos[found]], axis=1) <= tolerance
+        pairs.append((found[near], pos[found][near]))
+    a = np.concatenate([p[0] for p in pairs])
+    b = np.concatenate([p[1] for p in pairs])
+
+    # 近いセル同士を連結成分にまとめる（最小ラベルの伝播）
+    labels = np.arange(len(keys))
+    while len(a):
+        low = np.minimum(labels[a], labels[b])
+        before = labels.copy()
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            break
+    return np.unique(labels, return_inverse=True)[1].reshape(-1)[inverse]
+
+
+def _walk_loops(node_from: np.ndarray, node_to: np.ndarray, node_count: int) -> Tuple[List[int], List[bool], List[int]]:
+    """次数2の節点だけを通る閉ループをたどる（辺の並び・逆向きフラグ・ループごとの辺数）"""
+    degree = np.bincount(np.concatenate([node_from, node_to]), minlength=node_count)
+    endpoints = np.concatenate([node_from, node_to])
+    incident = np.concatenate([np.arange(len(node_from))] * 2)[np.argsort(endpoints, kind="stable")]
+    first_incident = np.concatenate([[0], np.cumsum(degree)])[:-1]
+
+    node_from, node_to = node_from.tolist(), node_to.tolist()
+    degree, incident, first_incident = degree.tolist(), incident.tolist(), first_incident.tolist()
+    visited = bytearray(len(node_from))
+    loop_edges, loop_flips, loop_sizes = [], [], []
+    for first in range(len(node_from)):
+        if visited[first] or degree[node_from[first]] != 2 or degree[node_to[first]] != 2:
+            continue
+        visited[first] = 1
+        edges, flips = [first], [False]
+        start, node, previous = node_from[first], node_to[first], first
+        closed = True
+        while node != start:
+            if degree[node] != 2:
+                closed = False
+                break
+            a = incident[first_incident[node]]
+            edge = incident[first_incident[node] + 1] if a == previous else a
+            if visited[edge]:
+                closed = False
+                break
+            visited[edge] = 1
+            flip = node_from[edge] != node
+            node = node_from[edge] if flip else node_to[edge]
+            edges.append(edge)
+            flips.append(flip)
+            previous = edge
+        if closed:
+            loop_edges.extend(edges)
+            loop_flips.extend(flips)
+            loop_sizes.append(len(edges))
+    return loop_edges, loop_flips, loop_sizes
+
+
+def _edge_terms(edges: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """辺ごとの符号付き面積の寄与（始点→終点の向き）と長さ"""
+    (x0, y0), (x1, y1) = edges["starts"].T, edges["ends"].T
+    areas = (x0 * y1 - x1 * y0) / 2
+    lengths = np.hypot(x1 - x0, y1 - y0)
+
+    arc = edges["is_arc"]
+    (cx, cy), r = edges["centers"][arc].T, edges["radii"][arc]
+    s, theta = edges["start_angles"][arc], edges["sweeps"][arc]
+    e = s + theta
+    # x dy - y dx を円弧（反時計回り）に沿って積分した値の半分
+    areas[arc] = (r * r * theta + r * (cx * (np.sin(e) - np.sin(s)) - cy * (np.cos(e) - np.cos(s)))) / 2
+    lengths[arc] = r * theta
+    return areas, lengths
+
+
+def _loop_polygons(
+    edges: Dict[str, np.ndarray],
+    loop_edges: np.ndarray,
+    loop_flips: np.ndarray,
+    loop_offsets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """ループをたどる順に辺を分割した近似ポリゴン（頂点の連結配列と各ループの頂点オフセット）"""
+    is_arc = edges["is_arc"][loop_edges]
+    sweeps = edges["sweeps"][loop_edges]
+    counts = np.where(is_arc, np.maximum(np.ceil(np.degrees(sweeps) / ARC_SEGMENT_DEGREES), 1), 1).astype(np.intp)
+
+    occurrence = np.repeat(np.arange(len(loop_edges)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = local / counts[occurrence]
+    # 逆向きにたどる辺は終点側から分割する
+    t = np.where(loop_flips[occurrence], 1.0 - t, t)
+
+    edge = loop_edges[occurrence]
+    straight = edges["starts"][edge] + t[:, None] * (edges["ends"][edge] - edges["starts"][edge])
+    angles = edges["start_angles"][edge] + t * edges["sweeps"][edge]
+    curved = edges["centers"][edge] + edges["radii"][edge][:, None] * np.column_stack([np.cos(angles), np.sin(angles)])
+    points = np.where(edges["is_arc"][edge][:, None], curved, straight)
+
+    loop_counts = np.add.reduceat(counts, loop_offsets[:-1]) if len(counts) else np.zeros(0, dtype=np.intp)
+    return points, np.concatenate([[0], np.cumsum(loop_counts)])
+
+
+def _points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """点群のポリゴン内外判定（レイキャスティング）"""
+    x, y = points[:, 0:1], points[:, 1:2]
+    (x0, y0), (x1, y1) = polygon.T, np.roll(polygon, -1, axis=0).T
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at_y = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return np.count_nonzero(crosses & (x < x_at_y), axis=1) % 2 == 1
+
+
+def assemble_contours(
+    lines: Dict[str, np.ndarray],
+    arcs: Dict[str, np.ndarray],
+    circles: Dict[str, np.ndarray],
+    polylines: Dict[str, np.ndarray],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> Dict:
+    """
+    DXFParserの列ストアから閉じた輪郭を復元
+
+    Args:
+        lines: DXFParser.lines
+        arcs: DXFParser.arcs
+        circles: DXFParser.circles
+        polylines: DXFParser.polylines
+        tolerance: 端点を同じ節点とみなす距離
+
+    Returns:
+        Dict: 輪郭の列ストア（面積の大きい順）
+            areas, perimeters, is_ccw, parents（なしは-1）, depths（偶数: 外形, 奇数: 穴）,
+            bbox_mins, bbox_maxs, points / point_offsets（近似ポリゴン）,
+            edge_types / edge_ids / edge_offsets（輪郭を構成するエンティティ、タイプは EDGE_SOURCE_TYPES の番号）,
+            open_edges（閉じた輪郭に含まれなかった辺の数）
+    """
+    edges = _collect_edges(lines, arcs, polylines, tolerance)
+    nodes = snap_points(np.concatenate([edges["starts"], edges["ends"]]), tolerance)
+    edge_count = len(edges["starts"])
+    node_count = int(nodes.max()) + 1 if len(nodes) else 0
+    loop_edges, loop_flips, loop_sizes = _walk_loops(nodes[:edge_count], nodes[edge_count:], node_count)
+    loop_edges = np.array(loop_edges, dtype=np.intp)
+    loop_flips = np.array(loop_flips, dtype=bool)
+    loop_offsets = np.concatenate([[0], np.cumsum(loop_sizes)]).astype(np.intp)
+
+    # 面積・周長（逆向きにたどる辺は寄与の符号を反転）
+    edge_areas, edge_lengths = _edge_terms(edges)
+    signs = np.where(loop_flips, -1.0, 1.0)
+    if len(loop_sizes):
+        signed_areas = np.add.reduceat(edge_areas[loop_edges] * signs, loop_offsets[:-1])
+        perimeters = np.add.reduceat(edge_lengths[loop_edges], loop_offsets[:-1])
+    else:
+        signed_areas = perimeters = np.zeros(0)
+    points, point_offsets = _loop_polygons(edges, loop_edges, loop_flips, loop_offsets)
+
+    # 円はそれぞれ1つの輪郭（反時計回り）
+    radii, centers = circles["radii"], circles["centers"]
+    circle_count = len(radii)
+    samples = int(360 / ARC_SEGMENT_DEGREES)
+    angles = np.linspace(0, 2 * math.pi, samples, endpoint=False)
+    circle_points = (centers[:, None, :] + radii[:, None, None]
+                     * np.stack([np.cos(angles), np.sin(angles)], axis=1)[None]).reshape(-1, 2)
+
+    signed_areas = np.concatenate([signed_areas, math.pi * radii ** 2])
+    perimeters = np.concatenate([perimeters, 2 * math.pi * radii])
+    points = np.concatenate([points, circle_points])
+    point_offsets = np.concatenate([point_offsets, point_offsets[-1] + samples * np.arange(1, circle_count + 1)])
+    edge_types = np.concatenate([edges["types"][loop_edges], np.full(circle_count, 3)])
+    edge_ids = np.concatenate([edges["ids"][loop_edges], np.arange(circle_count)])
+    edge_offsets = np.concatenate([loop_offsets, loop_offsets[-1] + np.arange(1, circle_count + 1)])
+
+    # 面積の大きい順に並べ替え（親は必ず子より前に来る）
+    areas = np.abs(signed_areas)
+    order = np.argsort(-areas, kind="stable")
+    count = len(order)
+
+    def reorder(values, offsets):
+        sizes = np.diff(offsets)[order]
+        starts = offsets[:-1][order]
+        index = np.repeat(starts - np.concatenate([[0], np.cumsum(sizes)])[:-1], sizes) + np.arange(sizes.sum())
+        return values[index], np.concatenate([[0], np.cumsum(sizes)])
+
+    points, point_offsets = reorder(points, point_offsets)
+    edge_types, _ = reorder(edge_types, edge_offsets)
+    edge_ids, edge_offsets = reorder(edge_ids, edge_offsets)
+    signed_areas, areas, perimeters = signed_areas[order], areas[order], perimeters[order]
+
+    if count:
+        bbox_mins = np.minimum.reduceat(points, point_offsets[:-1])
+        bbox_maxs = np.maximum.reduceat(points, point_offsets[:-1])
+    else:
+        bbox_mins = bbox_maxs = np.empty((0, 2))
+
+    # 包含関係: 大きい輪郭から順に、範囲に収まる小さい輪郭の代表点（先頭頂点）を内外判定
+    # （範囲の候補は輪郭のバウンディングボックスの空間索引で絞り込む）
+    representatives = points[point_offsets[:-1]]
+    parents = np.full(count, -1, dtype=np.intp)
+    index = GridIndex({"CONTOUR": (bbox_mins, bbox_maxs)})
+    for j in range(count):
+        candidates = index.query(bbox_mins[j], bbox_maxs[j])["CONTOUR"]
+        candidates = candidates[
+            (candidates > j)
+            & np.all(bbox_mins[candidates] >= bbox_mins[j], axis=1)
+            & np.all(bbox_maxs[candidates] <= bbox_maxs[j], axis=1)
+        ]
+        if len(candidates):
+            polygon = points[point_offsets[j]:point_offsets[j + 1]]
+            inside = _points_in_polygon(representatives[candidates], polygon)
+            # 後から処理する（より小さい）外側の輪郭で上書きされる
+            parents[candidates[inside]] = j
+    depths = np.zeros(count, dtype=np.intp)
+    for i in np.flatnonzero(parents >= 0):
+        depths[i] = depths[parents[i]] + 1
+
+    return {
+        "areas": areas,
+        "perimeters": perimeters,
+        "is_ccw": signed_areas > 0,
+        "parents": parents,
+        "depths": depths,
+        "bbox_mins": bbox_mins,
+        "bbox_maxs": bbox_maxs,
+        "points": points,
+        "point_offsets": point_offsets,
+        "edge_types": edge_types,
+        "edge_ids": edge_ids,
+        "edge_offsets": edge_offsets,
+        "open_edges": edge_count - len(loop_edges),
+    }
@@ -4,75 +4,423 @@ DXFファイルパーサー
 
 ezdxfを使用してDXFファイルから形状情報、寸法、統計データを抽出し、
 Claude Codeにフィードバック可能なテキストレポートを生成します。
+
+streaming=True の場合はezdxfのiterdxfアドオンでENTITIESセクションを1回だけ走査し、
+文書全体をメモリに構築せずにエンティティ数・バウンディングボックス・形状統計を求めます
+（数百MBの断面DXF向け）。
+
+解析結果はエンティティタイプごとの列ストア（NumPy配列）に保持され、
+get_*() と get_result()（レポートの元になる構造化データ）は列ストアから生成されます
+（モデル空間の再クエリは行いません）。
 """
 
+import math
+from array import array
+
 import ezdxf
+import numpy as np
+from ezdxf import bbox as ezdxf_bbox
+from ezdxf.addons import iterdxf
+from ezdxf.math import BoundingBox2d
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from collections import Counter
 
+try:
+    from .analysis_result import REPORT_SAMPLE_SIZE, DXFAnalysis
+    from .contours import DEFAULT_TOLERANCE, EDGE_SOURCE_TYPES, assemble_contours
+    from .spatial_index import GridIndex
+except ImportError:
+    # scripts/dxf_parser.py として直接実行された場合
+    from analysis_result import REPORT_SAMPLE_SIZE, DXFAnalysis
+    from contours import DEFAULT_TOLERANCE, EDGE_SOURCE_TYPES, assemble_contours
+    from spatial_index import GridIndex
+
+
+# 空間索引・距離計算の対象とするエンティティタイプ
+INDEXED_TYPES = ("LINE", "CIRCLE", "ARC", "LWPOLYLINE")
+
+
+def _dimension_record(entity) -> Optional[Dict]:
+    try:
+        return {
+            "type": entity.dxftype(),
+            "measurement": entity.get_measurement(),
+            "text": entity.dxf.text if hasattr(entity.dxf, 'text') else ""
+        }
+    except Exception as e:
+        print(f"[WARNING] Failed to extract dimension: {e}")
+        return None
+
+
+def _columns(values: array, width: int) -> np.ndarray:
+    """走査中に追記したバッファを (N, width) の配列として参照"""
+    return np.frombuffer(values, dtype=np.float64).reshape(-1, width)
+
+
+def _value_range(values: np.ndarray) -> Tuple[float, float]:
+    """最小値・最大値（空の場合は0）"""
+    if not len(values):
+        return 0.0, 0.0
+    return float(values.min()), float(values.max())
+
+
+def _arc_sweeps(start_angles: np.ndarray, end_angles: np.ndarray) -> np.ndarray:
+    """円弧の中心角（度）。始点と終点が一致する場合は全周とみなす"""
+    sweeps = np.mod(end_angles - start_angles, 360.0)
+    sweeps[sweeps == 0] = 360.0
+    return sweeps
+
+
+def _arc_extents(arcs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """円弧ごとの範囲 (N, 2) の最小・最大座標（端点と範囲内の四分点から求める）"""
+    start_angles, end_angles = arcs["start_angles"], arcs["end_angles"]
+    sweeps = _arc_sweeps(start_angles, end_angles)
+    angles = [start_angles, end_angles]
+    for quadrant in (0.0, 90.0, 180.0, 270.0):
+        # 範囲外の四分点は始点で置き換える
+        inside = np.mod(quadrant - start_angles, 360.0) <= sweeps
+        angles.append(np.where(inside, quadrant, start_angles))
+    theta = np.radians(np.stack(angles))
+    xs = arcs["centers"][:, 0] + arcs["radii"] * np.cos(theta)
+    ys = arcs["centers"][:, 1] + arcs["radii"] * np.sin(theta)
+    return (np.column_stack([xs.min(axis=0), ys.min(axis=0)]),
+            np.column_stack([xs.max(axis=0), ys.max(axis=0)]))
+
+
+def _segment_distances(point: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """点から線分群までの距離"""
+    directions = ends - starts
+    lengths_sq = np.einsum("ij,ij->i", directions, directions)
+    t = np.einsum("ij,ij->i", point - starts, directions) / np.where(lengths_sq > 0, lengths_sq, 1.0)
+    closest = starts + np.clip(t, 0.0, 1.0)[:, None] * directions
+    return np.linalg.norm(point - closest, axis=1)
+
+
+def _arc_distances(point: np.ndarray, arcs: Dict[str, np.ndarray]) -> np.ndarray:
+    """点から円弧群までの距離（中心角の範囲内なら円周まで、範囲外なら近い方の端点まで）"""
+    offsets = point - arcs["centers"]
+    angles = np.degrees(np.arctan2(offsets[:, 1], offsets[:, 0]))
+    sweeps = _arc_sweeps(arcs["start_angles"], arcs["end_angles"])
+    inside = np.mod(angles - arcs["start_angles"], 360.0) <= sweeps
+    to_curve = np.abs(np.linalg.norm(offsets, axis=1) - arcs["radii"])
+    to_ends = [
+        np.linalg.norm(offsets - arcs["radii"][:, None] * np.column_stack(
+            [np.cos(np.radians(a)), np.sin(np.radians(a))]), axis=1)
+        for a in (arcs["start_angles"], arcs["end_angles"])
+    ]
+    return np.where(inside, to_curve, np.minimum(*to_ends))
+
 
 class DXFParser:
     """DXFファイル解析クラス"""
 
-    def __init__(self, dxf_path: str):
+    def __init__(
+        self,
+        dxf_path: str,
+        streaming: bool = False,
+        spatial_index: bool = False,
+        contours: bool = False
+    ):
         """
         Args:
             dxf_path: DXFファイルのパス
+            streaming: 文書を構築せずにエンティティを1回だけ走査する（大きなファイル向け）。
+                entities / msp は使えない
+            spatial_index: analyze()で空間索引（一様グリッド）を構築する
+            contours: analyze()でLINE/ARC等から閉じた輪郭を復元する（レポートに輪郭の節を追加）
         """
         self.dxf_path = Path(dxf_path)
+        self.streaming = streaming
+        self.spatial_index = spatial_index
+        self.build_contours_on_analyze = contours
+        # 空間索引（GridIndex）。build_spatial_index()で構築
+        self.index = None
+        # 輪郭の列ストア（contours.assemble_contours()の戻り値）。build_contours()で構築
+        self.contours = None
         self.doc = None
         self.msp = None
+        self.dxfversion = None
         self.entities = []
+        self.entity_count = 0
         self.entity_types = Counter()
         self.bbox = None
+        # 形状統計 {"LINE": {...}, "CIRCLE": {...}, "ARC": {...}}
+        self.statistics = {}
+        # analyze()で構築する列ストア（座標はすべて (N, 2) のNumPy配列）
+        # lines: {"starts", "ends"}
+        # circles: {"centers", "radii"}
+        # arcs: {"centers", "radii", "start_angles", "end_angles"}
+        # polylines: {"points", "offsets", "closed"}（i番目の頂点は points[offsets[i]:offsets[i+1]]）
+        self.lines = None
+        self.circles = None
+        self.arcs = None
+        self.polylines = None
+        self.dimensions = None
 
     def load(self) -> bool:
         """
         DXFファイルを読み込み
 
+        ストリーミングモードではヘッダー（バージョン）のみを確認する。
+
         Returns:
             bool: 成功時True
         """
         try:
-            self.doc = ezdxf.readfile(str(self.dxf_path))
-            self.msp = self.doc.modelspace()
-            print(f"[SUCCESS] DXF loaded: {self.dxf_path}")
+            if self.streaming:
+                self.dxfversion = iterdxf.dxf_file_info(str(self.dxf_path)).version
+                print(f"[SUCCESS] DXF opened for streaming: {self.dxf_path}")
+            else:
+                self.doc = ezdxf.readfile(str(self.dxf_path))
+                self.msp = self.doc.modelspace()
+                self.dxfversion = self.doc.dxfversion
+                print(f"[SUCCESS] DXF loaded: {self.dxf_path}")
             return True
         except Exception as e:
             print(f"[FAILED] DXF load failed: {e}")
             return False
 
+    def _iter_entities(self) -> Iterator:
+        """モデル空間のエンティティを列挙（ストリーミングモードではファイルを先頭から走査）"""
+        if not self.streaming:
+            yield from self.msp
+            return
+        # iterdxf.single_pass_modelspace()は最後のエンティティを取りこぼすことがあるため、
+        # ファイル索引を使うmodelspace()を使う（メモリ使用量はどちらもエンティティ1個分）
+        yield from iterdxf.modelspace(str(self.dxf_path))
+
     def analyze(self):
-        """DXFファイルを解析してエンティティ情報を抽出"""
-        if not self.msp:
+        """
+        DXFファイルを解析してエンティティ情報を抽出
+
+        1回の走査でLINE/CIRCLE/ARC/LWPOLYLINEの座標を列ストアに格納し、
+        バウンディングボックスと形状統計は列ストアから一括計算する。
+        """
+        if self.dxfversion is None:
             print("[ERROR] DXF not loaded. Call load() first.")
             return
 
-        # 全エンティティを取得
-        self.entities = list(self.msp)
+        if not self.streaming:
+            # 全エンティティを取得
+            self.entities = list(self.msp)
 
-        # エンティティタイプをカウント
-        for entity in self.entities:
-            self.entity_types[entity.dxftype()] += 1
+        self.entity_count = 0
+        self.entity_types = Counter()
+        line_values = array("d")       # x1, y1, x2, y2
+        circle_values = array("d")     # cx, cy, r
+        arc_values = array("d")        # cx, cy, r, start_angle, end_angle
+        polyline_points = array("d")   # x, y
+        polyline_offsets = array("q", [0])
+        polyline_closed = array("b")
+        dimensions = []
+        # 列ストアに入らないエンティティ（スプライン・楕円等）のバウンディングボックス
+        other_box = BoundingBox2d()
 
-        # バウンディングボックスを計算
-        self._calculate_bbox()
+        entities = self.entities if not self.streaming else self._iter_entities()
+        for entity in entities:
+            dxftype = entity.dxftype()
+            self.entity_count += 1
+            self.entity_types[dxftype] += 1
 
-    def _calculate_bbox(self):
-        """バウンディングボックスを計算"""
-        try:
-            extents = self.msp.extents()
-            if extents is not None:
-                self.bbox = {
-                    "min": (extents[0].x, extents[0].y),
-                    "max": (extents[1].x, extents[1].y),
-                    "width": extents[1].x - extents[0].x,
-                    "height": extents[1].y - extents[0].y,
-                }
-        except Exception as e:
-            print(f"[WARNING] Bounding box calculation failed: {e}")
-            self.bbox = None
+            try:
+                if dxftype == "LINE":
+                    start, end = entity.dxf.start, entity.dxf.end
+                    line_values.extend((start.x, start.y, end.x, end.y))
+                    continue
+                if dxftype == "CIRCLE":
+                    center = entity.dxf.center
+                    circle_values.extend((center.x, center.y, entity.dxf.radius))
+                    continue
+                if dxftype == "ARC":
+                    center = entity.dxf.center
+                    arc_values.extend((center.x, center.y, entity.dxf.radius,
+                                       entity.dxf.start_angle, entity.dxf.end_angle))
+                    continue
+                if dxftype == "LWPOLYLINE":
+                    for point in entity.get_points("xy"):
+                        polyline_points.extend(point)
+                    polyline_offsets.append(len(polyline_points) // 2)
+                    polyline_closed.append(entity.closed)
+                elif dxftype == "DIMENSION":
+                    record = _dimension_record(entity)
+                    if record is not None:
+                        dimensions.append(record)
+
+                # ふくらみ（bulge）付きポリライン等はezdxfで範囲を求める
+                extents = ezdxf_bbox.extents([entity])
+                if extents.has_data:
+                    other_box.extend([(extents.extmin.x, extents.extmin.y),
+                                      (extents.extmax.x, extents.extmax.y)])
+            except Exception as e:
+                print(f"[WARNING] Failed to extract {dxftype}: {e}")
+
+        lines = _columns(line_values, 4)
+        circles = _columns(circle_values, 3)
+        arcs = _columns(arc_values, 5)
+        self.lines = {"starts": lines[:, 0:2], "ends": lines[:, 2:4]}
+        self.circles = {"centers": circles[:, 0:2], "radii": circles[:, 2]}
+        self.arcs = {
+            "centers": arcs[:, 0:2],
+            "radii": arcs[:, 2],
+            "start_angles": arcs[:, 3],
+            "end_angles": arcs[:, 4],
+        }
+        self.polylines = {
+            "points": _columns(polyline_points, 2),
+            "offsets": np.frombuffer(polyline_offsets, dtype=np.int64),
+            "closed": np.frombuffer(polyline_closed, dtype=np.int8).astype(bool),
+        }
+        self.dimensions = dimensions
+
+        self._compute_statistics()
+        self._compute_bbox(other_box)
+
+        self.index = None
+        if self.spatial_index:
+            self.build_spatial_index()
+        self.contours = None
+        if self.build_contours_on_analyze:
+            self.build_contours()
+
+    def build_spatial_index(self, cell_size: Optional[float] = None) -> Optional[GridIndex]:
+        """
+        列ストアのエンティティのバウンディングボックスから空間索引を構築
+
+        Args:
+            cell_size: グリッドのセルの一辺の長さ（Noneの場合は自動）
+
+        Returns:
+            Optional[GridIndex]: 構築した索引（未解析の場合はNone）
+        """
+        if self._store("lines") is None:
+            return None
+        self.index = GridIndex({dxftype: self._extents(dxftype) for dxftype in INDEXED_TYPES},
+                               cell_size=cell_size)
+        return self.index
+
+    def _compute_statistics(self):
+        """列ストアから形状統計を計算"""
+        lengths = np.hypot(*(self.lines["ends"] - self.lines["starts"]).T)
+        diameters = self.circles["radii"] * 2
+        arc_radii = self.arcs["radii"]
+        arc_lengths = np.radians(_arc_sweeps(self.arcs["start_angles"], self.arcs["end_angles"])) * arc_radii
+
+        min_length, max_length = _value_range(lengths)
+        min_diameter, max_diameter = _value_range(diameters)
+        min_radius, max_radius = _value_range(arc_radii)
+        self.statistics = {
+            "LINE": {
+                "count": len(lengths),
+                "total_length": float(lengths.sum()),
+                "min_length": min_length,
+                "max_length": max_length,
+            },
+            "CIRCLE": {
+                "count": len(diameters),
+                "min_diameter": min_diameter,
+                "max_diameter": max_diameter,
+            },
+            "ARC": {
+                "count": len(arc_radii),
+                "total_length": float(arc_lengths.sum()),
+                "min_radius": min_radius,
+                "max_radius": max_radius,
+            },
+        }
+
+    def _extents(self, dxftype: str) -> Tuple[np.ndarray, np.ndarray]:
+        """列ストアのエンティティごとの範囲 (N, 2) の最小・最大座標"""
+        if dxftype == "LINE":
+            starts, ends = self.lines["starts"], self.lines["ends"]
+            return np.minimum(starts, ends), np.maximum(starts, ends)
+        if dxftype == "CIRCLE":
+            centers, radii = self.circles["centers"], self.circles["radii"][:, None]
+            return centers - radii, centers + radii
+        if dxftype == "ARC":
+            return _arc_extents(self.arcs)
+        if dxftype == "LWPOLYLINE":
+            # 頂点のみで判定（ふくらみは考慮しない）
+            points, offsets = self.polylines["points"], self.polylines["offsets"]
+            if not len(points):
+                return np.empty((0, 2)), np.empty((0, 2))
+            return (np.minimum.reduceat(points, offsets[:-1]),
+                    np.maximum.reduceat(points, offsets[:-1]))
+        raise ValueError(f"Unsupported entity type: {dxftype}")
+
+    def _compute_bbox(self, other_box: BoundingBox2d):
+        """列ストアとその他のエンティティの範囲からバウンディングボックスを計算"""
+        corners = []
+        if other_box.has_data:
+            corners.append((np.array(other_box.extmin), np.array(other_box.extmax)))
+        for dxftype in ("LINE", "CIRCLE", "ARC"):
+            mins, maxs = self._extents(dxftype)
+            if len(mins):
+                corners.append((mins.min(axis=0), maxs.max(axis=0)))
+
+        self.bbox = None
+        if corners:
+            extmin = np.min([low for low, _ in corners], axis=0)
+            extmax = np.max([high for _, high in corners], axis=0)
+            self.bbox = {
+                "min": (float(extmin[0]), float(extmin[1])),
+                "max": (float(extmax[0]), float(extmax[1])),
+                "width": float(extmax[0] - extmin[0]),
+                "height": float(extmax[1] - extmin[1]),
+            }
+
+    def _store(self, name: str) -> Optional[Dict]:
+        """列ストアを取得（未解析の場合はanalyze()を実行）"""
+        if getattr(self, name) is None:
+            self.analyze()
+        return getattr(self, name)
+
+    def _line_records(self, limit: Optional[int] = None) -> List[Dict]:
+        lines = self._store("lines")
+        if lines is None:
+            return []
+        starts, ends = lines["starts"][:limit], lines["ends"][:limit]
+        lengths = np.hypot(*(ends - starts).T)
+        return [
+            {"start": tuple(start), "end": tuple(end), "length": length}
+            for start, end, length in zip(starts.tolist(), ends.tolist(), lengths.tolist())
+        ]
+
+    def _circle_records(self, limit: Optional[int] = None) -> List[Dict]:
+        circles = self._store("circles")
+        if circles is None:
+            return []
+        return [
+            {"center": tuple(center), "radius": radius, "diameter": radius * 2}
+            for center, radius in zip(circles["centers"][:limit].tolist(),
+                                      circles["radii"][:limit].tolist())
+        ]
+
+    def _arc_records(self, limit: Optional[int] = None) -> List[Dict]:
+        arcs = self._store("arcs")
+        if arcs is None:
+            return []
+        return [
+            {"center": tuple(center), "radius": radius,
+             "start_angle": start_angle, "end_angle": end_angle}
+            for center, radius, start_angle, end_angle in zip(
+                arcs["centers"][:limit].tolist(), arcs["radii"][:limit].tolist(),
+                arcs["start_angles"][:limit].tolist(), arcs["end_angles"][:limit].tolist())
+        ]
+
+    def _polyline_records(self, limit: Optional[int] = None) -> List[Dict]:
+        polylines = self._store("polylines")
+        if polylines is None:
+            return []
+        offsets = polylines["offsets"].tolist()
+        records = []
+        for i, is_closed in enumerate(polylines["closed"][:limit].tolist()):
+            points = [tuple(p) for p in polylines["points"][offsets[i]:offsets[i + 1]].tolist()]
+            records.append({"points": points, "is_closed": is_closed, "vertex_count": len(points)})
+        return records
+
+    def _dimension_records(self, limit: Optional[int] = None) -> List[Dict]:
+        return (self._store("dimensions") or [])[:limit]
 
     def get_lines(self) -> List[Dict]:
         """
@@ -81,13 +429,7 @@ class DXFParser:
         Returns:
             List[Dict]: 線分情報のリスト [{start, end, length}, ...]
         """
-        lines = []
-        for entity in self.msp.query("LINE"):
-            start = (entity.dxf.start.x, entity.dxf.start.y)
-            end = (entity.dxf.end.x, entity.dxf.end.y)
-            length = entity.dxf.start.distance(entity.dxf.end)
-            lines.append({"start": start, "end": end, "length": length})
-        return lines
+        return self._line_records()
 
     def get_circles(self) -> List[Dict]:
         """
@@ -96,16 +438,7 @@ class DXFParser:
         Returns:
             List[Dict]: 円情報のリスト [{center, radius, diameter}, ...]
         """
-        circles = []
-        for entity in self.msp.query("CIRCLE"):
-            center = (entity.dxf.center.x, entity.dxf.center.y)
-            radius = entity.dxf.radius
-            circles.append({
-                "center": center,
-                "radius": radius,
-                "diameter": radius * 2
-            })
-        return circles
+        return self._circle_records()
 
     def get_arcs(self) -> List[Dict]:
         """
@@ -114,19 +447,7 @@ class DXFParser:
         Returns:
             List[Dict]: 円弧情報のリスト [{center, radius, start_angle, end_angle}, ...]
         """
-        arcs = []
-        for entity in self.msp.query("ARC"):
-            center = (entity.dxf.center.x, entity.dxf.center.y)
-            radius = entity.dxf.radius
-            start_angle = entity.dxf.start_angle
-            end_angle = entity.dxf.end_angle
-            arcs.append({
-                "center": center,
-                "radius": radius,
-                "start_angle": start_angle,
-                "end_angle": end_angle
-            })
-        return arcs
+        return self._arc_records()
 
     def get_polylines(self) -> List[Dict]:
         """
@@ -135,15 +456,54 @@ class DXFParser:
         Returns:
             List[Dict]: ポリライン情報のリスト [{points, is_closed, vertex_count}, ...]
         """
-        polylines = []
-        for entity in self.msp.query("LWPOLYLINE"):
-            points = [(p[0], p[1]) for p in entity.get_points()]
-            polylines.append({
-                "points": points,
-                "is_closed": entity.closed,
-                "vertex_count": len(points)
+        return self._polyline_records()
+
+    def build_contours(self, tolerance: float = DEFAULT_TOLERANCE) -> Optional[Dict]:
+        """
+        LINE/ARC/LWPOLYLINE/CIRCLEから閉じた輪郭を復元
+
+        Args:
+            tolerance: 端点を同じ節点とみなす距離
+
+        Returns:
+            Optional[Dict]: 輪郭の列ストア（未解析の場合はNone）
+        """
+        if self._store("lines") is None:
+            return None
+        self.contours = assemble_contours(self.lines, self.arcs, self.circles, self.polylines, tolerance)
+        return self.contours
+
+    def get_contours(self) -> List[Dict]:
+        """
+        閉じた輪郭を抽出（面積の大きい順）
+
+        Returns:
+            List[Dict]: 輪郭情報のリスト [{area, perimeter, is_hole, depth, parent, bbox, entities}, ...]
+                is_hole は穴（外形の内側の輪郭）、parent はすぐ外側の輪郭の番号（なしはNone）、
+                entities は構成するエンティティ [(タイプ, インデックス), ...]
+        """
+        contours = self.contours if self.contours is not None else self.build_contours()
+        if contours is None:
+            return []
+        offsets = contours["edge_offsets"].tolist()
+        edge_types = [EDGE_SOURCE_TYPES[t] for t in contours["edge_types"].tolist()]
+        edge_ids = contours["edge_ids"].tolist()
+        records = []
+        for i, (area, perimeter, depth, parent, low, high) in enumerate(zip(
+                contours["areas"].tolist(), contours["perimeters"].tolist(),
+                contours["depths"].tolist(), contours["parents"].tolist(),
+                contours["bbox_mins"].tolist(), contours["bbox_maxs"].tolist())):
+            records.append({
+                "area": area,
+                "perimeter": perimeter,
+                "is_hole": depth % 2 == 1,
+                "depth": depth,
+                "parent": parent if parent >= 0 else None,
+                "bbox": {"min": tuple(low), "max": tuple(high)},
+                "entities": list(zip(edge_types[offsets[i]:offsets[i + 1]],
+                                     edge_ids[offsets[i]:offsets[i + 1]])),
             })
-        return polylines
+        return records
 
     def get_dimensions(self) -> List[Dict]:
         """
@@ -152,24 +512,296 @@ class DXFParser:
         Returns:
             List[Dict]: 寸法情報のリスト [{type, measurement, text}, ...]
         """
-        dimensions = []
-        for entity in self.msp.query("DIMENSION"):
-            try:
-                measurement = entity.get_measurement()
-                dim_type = entity.dxftype()
-                text = entity.dxf.text if hasattr(entity.dxf, 'text') else ""
-                dimensions.append({
-                    "type": dim_type,
-                    "measurement": measurement,
-                    "text": text
-                })
-            except Exception as e:
-                print(f"[WARNING] Failed to extract dimension: {e}")
-        return dimensions
+        return self._dimension_records()
+
+    # --- 一括クエリ（列ストアに対してNumPyで処理し、列ストアのインデックスを返す） ---
+
+    def circles_in_diameter_range(
+        self,
+        min_diameter: float = 0.0,
+        max_diameter: float = math.inf
+    ) -> np.ndarray:
+        """
+        直径が範囲内（両端を含む）の円を検索
+
+        Args:
+            min_diameter: 最小直径
+            max_diameter: 最大直径
+
+        Returns:
+            np.ndarray: 該当する円のインデックス（circles["centers"][indices] 等で参照）
+        """
+        circles = self._store("circles")
+        if circles is None:
+            return np.empty(0, dtype=np.intp)
+        diameters = circles["radii"] * 2
+        return np.flatnonzero((diameters >= min_diameter) & (diameters <= max_diameter))
+
+    def entities_in_box(
+        self,
+        box_min: Tuple[float, float],
+        box_max: Tuple[float, float],
+        types: Iterable[str] = ("LINE", "CIRCLE", "ARC", "LWPOLYLINE")
+    ) -> Dict[str, np.ndarray]:
+        """
+        矩形領域に完全に含まれるエンティティを検索
+
+        Args:
+            box_min: 領域の最小座標 (X, Y)
+            box_max: 領域の最大座標 (X, Y)
+            types: 検索するエンティティタイプ（LINE, CIRCLE, ARC, LWPOLYLINE）
+
+        Returns:
+            Dict[str, np.ndarray]: {エンティティタイプ: 該当するインデックス}
+        """
+        if self._store("lines") is None:
+            return {dxftype: np.empty(0, dtype=np.intp) for dxftype in types}
+        box_min, box_max = np.asarray(box_min, dtype=float), np.asarray(box_max, dtype=float)
+        found = {}
+        for dxftype in types:
+            mins, maxs = self._extents(dxftype)
+            inside = np.all(mins >= box_min, axis=1) & np.all(maxs <= box_max, axis=1)
+            found[dxftype] = np.flatnonzero(inside)
+        return found
+
+    def nearest_circles(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        各点に最も近い中心を持つ円を検索
+
+        Args:
+            points: 点の座標 (M, 2)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (円のインデックス (M,), 中心までの距離 (M,))
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        circles = self._store("circles")
+        if circles is None or not len(circles["radii"]):
+            return np.full(len(points), -1, dtype=np.intp), np.full(len(points), math.inf)
+        distances = np.linalg.norm(points[:, None, :] - circles["centers"][None, :, :], axis=2)
+        indices = distances.argmin(axis=1)
+        return indices, distances[np.arange(len(points)), indices]
+
+    def nearest_circle(self, point: Tuple[float, float]) -> Optional[Tuple[int, float]]:
+        """
+        点に最も近い中心を持つ円を検索
+
+        Args:
+            point: 点の座標 (X, Y)
+
+        Returns:
+            Optional[Tuple[int, float]]: (円のインデックス, 中心までの距離)。円がない場合はNone
+        """
+        indices, distances = self.nearest_circles([point])
+        if indices[0] < 0:
+            return None
+        return int(indices[0]), float(distances[0])
+
+    def hole_spacings(self, indices: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        円（穴）の中心間距離を全組み合わせで計算
+
+        Args:
+            indices: 対象の円のインデックス（Noneの場合は全ての円）
+
+        Returns:
+            np.ndarray: 中心間距離の行列 (N, N)
+        """
+        circles = self._store("circles")
+        if circles is None:
+            return np.empty((0, 0))
+        centers = circles["centers"]
+        if indices is not None:
+            centers = centers[np.asarray(list(indices), dtype=np.intp)]
+        return np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=2)
+
+    def query_window(
+        self,
+        box_min: Tuple[float, float],
+        box_max: Tuple[float, float],
+        types: Iterable[str] = INDEXED_TYPES
+    ) -> Dict[str, np.ndarray]:
+        """
+        バウンディングボックスが矩形領域と重なる（接する）エンティティを検索
+
+        空間索引があれば索引を使い、なければ全件を判定する。
+
+        Args:
+            box_min: 領域の最小座標 (X, Y)
+            box_max: 領域の最大座標 (X, Y)
+            types: 検索するエンティティタイプ（LINE, CIRCLE, ARC, LWPOLYLINE）
+
+        Returns:
+            Dict[str, np.ndarray]: {エンティティタイプ: 該当するインデックス}
+        """
+        types = list(types)
+        if self.index is not None:
+            return self.index.query(box_min, box_max, types)
+        if self._store("lines") is None:
+            return {dxftype: np.empty(0, dtype=np.intp) for dxftype in types}
+        box_min, box_max = np.asarray(box_min, dtype=float), np.asarray(box_max, dtype=float)
+        found = {}
+        for dxftype in types:
+            mins, maxs = self._extents(dxftype)
+            overlaps = np.all(maxs >= box_min, axis=1) & np.all(mins <= box_max, axis=1)
+            found[dxftype] = np.flatnonzero(overlaps)
+        return found
+
+    def distances_to(
+        self,
+        point: Tuple[float, float],
+        dxftype: str,
+        indices: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        点からエンティティの線（円周・円弧・線分）までの距離
+
+        Args:
+            point: 点の座標 (X, Y)
+            dxftype: エンティティタイプ（LINE, CIRCLE, ARC, LWPOLYLINE）
+            indices: 対象のインデックス（Noneの場合は全て）
+
+        Returns:
+            np.ndarray: 距離の配列
+        """
+        point = np.asarray(point, dtype=float)
+        if dxftype == "LINE":
+            rows = slice(None) if indices is None else indices
+            return _segment_distances(point, self.lines["starts"][rows], self.lines["ends"][rows])
+        if dxftype == "CIRCLE":
+            rows = slice(None) if indices is None else indices
+            centers, radii = self.circles["centers"][rows], self.circles["radii"][rows]
+            return np.abs(np.linalg.norm(point - centers, axis=1) - radii)
+        if dxftype == "ARC":
+            rows = slice(None) if indices is None else indices
+            return _arc_distances(point, {name: values[rows] for name, values in self.arcs.items()})
+        if dxftype == "LWPOLYLINE":
+            if indices is None:
+                indices = np.arange(len(self.polylines["closed"]))
+            points, offsets = self.polylines["points"], self.polylines["offsets"]
+            distances = np.empty(len(indices))
+            for n, i in enumerate(np.asarray(indices).tolist()):
+                vertices = points[offsets[i]:offsets[i + 1]]
+                if self.polylines["closed"][i]:
+                    vertices = np.concatenate([vertices, vertices[:1]])
+                if len(vertices) == 1:
+                    distances[n] = np.linalg.norm(point - vertices[0])
+                else:
+                    distances[n] = _segment_distances(point, vertices[:-1], vertices[1:]).min()
+            return distances
+        raise ValueError(f"Unsupported entity type: {dxftype}")
+
+    def nearest_entity(
+        self,
+        point: Tuple[float, float],
+        types: Iterable[str] = INDEXED_TYPES
+    ) -> Optional[Tuple[str, int, float]]:
+        """
+        点に最も近いエンティティを検索（距離はエンティティの線までの距離）
+
+        空間索引があれば索引を使い、なければ全件の距離を計算する。
+
+        Args:
+            point: 点の座標 (X, Y)
+            types: 対象のエンティティタイプ（LINE, CIRCLE, ARC, LWPOLYLINE）
+
+        Returns:
+            Optional[Tuple[str, int, float]]: (エンティティタイプ, インデックス, 距離)。該当なしの場合はNone
+        """
+        types = list(types)
+        if self.index is not None:
+            return self.index.nearest(point, lambda dxftype, ids: self.distances_to(point, dxftype, ids), types)
+        if self._store("lines") is None:
+            return None
+        best = None
+        for dxftype in types:
+            distances = self.distances_to(point, dxftype)
+            if len(distances):
+                i = int(distances.argmin())
+                if best is None or distances[i] < best[2]:
+                    best = (dxftype, i, float(distances[i]))
+        return best
+
+    def hole_edge_distances(self, types: Iterable[str] = ("LINE", "ARC", "LWPOLYLINE")) -> np.ndarray:
+        """
+        各円（穴）の円周から最も近い縁（線分・円弧・ポリライン）までの距離
+
+        Args:
+            types: 縁とみなすエンティティタイプ
+
+        Returns:
+            np.ndarray: 円ごとの距離 (N,)。縁がない場合はinf
+        """
+        circles = self._store("circles")
+        if circles is None:
+            return np.empty(0)
+        types = list(types)
+        distances = np.full(len(circles["radii"]), math.inf)
+        for i, (center, radius) in enumerate(zip(circles["centers"], circles["radii"])):
+            nearest = self.nearest_entity(center, types)
+            if nearest is not None:
+                distances[i] = nearest[2] - radius
+        return distances
+
+    def get_result(self) -> DXFAnalysis:
+        """
+        解析結果を構造化データとして取得（未解析の場合はanalyze()を実行）
+
+        Returns:
+            DXFAnalysis: エンティティ統計・バウンディングボックス・形状統計・全ての円・
+                エンティティタイプごとの先頭 REPORT_SAMPLE_SIZE 個・輪郭の概要
+        """
+        samples = {
+            dxftype: read_records(REPORT_SAMPLE_SIZE)
+            for dxftype, read_records in (
+                ("LINE", self._line_records),
+                ("CIRCLE", self._circle_records),
+                ("ARC", self._arc_records),
+                ("LWPOLYLINE", self._polyline_records),
+                ("DIMENSION", self._dimension_records),
+            )
+        }
+        samples = {dxftype: records for dxftype, records in samples.items() if records}
+
+        contours = None
+        if self.contours is not None:
+            depths = self.contours["depths"]
+            parents = self.contours["parents"]
+            holes = depths % 2 == 1
+            hole_counts = np.bincount(parents[holes], minlength=len(depths))
+            contours = {
+                "count": len(depths),
+                "outlines": int((~holes).sum()),
+                "holes": int(holes.sum()),
+                "open_edges": int(self.contours["open_edges"]),
+                "samples": [
+                    {
+                        "area": float(self.contours["areas"][i]),
+                        "perimeter": float(self.contours["perimeters"][i]),
+                        "is_hole": bool(holes[i]),
+                        "parent": int(parents[i]) if parents[i] >= 0 else None,
+                        "hole_count": int(hole_counts[i]),
+                    }
+                    for i in range(min(len(depths), REPORT_SAMPLE_SIZE))
+                ],
+            }
+
+        return DXFAnalysis(
+            path=str(self.dxf_path),
+            file_size=self.dxf_path.stat().st_size,
+            dxfversion=self.dxfversion,
+            entity_count=self.entity_count,
+            entity_types=dict(self.entity_types),
+            bbox=self.bbox,
+            statistics=self.statistics,
+            circles=self.get_circles(),
+            samples=samples,
+            contours=contours,
+        )
 
     def generate_report(self, output_path: Optional[str] = None) -> str:
         """
-        解析結果レポートを生成
+        解析結果レポートを生成（get_result()の結果を描画）
 
         Args:
             output_path: レポート出力先パス（Noneの場合は標準出力のみ）
@@ -177,112 +809,33 @@ class DXFParser:
         Returns:
             str: レポートテキスト
         """
-        lines = []
-        lines.append("=" * 80)
-        lines.append(f"DXF解析レポート: {self.dxf_path.name}")
-        lines.append("=" * 80)
-        lines.append("")
-
-        # ファイル情報
-        lines.append("## ファイル情報")
-        file_size = self.dxf_path.stat().st_size / 1024
-        lines.append(f"- ファイルパス: {self.dxf_path}")
-        lines.append(f"- ファイルサイズ: {file_size:.1f} KB")
-        lines.append(f"- DXFバージョン: {self.doc.dxfversion}")
-        lines.append("")
-
-        # エンティティ統計
-        lines.append("## エンティティ統計")
-        lines.append(f"- 総エンティティ数: {len(self.entities)}")
-        for entity_type, count in sorted(self.entity_types.items()):
-            lines.append(f"  - {entity_type}: {count}")
-        lines.append("")
-
-        # バウンディングボックス
-        if self.bbox:
-            lines.append("## バウンディングボックス")
-            lines.append(f"- 最小座標 (X, Y): ({self.bbox['min'][0]:.2f}, {self.bbox['min'][1]:.2f})")
-            lines.append(f"- 最大座標 (X, Y): ({self.bbox['max'][0]:.2f}, {self.bbox['max'][1]:.2f})")
-            lines.append(f"- 幅 x 高さ: {self.bbox['width']:.2f} x {self.bbox['height']:.2f}")
-            lines.append("")
-
-        # 詳細エンティティ情報
-        lines.append("## 詳細エンティティ情報")
-
-        # 線分
-        line_entities = self.get_lines()
-        if line_entities:
-            lines.append(f"\n### 線分（LINE）: {len(line_entities)} 個")
-            for i, line in enumerate(line_entities[:5], 1):  # 最初の5つのみ表示
-                lines.append(f"  {i}. 始点 {line['start']}, 終点 {line['end']}, 長さ {line['length']:.2f}")
-            if len(line_entities) > 5:
-                lines.append(f"  ... 他 {len(line_entities) - 5} 個")
-
-        # 円
-        circle_entities = self.get_circles()
-        if circle_entities:
-            lines.append(f"\n### 円（CIRCLE）: {len(circle_entities)} 個")
-            for i, circle in enumerate(circle_entities[:5], 1):
-                lines.append(f"  {i}. 中心 {circle['center']}, 半径 {circle['radius']:.2f}, 直径 {circle['diameter']:.2f}")
-            if len(circle_entities) > 5:
-                lines.append(f"  ... 他 {len(circle_entities) - 5} 個")
-
-        # 円弧
-        arc_entities = self.get_arcs()
-        if arc_entities:
-            lines.append(f"\n### 円弧（ARC）: {len(arc_entities)} 個")
-            for i, arc in enumerate(arc_entities[:5], 1):
-                lines.append(f"  {i}. 中心 {arc['center']}, 半径 {arc['radius']:.2f}, 角度 {arc['start_angle']:.1f}°-{arc['end_angle']:.1f}°")
-            if len(arc_entities) > 5:
-                lines.append(f"  ... 他 {len(arc_entities) - 5} 個")
-
-        # ポリライン
-        polyline_entities = self.get_polylines()
-        if polyline_entities:
-            lines.append(f"\n### ポリライン（LWPOLYLINE）: {len(polyline_entities)} 個")
-            for i, pl in enumerate(polyline_entities[:5], 1):
-                closed_str = "閉" if pl['is_closed'] else "開"
-                lines.append(f"  {i}. 頂点数 {pl['vertex_count']}, 状態 {closed_str}")
-            if len(polyline_entities) > 5:
-                lines.append(f"  ... 他 {len(polyline_entities) - 5} 個")
-
-        # 寸法
-        dimension_entities = self.get_dimensions()
-        if dimension_entities:
-            lines.append(f"\n### 寸法（DIMENSION）: {len(dimension_entities)} 個")
-            for i, dim in enumerate(dimension_entities[:5], 1):
-                lines.append(f"  {i}. タイプ {dim['type']}, 測定値 {dim['measurement']:.2f}, テキスト '{dim['text']}'")
-            if len(dimension_entities) > 5:
-                lines.append(f"  ... 他 {len(dimension_entities) - 5} 個")
-
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("[完了] DXF解析完了")
-        lines.append("=" * 80)
-
-        report = "\n".join(lines)
-
-        # ファイルに保存
+        result = self.get_result()
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(report)
-            print(f"[SUCCESS] レポート保存: {output_path}")
-
-        return report
+            return result.save_report(output_path)
+        return result.to_report()
 
 
-def parse_dxf(dxf_path: str, report_path: Optional[str] = None) -> DXFParser:
+def parse_dxf(
+    dxf_path: str,
+    report_path: Optional[str] = None,
+    streaming: bool = False,
+    spatial_index: bool = False,
+    contours: bool = False
+) -> DXFParser:
     """
     DXFファイルを解析してレポートを生成
 
     Args:
         dxf_path: DXFファイルのパス
         report_path: レポート出力先パス（Noneの場合は保存しない）
+        streaming: 文書を構築せずに1回の走査で解析する（大きなファイル向け）
+        spatial_index: 空間索引を構築する（query_window() / nearest_entity()の高速化）
+        contours: 閉じた輪郭を復元してレポートに含める
 
     Returns:
         DXFParser: 解析済みパーサーインスタンス
     """
-    parser = DXFParser(dxf_path)
+    parser = DXFParser(dxf_path, streaming=streaming, spatial_index=spatial_index, contours=contours)
 
     if not parser.load():
         return None
@@ -297,11 +850,12 @@ def parse_dxf(dxf_path: str, report_path: Optional[str] = None) -> DXFParser:
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) < 2:
-        print("Usage: python3 dxf_parser.py <dxf_file> [output_report.txt]")
+    args = [arg for arg in sys.argv[1:] if arg != "--streaming"]
+    if not args:
+        print("Usage: python3 dxf_parser.py [--streaming] <dxf_file> [output_report.txt]")
         sys.exit(1)
 
-    dxf_file = sys.argv[1]
-    report_file = sys.argv[2] if len(sys.argv) > 2 else None
+    dxf_file = args[0]
+    report_file = args[1] if len(args) > 1 else None
 
-    parse_dxf(dxf_file, report_file)
+    parse_dxf(dxf_file, report_file, streaming="--streaming" in sys.argv)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+CadQueryエクスポートキャッシュ
+
+設計ループの反復でモデルが変わっていなければ、STEP/STL/DXF/SVG等の書き出しを省略する。
+キーはBRepのテキスト表現（三角形分割を除く）のハッシュと、形式・エクスポートオプション・
+CadQueryのバージョンから計算し、出力ディレクトリのマニフェストにキー→ファイルを記録する。
+同じキーのファイルが別名で存在する場合はハードリンク（不可ならコピー）で再利用する。
+"""
+
+import fcntl
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import cadquery as cq
+from OCP.BRepTools import BRepTools
+from OCP.TopTools import TopTools_FormatVersion
+
+try:
+    from .process_pool import worker_context as _worker_context
+except ImportError:
+    # scripts/export_cache.py として直接実行された場合
+    from process_pool import worker_context as _worker_context
+
+
+# マニフェストの形式が変わったら上げる（古いマニフェストは無視される）
+MANIFEST_VERSION = 1
+MANIFEST_NAME = ".export_manifest.json"
+
+# BRepテキストのTShapeフラグ行（Free/Modified/Checked/...の7桁）。
+# メッシュ化や検査で変わるだけでジオメトリとは無関係なため、ハッシュから除外する
+_FLAGS_LINE_RE = re.compile(rb"^[01]{7}$", re.MULTILINE)
+
+
+def brep_bytes(model) -> bytes:
+    """
+    モデルをBRepのテキスト表現に変換（三角形分割・法線は含めない）
+
+    Args:
+        model: CadQueryモデル（WorkplaneまたはShape）
+
+    Returns:
+        bytes: BRepテキスト
+    """
+    if isinstance(model, cq.Shape):
+        shapes = [model]
+    else:
+        shapes = [v for v in model.vals() if isinstance(v, cq.Shape)]
+    buffer = io.BytesIO()
+    BRepTools.Write_s(
+        cq.Compound.makeCompound(shapes).wrapped, buffer, False, False,
+        TopTools_FormatVersion.TopTools_FormatVersion_VERSION_3
+    )
+    return buffer.getvalue()
+
+
+def worker_context():
+    """
+    BRepのバイト列を受け渡すワーカープロセス用のmultiprocessingコンテキスト
+
+    OCPを読み込んだプロセスはスレッドを持つためforkせず（process_pool.worker_context()参照）、
+    モデルはbrep_bytes()のバイト列で渡す。forkserverはCadQueryを読み込んだ状態
+    （読み込みだけではスレッドは作られない）で待機させ、ワーカーごとの読み込み時間を省く。
+
+    Returns:
+        multiprocessing.context.BaseContext: ProcessPoolExecutorのmp_context
+    """
+    return _worker_context(preload=("cadquery",))
+
+
+def shape_hash(model) -> str:
+    """
+    モデルのジオメトリのハッシュ
+
+    メッシュ化・エクスポート済みかどうかに依存せず、同じ手順で作ったモデルは同じ値になる。
+
+    Args:
+        model: CadQueryモデル
+
+    Returns:
+        str: SHA-256の16進文字列
+    """
+    return hashlib.sha256(_FLAGS_LINE_RE.sub(b"", brep_bytes(model))).hexdigest()
+
+
+def export_key(digest: str, export_format: str, options: dict = None) -> str:
+    """
+    エクスポートのキャッシュキーを計算
+
+    Args:
+        digest: shape_hash()の戻り値
+        export_format: "step", "stl", "3mf", "dxf", "svg"等
+        options: 出力内容に影響するオプション（許容差、断面位置等）
+
+    Returns:
+        str: キャッシュキー
+    """
+    payload = json.dumps(
+        [MANIFEST_VERSION, cq.__version__, digest, export_format, options or {}],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ExportManifest:
+    """
+    出力ディレクトリごとのエクスポート記録（キー → ファイル）
+
+    複数プロセスから同時に書き出してもよいよう、更新はロックファイルで排他する。
+
+    Usage:
+        manifest = ExportManifest("outputs/cadquery")
+        key = export_key(shape_hash(model), "step")
+        if not manifest.restore(key, "outputs/cadquery/model.step"):
+            export_step(model, "outputs/cadquery/model.step")
+            manifest.record(key, "outputs/cadquery/model.step")
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Args:
+            output_dir: 出力ディレクトリ（マニフェストを置く場所）
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_NAME
+        self._lock_path = self.output_dir / f"{MANIFEST_NAME}.lock"
+
+    @contextmanager
+    def _locked(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> dict:
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"version": MANIFEST_VERSION, "entries": {}}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {"version": MANIFEST_VERSION, "entries": {}}
+        return manifest
+
+    def _save(self, manifest: dict):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _relative(self, output_path: str) -> str:
+        return os.path.relpath(Path(output_path).resolve(), self.output_dir.resolve())
+
+    @staticmethod
+    def _unchanged(path: Path, record: dict) -> bool:
+        """記録後に書き換えられていないか（サイズとmtimeで判定）"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]
+
+    def restore(self, key: str, output_path: str) -> bool:
+        """
+        キャッシュされた成果物をoutput_pathに用意する
+
+        output_path自体が記録済みで変更されていなければ何もしない。
+        別名のファイルが記録されていればハードリンク（失敗時はコピー）する。
+
+        Args:
+            key: export_key()の戻り値
+            output_path: 出力ファイルパス
+
+        Returns:
+            bool: キャッシュヒット時True（書き出し不要）
+        """
+        with self._locked():
+            manifest = self._load()
+            entry = manifest["entries"].get(key)
+            if entry is None:
+                return False
+
+            target = self._relative(output_path)
+            files = entry["files"]
+            if target in files and self._unchanged(Path(output_path), files[target]):
+                return True
+
+            for name, record in files.items():
+                source = self.output_dir / name
+                if name == target or not self._unchanged(source, record):
+                    continue
+                destination = Path(output_path)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                if destination.exists():
+                    destination.unlink()
+                try:
+                    os.link(source, destination)
+                except OSError:
+                    shutil.copy2(source, destination)
+                files[target] = self._stat_record(destination)
+                self._save(manifest)
+                return True
+
+            return False
+
+    def record(self, key: str, output_path: str, shape_digest: Optional[str] = None):
+        """
+        書き出したファイルを記録
+
+        Args:
+            key: export_key()の戻り値
+            output_path: 書き出したファイルパス
+            shape_digest: shape_hash()の戻り値（マニフェストの参照用）
+        """
+        with self._locked():
+            manifest = self._load()
+            target = self._relative(output_path)
+            # 同じファイルを指す古いキーは削除（上書きされたため無効）
+            for other_key, entry in list(manifest["entries"].items()):
+                if other_key != key and entry["files"].pop(target, None) and not entry["files"]:
+                    del manifest["entries"][other_key]
+            entry = manifest["entries"].setdefault(key, {"files": {}})
+            if shape_digest is not None:
+                entry["shape_hash"] = shape_digest
+            entry["files"][target] = self._stat_record(Path(output_path))
+            self._save(manifest)
+
+    @staticmethod
+    def prepare(output_path: str):
+        """
+        書き出し前の準備: ハードリンクされたファイルを上書きすると
+        リンク先も書き換わるため、先にリンクを切る
+        """
+        path = Path(output_path)
+        try:
+            if path.stat().st_nlink > 1:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _stat_record(path: Path) -> dict:
+        stat = path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
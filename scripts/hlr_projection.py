@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+BRepからの2D投影（隠線処理）
+
+create_2d_projections() はSTLをimport()してprojection()するSCADファイルを生成するため、
+OpenSCADがビューごとにメッシュを読み込んでCGALで投影する必要がある。
+このモジュールはOCCTの隠線処理（HLRBRep_Algo）で正確なBRepから直接
+上面図・正面図・側面図の輪郭線を求め、DXF/SVGに書き出す。
+円・円弧はメッシュ化されずに円・円弧のまま出力されるため、
+DXFParser.get_circles() / SVGParser.get_circles() で穴を検出できる。
+"""
+
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import cadquery as cq
+from cadquery.occ_impl.exporters.dxf import DxfDocument
+from OCP.BRepAdaptor import BRepAdaptor_Curve
+from OCP.BRepLib import BRepLib
+from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+from OCP.HLRAlgo import HLRAlgo_Projector
+from OCP.HLRBRep import HLRBRep_Algo, HLRBRep_HLRToShape
+from OCP.gp import gp_Ax2, gp_Dir, gp_Pnt
+
+try:
+    from .export_cache import brep_bytes, worker_context
+except ImportError:
+    # scripts/hlr_projection.py として直接実行された場合
+    from export_cache import brep_bytes, worker_context
+
+
+# ビューごとの投影方向（視点側を向く法線）と図面の右方向。
+# 図面の上方向は 法線 × 右方向 になる（上面図: +Y、正面図・側面図: +Z）
+PROJECTION_VIEWS = {
+    "top": ((0, 0, 1), (1, 0, 0)),     # 上から見た図 (X, Y)
+    "front": ((0, -1, 0), (1, 0, 0)),  # 正面（-Y側）から見た図 (X, Z)
+    "side": ((1, 0, 0), (0, 1, 0)),    # 右側面（+X側）から見た図 (Y, Z)
+}
+
+# SVGで円弧・円以外の曲線を折れ線にするときの弦誤差（mm）
+SVG_CURVE_DEFLECTION = 0.01
+
+_SVG_MARGIN = 5.0
+
+
+def project_view(model, view: str = "top", hidden: bool = False) -> Dict[str, Optional[cq.Shape]]:
+    """
+    モデルを隠線処理して1ビュー分の輪郭線を求める
+
+    Args:
+        model: CadQueryモデル（WorkplaneまたはShape）
+        view: "top", "front", "side"
+        hidden: 隠れ線も求める
+
+    Returns:
+        dict: {"visible": 可視線, "hidden": 隠れ線（hidden=Falseまたは無ければNone）}
+              いずれも図面座標（Z=0の平面上）のエッジのCompound
+    """
+    if view not in PROJECTION_VIEWS:
+        raise ValueError(f"Unknown view: {view} (expected one of {', '.join(PROJECTION_VIEWS)})")
+    normal, x_direction = PROJECTION_VIEWS[view]
+
+    if isinstance(model, cq.Shape):
+        shapes = [model]
+    else:
+        shapes = [v for v in model.vals() if isinstance(v, cq.Shape)]
+
+    algo = HLRBRep_Algo()
+    for shape in shapes:
+        algo.Add(shape.wrapped)
+    algo.Projector(HLRAlgo_Projector(gp_Ax2(gp_Pnt(0, 0, 0), gp_Dir(*normal), gp_Dir(*x_direction))))
+    algo.Update()
+    algo.Hide()
+    extractor = HLRBRep_HLRToShape(algo)
+
+    # シャープエッジ・接線連続エッジ（フィレット境界）・シルエット（円筒等）
+    groups = {
+        "visible": (extractor.VCompound(), extractor.Rg1LineVCompound(), extractor.OutLineVCompound()),
+    }
+    if hidden:
+        groups["hidden"] = (
+            extractor.HCompound(), extractor.Rg1LineHCompound(), extractor.OutLineHCompound()
+        )
+
+    result = {"visible": None, "hidden": None}
+    for name, compounds in groups.items():
+        edges = []
+        for compound in compounds:
+            if compound.IsNull():
+                continue
+            for edge in cq.Shape.cast(compound).Edges():
+                # 隠線処理の結果は2D曲線のみのため、書き出し用に3D曲線を作る
+                BRepLib.BuildCurves3d_s(edge.wrapped)
+                edges.append(edge)
+        if edges:
+            result[name] = cq.Compound.makeCompound(edges)
+    return result
+
+
+def write_projection_dxf(projection: Dict[str, Optional[cq.Shape]], output_path: str):
+    """
+    投影結果をDXFに書き出す（可視線は"VISIBLE"、隠れ線は"HIDDEN"レイヤー）
+
+    Args:
+        projection: project_view()の戻り値
+        output_path: 出力ファイルパス
+    """
+    document = DxfDocument()
+    document.add_layer("VISIBLE")
+    if projection.get("hidden") is not None:
+        document.add_layer("HIDDEN", color=8)
+    for layer, name in (("VISIBLE", "visible"), ("HIDDEN", "hidden")):
+        if projection.get(name) is not None:
+            # DxfDocument.add_shape()はShapeを直接渡すとスプラインの変換に失敗するため、
+            # XY平面（座標変換なし）のWorkplaneとして渡す
+            document.add_shape(cq.Workplane("XY").newObject([projection[name]]), layer=layer)
+    document.document.saveas(output_path)
+
+
+def _svg_edge(edge: cq.Edge) -> str:
+    """エッジをSVG要素に変換（Y軸は下向きに反転）"""
+    geom_type = edge.geomType()
+
+    if geom_type == "LINE":
+        start, end = edge.startPoint(), edge.endPoint()
+        return (f'<line x1="{start.x:.4f}" y1="{-start.y:.4f}" '
+                f'x2="{end.x:.4f}" y2="{-end.y:.4f}" />')
+
+    if geom_type == "CIRCLE":
+        center, radius = edge.arcCenter(), edge.radius()
+        if edge.IsClosed():
+            return f'<circle cx="{center.x:.4f}" cy="{-center.y:.4f}" r="{radius:.4f}" />'
+        curve = BRepAdaptor_Curve(edge.wrapped)
+        span = abs(curve.LastParameter() - curve.FirstParameter())
+        start, middle, end = edge.startPoint(), edge.positionAt(0.5), edge.endPoint()
+        # 画面座標（Y下向き）で始点→中点→終点が時計回りなら正の角度方向（sweep=1）
+        cross = ((middle.x - start.x) * (-end.y + middle.y)
+                 - (-middle.y + start.y) * (end.x - middle.x))
+        large_arc = int(span > math.pi)
+        sweep = int(cross > 0)
+        return (f'<path d="M {start.x:.4f} {-start.y:.4f} '
+                f'A {radius:.4f} {radius:.4f} 0 {large_arc} {sweep} {end.x:.4f} {-end.y:.4f}" />')
+
+    # 楕円・スプライン等は折れ線で近似
+    curve = BRepAdaptor_Curve(edge.wrapped)
+    sampler = GCPnts_QuasiUniformDeflection(curve, SVG_CURVE_DEFLECTION)
+    if sampler.IsDone() and sampler.NbPoints() >= 2:
+        points = [sampler.Value(i) for i in range(1, sampler.NbPoints() + 1)]
+        coords = [(p.X(), p.Y()) for p in points]
+    else:
+        coords = [(p.x, p.y) for p in (edge.startPoint(), edge.endPoint())]
+    d = " L ".join(f"{x:.4f} {-y:.4f}" for x, y in coords)
+    return f'<path d="M {d}" />'
+
+
+def write_projection_svg(
+    projection: Dict[str, Optional[cq.Shape]],
+    output_path: str,
+    stroke_width: float = 0.25
+):
+    """
+    投影結果をSVGに書き出す（単位はmm、隠れ線は破線）
+
+    直線は<line>、円は<circle>、円弧は円弧コマンドの<path>として出力する。
+
+    Args:
+        projection: project_view()の戻り値
+        output_path: 出力ファイルパス
+        stroke_width: 線幅（mm）
+    """
+    shapes = [s for s in (projection.get("visible"), projection.get("hidden")) if s is not None]
+    if shapes:
+        bb = cq.Compound.makeCompound(shapes).BoundingBox()
+        xmin, xmax, ymin, ymax = bb.xmin, bb.xmax, bb.ymin, bb.ymax
+    else:
+        xmin = xmax = ymin = ymax = 0.0
+    width = xmax - xmin + 2 * _SVG_MARGIN
+    height = ymax - ymin + 2 * _SVG_MARGIN
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.4f}mm" height="{height:.4f}mm" '
+        f'viewBox="{xmin - _SVG_MARGIN:.4f} {-ymax - _SVG_MARGIN:.4f} {width:.4f} {height:.4f}">',
+    ]
+    styles = {
+        "hidden": f'stroke="rgb(160,160,160)" stroke-dasharray="{stroke_width * 8:g},{stroke_width * 4:g}"',
+        "visible": 'stroke="rgb(0,0,0)"',
+    }
+    # 隠れ線を先に描き、可視線を上に重ねる
+    for name in ("hidden", "visible"):
+        if projection.get(name) is None:
+            continue
+        lines.append(f'<g id="{name}" fill="none" {styles[name]} stroke-width="{stroke_width:g}">')
+        lines.extend(_svg_edge(edge) for edge in projection[name].Edges())
+        lines.append("</g>")
+    lines.append("</svg>")
+
+    Path(output_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _write_view(model, view: str, paths: Dict[str, str], hidden: bool) -> Dict[str, str]:
+    """1ビューを投影してDXF/SVGに書き出す"""
+    projection = project_view(model, view, hidden)
+    written = {}
+    if "dxf" in paths:
+        write_projection_dxf(projection, paths["dxf"])
+        written["dxf"] = paths["dxf"]
+    if "svg" in paths:
+        write_projection_svg(projection, paths["svg"])
+        written["svg"] = paths["svg"]
+    return written
+
+
+def _write_view_in_worker(data: bytes, view: str, paths: Dict[str, str], hidden: bool) -> Dict[str, str]:
+    """ワーカープロセスで1ビューを書き出す"""
+    return _write_view(cq.Shape.importBrep(io.BytesIO(data)), view, paths, hidden)
+
+
+def create_native_projections(
+    model,
+    name_prefix: str,
+    output_dir: str = "outputs/cadquery",
+    views: tuple = ("top", "front", "side"),
+    formats: tuple = ("dxf", "svg"),
+    hidden: bool = False,
+    workers: int = 1
+) -> Dict[str, Dict[str, str]]:
+    """
+    BRepから直接2D投影図（DXF/SVG）を生成
+
+    create_2d_projections() のSTL+OpenSCAD projection() の代わりに使う。
+    ファイル名は "<プレフィックス>_2d_<ビュー>.<形式>"。
+
+    Args:
+        model: CadQueryモデル
+        name_prefix: ファイル名のプレフィックス
+        output_dir: 出力ディレクトリ
+        views: 出力するビュー（"top", "front", "side"）
+        formats: 出力形式（"dxf", "svg"）
+        hidden: 隠れ線も出力する
+        workers: ワーカープロセス数（1なら逐次実行、Noneならビュー数とCPU数の小さい方）
+
+    Returns:
+        dict: {"view_name": {"dxf": パス, "svg": パス}}（失敗したビューは含まない）
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    jobs = {
+        view: {fmt: f"{output_dir}/{name_prefix}_2d_{view}.{fmt}" for fmt in formats}
+        for view in views
+    }
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+    results = {}
+    if workers <= 1:
+        for view, paths in jobs.items():
+            try:
+                results[view] = _write_view(model, view, paths, hidden)
+            except Exception as e:
+                print(f"[FAILED] {view} projection failed: {e}")
+    else:
+        data = brep_bytes(model)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+            futures = {
+                view: executor.submit(_write_view_in_worker, data, view, paths, hidden)
+                for view, paths in jobs.items()
+            }
+            for view, future in futures.items():
+                try:
+                    results[view] = future.result()
+                except Exception as e:
+                    print(f"[FAILED] {view} projection failed in worker: {e}")
+
+    print(f"[SUCCESS] Created native 2D projections: {len(results)} views "
+          f"({', '.join(formats).upper()})")
+    return results
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+メッシュプレビューレンダラー
+
+export_stl() / convert_to_openscad() が出力したSTLを、OpenSCADやXサーバーを使わずに
+NumPyのベクトル化Zバッファでラスタライズし、サムネイル画像を生成する。
+カメラ指定は render_multiple_views() と同じ (x,y,z,rx,ry,rz,d) 形式。
+
+設計フィードバックループでのクイックプレビュー用途（シルエット/フラットシェーディング）で、
+OpenSCADの描画結果と画素単位で一致することは意図していない。
+"""
+
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from .renderer import DEFAULT_VIEWS
+except ImportError:
+    # scripts/mesh_preview.py として直接実行された場合
+    from renderer import DEFAULT_VIEWS
+
+
+# OpenSCADのデフォルト視野角（度）とデフォルトカメラ回転
+FOV = 22.5
+DEFAULT_ROTATION = (55.0, 0.0, 25.0)
+
+# 1回のラスタライズで展開する走査線数の上限（メモリ使用量の抑制）
+_CHUNK_ROWS = 200_000
+
+# バイナリSTLの1三角形分のレコード（50バイト）
+STL_RECORD = np.dtype([
+    ("normal", "<f4", 3),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+_VERTEX_RE = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def load_stl(stl_path: str) -> np.ndarray:
+    """
+    STLファイル（バイナリ/ASCII）を読み込み
+
+    バイナリSTLはファイル全体をメモリに読み込まず、メモリマップした構造化配列から
+    頂点座標だけを取り出す。
+
+    Args:
+        stl_path: STLファイルのパス
+
+    Returns:
+        np.ndarray: 三角形の頂点座標 (N, 3, 3)
+    """
+    path = Path(stl_path)
+    size = path.stat().st_size
+
+    if size >= 84:
+        with open(path, 'rb') as f:
+            header = f.read(84)
+        count = struct.unpack_from("<I", header, 80)[0]
+        if size == 84 + count * STL_RECORD.itemsize:
+            if count == 0:
+                return np.empty((0, 3, 3))
+            records = np.memmap(path, dtype=STL_RECORD, mode="r", offset=84, shape=(count,))
+            return records["vertices"].astype(np.float64)
+
+    vertices = np.array(_VERTEX_RE.findall(path.read_bytes()), dtype=np.float64)
+    return vertices.reshape(-1, 3, 3)
+
+
+def _rotation(axis: int, degrees: float) -> np.ndarray:
+    """右手系の回転行列（glRotatedと同じ向き）"""
+    c, s = np.cos(np.radians(degrees)), np.sin(np.radians(degrees))
+    i, j = [(1, 2), (2, 0), (0, 1)][axis]
+    matrix = np.eye(3)
+    matrix[i, i] = c
+    matrix[i, j] = -s
+    matrix[j, i] = s
+    matrix[j, j] = c
+    return matrix
+
+
+def view_rotation(rx: float, ry: float, rz: float) -> np.ndarray:
+    """
+    OpenSCADのgimbalカメラ回転（$vpr）からビュー回転行列を構築
+
+    カメラ座標系は x=右, y=奥行き（視線方向）, z=上。
+
+    Args:
+        rx, ry, rz: カメラ回転（度）
+
+    Returns:
+        np.ndarray: 3x3回転行列
+    """
+    return _rotation(0, 90.0 - rx) @ _rotation(1, -ry) @ _rotation(2, -rz)
+
+
+def project_triangles(
+    triangles: np.ndarray,
+    imgsize: Tuple[int, int] = (256, 256),
+    camera: Optional[tuple] = None,
+    projection: str = "p",
+    autocenter: bool = True,
+    viewall: bool = True,
+    margin: float = 0.05
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    三角形を画像座標に投影
+
+    Args:
+        triangles: 頂点座標 (N, 3, 3)
+        imgsize: 画像サイズ (width, height)
+        camera: カメラ (x,y,z,rx,ry,rz,d) またはNone（OpenSCADのデフォルト視点）
+        projection: "p"=透視投影, "o"=平行投影
+        autocenter: モデル中心を注視点にする
+        viewall: モデル全体が収まるよう拡大縮小する
+        margin: viewall時の余白（画像サイズに対する割合）
+
+    Returns:
+        Tuple: (画素座標 (N,3,2), 奥行き (N,3), カメラ座標系の面法線 (N,3))
+    """
+    width, height = imgsize
+    points = triangles.reshape(-1, 3)
+    bbox_min, bbox_max = points.min(axis=0), points.max(axis=0)
+    center = (bbox_min + bbox_max) / 2
+    radius = max(np.linalg.norm(bbox_max - bbox_min) / 2, 1e-9)
+
+    if camera is None:
+        target = center
+        rotation = DEFAULT_ROTATION
+        distance = None
+    else:
+        target = np.asarray(camera[:3], dtype=np.float64)
+        rotation = camera[3:6]
+        distance = camera[6]
+
+    if autocenter:
+        target = center
+    if viewall or distance is None:
+        # 境界球が視野角に収まる距離（OpenSCADの--viewallと同じ考え方）
+        distance = radius / np.sin(np.radians(FOV / 2))
+
+    matrix = view_rotation(*rotation)
+    cam = (points - target) @ matrix.T
+    x, depth, y = cam[:, 0], cam[:, 1] + distance, cam[:, 2]
+
+    focal = 1.0 / np.tan(np.radians(FOV / 2))
+    if projection == "p":
+        safe_depth = np.maximum(depth, 1e-6 * distance)
+        sx, sy = x * focal / safe_depth, y * focal / safe_depth
+    else:
+        sx, sy = x * focal / distance, y * focal / distance
+
+    if viewall:
+        span_x = max(sx.max() - sx.min(), 1e-12)
+        span_y = max(sy.max() - sy.min(), 1e-12)
+        scale = min(width * (1 - 2 * margin) / span_x, height * (1 - 2 * margin) / span_y)
+        offset_x = (sx.max() + sx.min()) / 2
+        offset_y = (sy.max() + sy.min()) / 2
+    else:
+        scale = height / 2
+        offset_x = offset_y = 0.0
+
+    pixels = np.empty((len(points), 2))
+    pixels[:, 0] = width / 2 + (sx - offset_x) * scale
+    pixels[:, 1] = height / 2 - (sy - offset_y) * scale
+
+    cam_tris = cam.reshape(-1, 3, 3)
+    normals = np.cross(cam_tris[:, 1] - cam_tris[:, 0], cam_tris[:, 2] - cam_tris[:, 0])
+
+    return pixels.reshape(-1, 3, 2), depth.reshape(-1, 3), normals
+
+
+def rasterize(
+    pixels: np.ndarray,
+    depth: np.ndarray,
+    imgsize: Tuple[int, int]
+) -> np.ndarray:
+    """
+    ベクトル化Zバッファで三角形をラスタライズ
+
+    全三角形の走査線（行）を一括生成して各行の辺との交点から画素スパンを求め、
+    スパン内の画素の奥行きを平面式で補間して最前面の三角形を選ぶ。
+    細長い三角形でもバウンディングボックス全体を評価しないため、候補画素数は被覆画素数程度で済む。
+
+    Args:
+        pixels: 画素座標 (N, 3, 2)
+        depth: 奥行き (N, 3)
+        imgsize: 画像サイズ (width, height)
+
+    Returns:
+        np.ndarray: 画素ごとの三角形インデックス (height, width)、背景は-1
+    """
+    width, height = imgsize
+    zbuffer = np.full(width * height, np.inf)
+    face_ids = np.full(width * height, -1, dtype=np.int64)
+
+    xs, ys = pixels[:, :, 0], pixels[:, :, 1]
+    area = (xs[:, 1] - xs[:, 0]) * (ys[:, 2] - ys[:, 0]) - (ys[:, 1] - ys[:, 0]) * (xs[:, 2] - xs[:, 0])
+
+    # 画素中心 (row + 0.5) が三角形のy範囲に入る行
+    row_min = np.clip(np.ceil(ys.min(axis=1) - 0.5), 0, height).astype(np.int64)
+    row_max = np.clip(np.floor(ys.max(axis=1) - 0.5) + 1, 0, height).astype(np.int64)
+    row_counts = row_max - row_min
+
+    valid = (np.abs(area) > 1e-12) & (row_counts > 0) & (depth.min(axis=1) > 0)
+    tri_index = np.nonzero(valid)[0]
+    row_counts = row_counts[tri_index]
+
+    # 奥行きの平面式 z = gx * x + gy * y + z0（画面空間で線形補間）
+    safe_area = np.where(np.abs(area) > 1e-12, area, 1.0)
+    dz1, dz2 = depth[:, 1] - depth[:, 0], depth[:, 2] - depth[:, 0]
+    dx1, dx2 = xs[:, 1] - xs[:, 0], xs[:, 2] - xs[:, 0]
+    dy1, dy2 = ys[:, 1] - ys[:, 0], ys[:, 2] - ys[:, 0]
+    grad_x = (dz1 * dy2 - dz2 * dy1) / safe_area
+    grad_y = (dz2 * dx1 - dz1 * dx2) / safe_area
+    z0 = depth[:, 0] - grad_x * xs[:, 0] - grad_y * ys[:, 0]
+
+    # 走査線数が上限を超えないようにチャンク分割
+    cumulative = np.cumsum(row_counts)
+    start = 0
+    while start < len(tri_index):
+        done = cumulative[start - 1] if start else 0
+        stop = max(int(np.searchsorted(cumulative, done + _CHUNK_ROWS, side="right")), start + 1)
+        chunk, chunk_counts = tri_index[start:stop], row_counts[start:stop]
+        start = stop
+
+        # (三角形, 行) の組を展開
+        tri = np.repeat(chunk, chunk_counts)
+        first = np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        row = row_min[tri] + np.arange(len(tri)) - first
+        cy = row + 0.5
+
+        # 各辺と走査線の交点のx座標から左右端を求める
+        left = np.full(len(tri), np.inf)
+        right = np.full(len(tri), -np.inf)
+        for i, j in ((0, 1), (1, 2), (2, 0)):
+            ax, ay = xs[tri, i], ys[tri, i]
+            bx, by = xs[tri, j], ys[tri, j]
+            crosses = (np.minimum(ay, by) <= cy) & (cy <= np.maximum(ay, by)) & (ay != by)
+            t = np.where(crosses, (cy - ay) / np.where(ay != by, by - ay, 1.0), 0.0)
+            x = ax + t * (bx - ax)
+            left = np.where(crosses, np.minimum(left, x), left)
+            right = np.where(crosses, np.maximum(right, x), right)
+
+        col_min = np.clip(np.ceil(left - 0.5), 0, width).astype(np.int64)
+        col_max = np.clip(np.floor(right - 0.5) + 1, 0, width).astype(np.int64)
+        span = np.maximum(col_max - col_min, 0)
+
+        # スパンを画素に展開
+        tri = np.repeat(tri, span)
+        row = np.repeat(row, span)
+        first = np.repeat(np.cumsum(span) - span, span)
+        col = np.repeat(col_min, span) + np.arange(len(tri)) - first
+        z = grad_x[tri] * (col + 0.5) + grad_y[tri] * (row + 0.5) + z0[tri]
+
+        # チャンク内で画素ごとに最前面を選び、Zバッファと比較
+        pix = row * width + col
+        order = np.lexsort((z, pix))
+        pix, z, tri = pix[order], z[order], tri[order]
+        first_hit = np.ones(len(pix), dtype=bool)
+        first_hit[1:] = pix[1:] != pix[:-1]
+        pix, z, tri = pix[first_hit], z[first_hit], tri[first_hit]
+
+        nearer = z < zbuffer[pix]
+        zbuffer[pix[nearer]] = z[nearer]
+        face_ids[pix[nearer]] = tri[nearer]
+
+    return face_ids.reshape(height, width)
+
+
+def render_preview(
+    triangles,
+    output_file: Optional[str] = None,
+    imgsize: Tuple[int, int] = (256, 256),
+    camera: Optional[tuple] = None,
+    projection: str = "p",
+    autocenter: bool = True,
+    viewall: bool = True,
+    mode: str = "shaded",
+    color: Tuple[int, int, int] = (249, 215, 44),
+    background: Tuple[int, int, int] = (255, 255, 229)
+) -> np.ndarray:
+    """
+    メッシュのプレビュー画像を生成
+
+    Args:
+        triangles: STLファイルパス、または頂点座標 (N, 3, 3)
+        output_file: 出力PNGパス（Noneの場合は保存しない）
+        imgsize: 画像サイズ (width, height)
+        camera: カメラ (x,y,z,rx,ry,rz,d) またはNone
+        projection: "p"=透視投影, "o"=平行投影
+        autocenter: モデル中心を注視点にする
+        viewall: モデル全体が収まるよう拡大縮小する
+        mode: "shaded"=フラットシェーディング, "silhouette"=シルエット
+        color: モデルの色 (R, G, B)
+        background: 背景色 (R, G, B)
+
+    Returns:
+        np.ndarray: RGB画像 (height, width, 3) uint8
+    """
+    if isinstance(triangles, (str, Path)):
+        triangles = load_stl(str(triangles))
+
+    width, height = imgsize
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = background
+
+    if len(triangles) > 0:
+        pixels, depth, normals = project_triangles(
+            triangles, imgsize, camera, projection, autocenter, viewall
+        )
+        face_ids = rasterize(pixels, depth, imgsize)
+        covered = face_ids >= 0
+
+        if mode == "silhouette":
+            image[covered] = color
+        else:
+            # カメラ方向からの平行光源（ヘッドライト）で面の明るさを決める
+            lengths = np.linalg.norm(normals, axis=1)
+            facing = np.abs(normals[:, 1]) / np.maximum(lengths, 1e-12)
+            intensity = 0.35 + 0.65 * facing
+            shade = intensity[face_ids[covered]][:, None] * np.asarray(color, dtype=np.float64)
+            image[covered] = np.clip(shade, 0, 255).astype(np.uint8)
+
+    if output_file:
+        write_png(output_file, image)
+
+    return image
+
+
+def render_preview_views(
+    stl_path: str,
+    output_prefix: str,
+    views: dict = None,
+    **kwargs
+) -> dict:
+    """
+    複数ビューのプレビュー画像を生成（render_multiple_views()のプレビュー版）
+
+    Args:
+        stl_path: STLファイルのパス
+        output_prefix: 出力ファイル名のプレフィックス
+        views: ビュー設定の辞書 {"view_name": {"camera": (...), ...}}
+        **kwargs: render_preview()の共通オプション
+
+    Returns:
+        dict: {"view_name": "output_file_path", ...}
+    """
+    if views is None:
+        views = DEFAULT_VIEWS
+
+    triangles = load_stl(stl_path)
+    results = {}
+    for view_name, settings in views.items():
+        output_file = f"{output_prefix}_{view_name}.png"
+        options = {**kwargs, **settings}
+        # OpenSCAD専用のオプションは無視する
+        for key in ("colorscheme", "render_mode", "timeout"):
+            options.pop(key, None)
+        render_preview(triangles, output_file, **options)
+        results[view_name] = output_file
+
+    print(f"[SUCCESS] Preview rendered: {len(results)} views from {stl_path}")
+    return results
+
+
+def write_png(output_file: str, image: np.ndarray):
+    """
+    RGB画像をPNGファイルとして保存（外部ライブラリ不要）
+
+    Args:
+        output_file: 出力ファイルパス
+        image: RGB画像 (height, width, 3) uint8
+    """
+    height, width = image.shape[:2]
+    # 各行の先頭にフィルタタイプ0を付加
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 3)
+
+    def chunk(tag: bytes, payload: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(payload)) + tag + payload
+            + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+        )
+
+    png = b"\x89PNG\r\n\x1a\n"
+    png += chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    png += chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+    png += chunk(b"IEND", b"")
+
+    with open(output_file, 'wb') as f:
+        f.write(png)
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Quick mesh preview renderer (no OpenSCAD, no X server)"
+    )
+    parser.add_argument("stl_file", help="Input STL file")
+    parser.add_argument("output_prefix", help="Output PNG prefix (one file per view)")
+    parser.add_argument(
+        "--imgsize",
+        nargs=2,
+        type=int,
+        default=[256, 256],
+        metavar=("WIDTH", "HEIGHT"),
+        help="Image size (default: 256 256)"
+    )
+    parser.add_argument(
+        "--projection",
+        choices=["p", "o"],
+        default="p",
+        help="Projection: p=perspective, o=orthogonal (default: p)"
+    )
+    parser.add_argument(
+        "--silhouette",
+        action="store_true",
+        help="Render a flat silhouette instead of shading"
+    )
+
+    args = parser.parse_args()
+
+    render_preview_views(
+        args.stl_file,
+        args.output_prefix,
+        imgsize=tuple(args.imgsize),
+        projection=args.projection,
+        mode="silhouette" if args.silhouette else "shaded"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+DXF/SVGの一括解析
+
+パラメータスイープ等で出力された多数の断面DXF・投影SVGを、プロセスプールで並行して解析する。
+結果は入力と同じ順序の構造化データ（DXFAnalysis / SVGAnalysis の辞書とレポート本文）で返し、
+1ファイルの解析失敗は他のファイルに影響しない（結果のstatus/errorに記録される）。
+
+Usage:
+    python3 scripts/parse_batch.py outputs/sweep/*.dxf --workers 4
+    python3 scripts/parse_batch.py a.dxf b.svg --report-dir reports --output parse_results.json
+    python3 scripts/parse_batch.py outputs/sweep/*.dxf --output analyses.arrow
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .analysis_result import result_from_dict, save_results
+    from .dxf_parser import DXFParser
+    from .process_pool import worker_context
+    from .svg_parser import SVGParser
+except ImportError:
+    # scripts/parse_batch.py として直接実行された場合
+    from analysis_result import result_from_dict, save_results
+    from dxf_parser import DXFParser
+    from process_pool import worker_context
+    from svg_parser import SVGParser
+
+
+def _failed_result(path: str, error: Optional[str] = None) -> Dict:
+    """解析前（失敗時）の結果"""
+    return {
+        "path": str(path),
+        "format": Path(path).suffix.lower().lstrip("."),
+        "status": "failed",
+        "error": error,
+        "seconds": 0.0,
+        "report_path": None,
+        "report": None,
+        "data": None,
+    }
+
+
+def parse_file(path: str, report_path: Optional[str] = None, streaming: bool = False) -> Dict:
+    """
+    1ファイルを解析して構造化された結果を返す（例外は結果に記録する）
+
+    Args:
+        path: DXF/SVGファイルのパス
+        report_path: レポート出力先パス（Noneの場合は保存しない）
+        streaming: DXF/SVGをストリーミングモードで解析する
+
+    Returns:
+        dict: {"path", "format", "status" ("success" | "failed"), "error", "seconds",
+               "report_path", "report", "data"}
+            data は解析結果の to_dict()（analysis_result.result_from_dict()で復元できる）
+    """
+    start_time = time.time()
+    suffix = Path(path).suffix.lower()
+    result = _failed_result(path)
+    try:
+        if suffix == ".dxf":
+            parser = DXFParser(path, streaming=streaming)
+        elif suffix == ".svg":
+            parser = SVGParser(path, streaming=streaming)
+        else:
+            raise ValueError(f"Unsupported file type: {suffix or path}")
+
+        if not parser.load():
+            raise RuntimeError(f"Failed to load {path}")
+        parser.analyze()
+        analysis = parser.get_result()
+        result["report"] = analysis.save_report(report_path) if report_path else analysis.to_report()
+        result["report_path"] = report_path
+        result["data"] = analysis.to_dict()
+        result["status"] = "success"
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.time() - start_time
+    return result
+
+
+def parse_many(
+    paths: List[str],
+    workers: Optional[int] = None,
+    report_paths: Optional[List[Optional[str]]] = None,
+    streaming: bool = False
+) -> List[Dict]:
+    """
+    複数のDXF/SVGファイルをプロセスプールで解析
+
+    Args:
+        paths: DXF/SVGファイルのパス
+        workers: ワーカープロセス数（Noneならファイル数とCPU数の小さい方、1以下なら逐次実行）
+        report_paths: 各ファイルのレポート出力先（pathsと同じ順序、Noneの要素は保存しない）
+        streaming: DXF/SVGをストリーミングモードで解析する
+
+    Returns:
+        List[dict]: pathsと同じ順序の parse_file() の結果
+    """
+    paths = [str(path) for path in paths]
+    if report_paths is None:
+        report_paths = [None] * len(paths)
+    if len(report_paths) != len(paths):
+        raise ValueError("report_paths must have the same length as paths")
+    if workers is None:
+        workers = min(len(paths), os.cpu_count() or 1)
+
+    batch_start = time.time()
+    if workers <= 1 or len(paths) <= 1:
+        results = [parse_file(path, report, streaming) for path, report in zip(paths, report_paths)]
+    else:
+        # CadQueryの書き出しと同じプロセスから呼ばれるため、forkせずに起動する
+        with ProcessPoolExecutor(max_workers=workers, mp_context=worker_context()) as executor:
+            futures = [
+                executor.submit(parse_file, path, report, streaming)
+                for path, report in zip(paths, report_paths)
+            ]
+            results = []
+            for path, future in zip(paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # ワーカープロセスの異常終了等
+                    results.append(_failed_result(path, f"Worker failed: {e}"))
+
+    failed = [r for r in results if r["status"] != "success"]
+    for r in failed:
+        print(f"[FAILED] {r['path']}: {r['error']}")
+    print(f"[SUCCESS] Parsed {len(results) - len(failed)}/{len(results)} files "
+          f"in {time.time() - batch_start:.2f}s")
+    return results
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Parse many DXF/SVG files in parallel"
+    )
+    parser.add_argument("files", nargs="+", help="DXF/SVG files to parse")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--report-dir",
+        help="Write a text report per file to this directory (<stem>_report.txt)"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Parse DXF/SVG files in streaming mode"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the results to this file: .json for all results (without report text), "
+             ".msgpack / .arrow for the analyses of successfully parsed files"
+    )
+
+    args = parser.parse_args()
+
+    report_paths = None
+    if args.report_dir:
+        Path(args.report_dir).mkdir(parents=True, exist_ok=True)
+        report_paths = [
+            str(Path(args.report_dir) / f"{Path(path).stem}_report.txt") for path in args.files
+        ]
+
+    results = parse_many(args.files, args.workers, report_paths, args.streaming)
+
+    if args.output and Path(args.output).suffix.lower() in (".msgpack", ".arrow"):
+        save_results([result_from_dict(r["data"]) for r in results if r["status"] == "success"],
+                     args.output)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([{k: v for k, v in r.items() if k != "report"} for r in results],
+                      f, indent=2, ensure_ascii=False)
+        print(f"[SUCCESS] Results saved: {args.output}")
+
+    return 0 if all(r["status"] == "success" for r in results) else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+ワーカープロセスの起動方法
+
+cadquery/OCPやレンダリングのスレッドを持つプロセスをfork()すると、子プロセスはロックを
+保持したまま複製されてデッドロックし得る（Python 3.12以降はDeprecationWarningも出る）。
+Python 3.14より前のLinuxではProcessPoolExecutorのデフォルトがforkのため、
+プロセスプールはこのモジュールのコンテキストで起動する。
+"""
+
+import multiprocessing
+
+
+def worker_context(preload: tuple = ()):
+    """
+    forkを使わないmultiprocessingコンテキスト
+
+    forkserver（使えない環境ではspawn）を返す。ワーカーへの引数・戻り値はpickleで渡るため、
+    ワーカー関数はモジュールのトップレベルに定義し、呼び出し側のスクリプトは
+    if __name__ == "__main__": で保護する必要がある。
+    forkserverのワーカーの環境変数はforkserver起動時のもので、その後のos.environの変更は
+    引き継がれない。環境変数に依存するワーカーはinitializerで呼び出し元の値を設定すること。
+
+    Args:
+        preload: forkserverに読み込ませておくモジュール（ワーカーごとの読み込み時間を省く。
+            forkserverの起動前に指定した場合のみ有効）
+
+    Returns:
+        multiprocessing.context.BaseContext: ProcessPoolExecutorのmp_context
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    if preload:
+        context.set_forkserver_preload(list(preload))
+    return context
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+OpenSCADレンダリングバックエンド
+
+OpenSCADのオフスクリーン描画に使うOpenGLコンテキストの取得方法を切り替える。
+
+- xvfb: Xvfb（仮想Xサーバー）上のGLXを使用（従来の方式）
+- egl: OpenSCADのEGLオフスクリーン描画を使用（Xサーバー不要、EGL対応ビルドが必要）
+- software: サーフェスレスEGLをMesaのソフトウェアラスタライザ（llvmpipe）で使用（GPU・Xサーバー不要）
+- auto: egl → software の順にプローブし、使えなければxvfbにフォールバック
+"""
+
+import os
+import subprocess
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+
+BACKENDS = ("auto", "xvfb", "egl", "software")
+
+# Xサーバーを使わないバックエンド（autoでのプローブ順）
+OFFSCREEN_BACKENDS = ("egl", "software")
+
+
+def default_backend() -> str:
+    """
+    デフォルトのバックエンドを取得
+
+    Returns:
+        str: 環境変数 OPENSCAD_RENDER_BACKEND の値（未設定なら"xvfb"）
+    """
+    backend = os.environ.get("OPENSCAD_RENDER_BACKEND", "xvfb")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown render backend: {backend} (choose from {', '.join(BACKENDS)})")
+    return backend
+
+
+def backend_env(backend: str, display: Optional[int] = None, base_env: Dict[str, str] = None) -> Dict[str, str]:
+    """
+    バックエンドに応じたOpenSCAD実行用の環境変数を構築
+
+    Args:
+        backend: "xvfb", "egl", "software"のいずれか（autoは解決済みであること）
+        display: Xvfbディスプレイ番号（xvfbの場合のみ使用）
+        base_env: 元になる環境変数（Noneの場合はos.environ）
+
+    Returns:
+        Dict[str, str]: 環境変数
+    """
+    env = dict(os.environ if base_env is None else base_env)
+
+    if backend == "xvfb":
+        env["DISPLAY"] = f":{display}"
+        return env
+
+    if backend not in OFFSCREEN_BACKENDS:
+        raise ValueError(f"Unknown render backend: {backend}")
+
+    # Xサーバーを探しに行かないようにDISPLAYを外し、サーフェスレスEGLを使わせる
+    env.pop("DISPLAY", None)
+    env.pop("WAYLAND_DISPLAY", None)
+    env["EGL_PLATFORM"] = "surfaceless"
+
+    if backend == "software":
+        # Mesaのドライバー選択をソフトウェアラスタライザ（llvmpipe）に固定する。
+        # GLX（Xvfb上）でもEGLでも有効な変数で、OSMesaに切り替えるものではない
+        env["LIBGL_ALWAYS_SOFTWARE"] = "1"
+        env["GALLIUM_DRIVER"] = "llvmpipe"
+
+    return env
+
+
+def probe_backend(backend: str, executable: str = "openscad", timeout: float = 30.0) -> bool:
+    """
+    小さなモデルを実際にレンダリングしてバックエンドが使えるか確認
+
+    Args:
+        backend: "egl" または "software"
+        executable: OpenSCAD実行ファイル
+        timeout: タイムアウト秒数
+
+    Returns:
+        bool: レンダリングできた場合True
+    """
+    with tempfile.TemporaryDirectory(prefix="openscad_probe_") as tmp_dir:
+        scad_path = Path(tmp_dir) / "probe.scad"
+        png_path = Path(tmp_dir) / "probe.png"
+        scad_path.write_text("cube(1);\n")
+
+        try:
+            result = subprocess.run(
+                [executable, "-o", str(png_path), "--imgsize", "16,16", str(scad_path)],
+                env=backend_env(backend),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+
+        return result.returncode == 0 and png_path.exists() and png_path.stat().st_size > 0
+
+
+@lru_cache(maxsize=None)
+def detect_backend(executable: str = "openscad") -> str:
+    """
+    利用可能なバックエンドを自動検出（プロセス内でキャッシュ）
+
+    Args:
+        executable: OpenSCAD実行ファイル
+
+    Returns:
+        str: "egl", "software", または "xvfb"
+    """
+    for backend in OFFSCREEN_BACKENDS:
+        if probe_backend(backend, executable):
+            print(f"[SUCCESS] Render backend detected: {backend}")
+            return backend
+
+    print("[WARNING] No offscreen GL backend available, falling back to Xvfb")
+    return "xvfb"
+
+
+def resolve_backend(backend: Optional[str] = None, executable: str = "openscad") -> str:
+    """
+    バックエンド指定を実際に使うバックエンドに解決
+
+    Args:
+        backend: バックエンド名（Noneの場合はdefault_backend()）
+        executable: OpenSCAD実行ファイル
+
+    Returns:
+        str: "xvfb", "egl", "software"のいずれか
+    """
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown render backend: {backend} (choose from {', '.join(BACKENDS)})")
+    if backend == "auto":
+        return detect_backend(executable)
+    return backend
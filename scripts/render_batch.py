@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+バッチレンダリングキュー
+
+マニフェスト（JSON/YAML）に列挙されたSCADファイルとビューを、
+プロセスプールで優先度順にスケジューリングしてレンダリングする。
+同一ジョブは1回だけ実行し、失敗したジョブはリトライする。
+ジョブごとの所要時間を含む結果をJSONファイルに書き出す。
+
+マニフェスト例:
+    {
+      "defaults": {"imgsize": [800, 600], "colorscheme": "Tomorrow"},
+      "jobs": [
+        {"scad": "outputs/cadquery/cq_gear.scad", "output": "previews/gear.png", "priority": 10},
+        {"scad": "outputs/cadquery/cq_flange.scad", "output_prefix": "previews/flange",
+         "views": ["front", "top", "iso"]}
+      ]
+    }
+"""
+
+import heapq
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import util as multiprocessing_util
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .renderer import DEFAULT_VIEWS, OpenSCADRenderer
+    from .render_cache import RenderCache
+    from .xvfb_pool import get_default_pool
+    from .render_backends import BACKENDS, resolve_backend
+    from .render_metrics import RenderMetricsRecorder, RenderResult
+    from .process_pool import worker_context
+except ImportError:
+    # scripts/render_batch.py として直接実行された場合
+    from renderer import DEFAULT_VIEWS, OpenSCADRenderer
+    from render_cache import RenderCache
+    from xvfb_pool import get_default_pool
+    from render_backends import BACKENDS, resolve_backend
+    from render_metrics import RenderMetricsRecorder, RenderResult
+    from process_pool import worker_context
+
+
+# OpenSCADRenderer.render()に渡すオプション
+RENDER_OPTIONS = (
+    "imgsize",
+    "colorscheme",
+    "projection",
+    "render_mode",
+    "camera",
+    "autocenter",
+    "viewall",
+    "timeout",
+)
+
+
+def load_manifest(manifest_path: str) -> dict:
+    """
+    マニフェストファイルを読み込み
+
+    Args:
+        manifest_path: JSONまたはYAMLファイルのパス
+
+    Returns:
+        dict: {"defaults": {...}, "jobs": [...]}
+    """
+    path = Path(manifest_path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("PyYAML is required for YAML manifests (pip install pyyaml)")
+        manifest = yaml.safe_load(text)
+    else:
+        manifest = json.loads(text)
+
+    # ジョブのリストのみのマニフェストも受け付ける
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+
+    return manifest
+
+
+def expand_jobs(manifest: dict, base_dir: str = ".") -> List[dict]:
+    """
+    マニフェストのジョブを1画像1タスクに展開（未知のビュー名はValueError）
+
+    Args:
+        manifest: load_manifest()の戻り値
+        base_dir: 相対パスの基準ディレクトリ
+
+    Returns:
+        List[dict]: タスクのリスト [{id, scad, output, options, priority}, ...]
+    """
+    base = Path(base_dir)
+    defaults = manifest.get("defaults", {})
+    tasks = []
+
+    for index, job in enumerate(manifest.get("jobs", [])):
+        scad = str((base / job["scad"]).resolve())
+        priority = job.get("priority", defaults.get("priority", 0))
+        options = {
+            key: job.get(key, defaults.get(key))
+            for key in RENDER_OPTIONS
+            if key in job or key in defaults
+        }
+
+        views = job.get("views")
+        if views is None:
+            outputs = {None: job["output"]}
+            view_settings = {None: {}}
+        else:
+            if isinstance(views, list):
+                unknown = [name for name in views if name not in DEFAULT_VIEWS]
+                if unknown:
+                    raise ValueError(
+                        f"Unknown view {', '.join(map(repr, unknown))} in manifest job {index} "
+                        f"({job['scad']}); choose from {', '.join(DEFAULT_VIEWS)}"
+                    )
+                views = {name: DEFAULT_VIEWS[name] for name in views}
+            prefix = job.get("output_prefix") or str(Path(job["output"]).with_suffix(""))
+            outputs = {name: f"{prefix}_{name}.png" for name in views}
+            view_settings = views
+
+        for view_name, output in outputs.items():
+            task_options = {**options, **view_settings[view_name]}
+            # JSONで受け取ったリストをrender()の期待するタプルに揃える
+            for key in ("imgsize", "camera"):
+                if task_options.get(key) is not None:
+                    task_options[key] = tuple(task_options[key])
+            task_id = f"{index}" if view_name is None else f"{index}:{view_name}"
+            tasks.append({
+                "id": task_id,
+                "scad": scad,
+                "output": str((base / output).resolve()),
+                "options": task_options,
+                "priority": priority,
+            })
+
+    return tasks
+
+
+def deduplicate(tasks: List[dict]) -> List[dict]:
+    """
+    同一内容（入力・出力・オプション）のタスクを1つにまとめる
+
+    Args:
+        tasks: expand_jobs()の戻り値
+
+    Returns:
+        List[dict]: 重複を除いたタスク（"duplicates"に統合されたタスクIDを持つ）
+    """
+    unique: Dict[str, dict] = {}
+    for task in tasks:
+        key = json.dumps([task["scad"], task["output"], task["options"]], sort_keys=True)
+        if key in unique:
+            kept = unique[key]
+            kept["duplicates"].append(task["id"])
+            # 重複したジョブのうち最も高い優先度で実行する
+            kept["priority"] = max(kept["priority"], task["priority"])
+        else:
+            unique[key] = {**task, "duplicates": []}
+    return list(unique.values())
+
+
+# ワーカープロセスごとの状態
+_worker_pool = None
+_worker_cache = None
+_worker_backend = None
+
+
+def _init_worker(
+    pool_size: int,
+    base_display: int,
+    cache_dir: Optional[str],
+    cache_max_bytes: int,
+    backend: str,
+    environ: Dict[str, str]
+):
+    """ワーカープロセスの初期化（環境変数の引き継ぎ、Xvfbプール・キャッシュの準備）"""
+    global _worker_pool, _worker_cache, _worker_backend
+    # forkserverのワーカーはforkserver起動時の環境変数を持つため、呼び出し元の値に揃える
+    # （OpenSCADの実行環境やXvfbプールの状態ディレクトリが環境変数で決まる）
+    os.environ.clear()
+    os.environ.update(environ)
+    _worker_backend = backend
+    if backend == "xvfb":
+        _worker_pool = get_default_pool(size=pool_size, base_display=base_display)
+        # ワーカー終了時にこのワーカーが起動したXvfbを停止する
+        # （forkserver/spawnのワーカーはatexitを実行しないため、multiprocessingの終了処理に登録する。
+        #   close()は2回呼ばれても問題ない）
+        multiprocessing_util.Finalize(None, _worker_pool.close, exitpriority=10)
+    if cache_dir:
+        _worker_cache = RenderCache(cache_dir, max_bytes=cache_max_bytes)
+
+
+def _render_task(task: dict) -> dict:
+    """
+    ワーカープロセスで1タスクをレンダリング
+
+    Returns:
+        dict: {"success", "error", "seconds", "metrics"}
+    """
+    Path(task["output"]).parent.mkdir(parents=True, exist_ok=True)
+    start_time = time.time()
+    try:
+        with OpenSCADRenderer(
+            pool=_worker_pool, cache=_worker_cache, backend=_worker_backend
+        ) as renderer:
+            result = renderer.render(task["scad"], task["output"], **task["options"])
+    except Exception as e:
+        result = RenderResult(False, task["scad"], task["output"], error=str(e))
+    return {
+        "success": result.success,
+        "error": result.error,
+        "seconds": time.time() - start_time,
+        # 計測値の集計はプロセスをまたぐため、親プロセス側で行う
+        "metrics": result.to_dict(),
+    }
+
+
+def run_batch(
+    tasks: List[dict],
+    workers: int = None,
+    retries: int = 1,
+    base_display: int = 99,
+    cache_dir: Optional[str] = None,
+    cache_max_bytes: int = 512 * 1024 * 1024,
+    backend: str = None,
+    metrics: RenderMetricsRecorder = None
+) -> List[dict]:
+    """
+    タスクをプロセスプールで優先度順に実行
+
+    空いたワーカーには常に待機中で最も優先度の高いタスクを割り当てる。
+    失敗したタスクは同じ優先度でキューに戻し、retries回まで再実行する。
+    ワーカープロセスの異常終了でプールが使えなくなった場合は、実行中・未実行のタスクを
+    失敗として記録して終了する。
+
+    Args:
+        tasks: deduplicate()済みのタスク
+        workers: ワーカープロセス数（Noneの場合はCPU数）
+        retries: 失敗時の最大リトライ回数
+        base_display: Xvfbプールの先頭ディスプレイ番号（ワーカー数分のディスプレイを使用）
+        cache_dir: レンダリングキャッシュのディレクトリ（Noneならキャッシュなし）
+        cache_max_bytes: キャッシュの最大サイズ
+        backend: 描画バックエンド（"xvfb", "egl", "software", "auto"）
+        metrics: 試行ごとのレンダリング計測値の記録先
+
+    Returns:
+        List[dict]: タスクごとの結果（入力順）
+    """
+    workers = workers or os.cpu_count() or 1
+    # autoのプローブはワーカーごとに行わず、ここで一度だけ解決する
+    backend = resolve_backend(backend)
+    results = {
+        task["id"]: {
+            "id": task["id"],
+            "scad": task["scad"],
+            "output": task["output"],
+            "priority": task["priority"],
+            "duplicates": task.get("duplicates", []),
+            "status": "pending",
+            "attempts": 0,
+            "seconds": 0.0,
+            "attempt_seconds": [],
+            "metrics": None,
+            "error": None,
+        }
+        for task in tasks
+    }
+
+    # heapqは最小値を取り出すため、優先度を負にする（同優先度は入力順）
+    queue = [(-task["priority"], order, task) for order, task in enumerate(tasks)]
+    heapq.heapify(queue)
+    batch_start = time.time()
+
+    # レンダリングスレッド（Xvfbプールのタイマー等）を持つプロセスからforkしない
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=worker_context(),
+        initializer=_init_worker,
+        initargs=(workers, base_display, cache_dir, cache_max_bytes, backend, dict(os.environ))
+    ) as executor:
+        running = {}
+        # プールが使えなくなった場合のエラー
+        broken = None
+        while queue or running:
+            while queue and len(running) < workers and broken is None:
+                entry = heapq.heappop(queue)
+                try:
+                    future = executor.submit(_render_task, entry[2])
+                except BrokenProcessPool as e:
+                    broken = f"Worker process pool broken: {e}"
+                    heapq.heappush(queue, entry)
+                    break
+                running[future] = entry
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = running.pop(future)
+                task = entry[2]
+                result = results[task["id"]]
+                try:
+                    outcome = future.result()
+                except BrokenProcessPool as e:
+                    broken = broken or f"Worker process pool broken: {e}"
+                    outcome = {"success": False, "error": broken, "seconds": 0.0, "metrics": None}
+                except Exception as e:
+                    outcome = {"success": False, "error": str(e), "seconds": 0.0, "metrics": None}
+
+                result["attempts"] += 1
+                result["attempt_seconds"].append(outcome["seconds"])
+                result["seconds"] += outcome["seconds"]
+                if outcome["metrics"] is not None:
+                    result["metrics"] = outcome["metrics"]
+                    if metrics is not None:
+                        metrics.record(RenderResult(**outcome["metrics"]))
+
+                if outcome["success"]:
+                    result["status"] = "success"
+                    result["error"] = None
+                elif result["attempts"] <= retries and broken is None:
+                    result["error"] = outcome["error"]
+                    heapq.heappush(queue, entry)
+                else:
+                    result["status"] = "failed"
+                    result["error"] = outcome["error"]
+
+    # プールが使えなくなり実行できなかったタスク
+    for _, _, task in queue:
+        result = results[task["id"]]
+        result["status"] = "failed"
+        result["error"] = result["error"] or broken
+    if broken:
+        print(f"[FAILED] {broken}; {len(queue)} jobs were not run")
+
+    elapsed = time.time() - batch_start
+    print(f"[SUCCESS] Batch finished: {len(tasks)} jobs in {elapsed:.2f}s")
+    return [results[task["id"]] for task in tasks]
+
+
+def write_results(results: List[dict], output_path: str, wall_seconds: float = None):
+    """
+    実行結果をJSONファイルに書き出し
+
+    Args:
+        results: run_batch()の戻り値
+        output_path: 出力JSONファイルパス
+        wall_seconds: バッチ全体の経過時間
+    """
+    succeeded = sum(1 for r in results if r["status"] == "success")
+    summary = {
+        "jobs": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "deduplicated": sum(len(r["duplicates"]) for r in results),
+        "render_seconds": sum(r["seconds"] for r in results),
+        "wall_seconds": wall_seconds,
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({"summary": summary, "jobs": results}, f, indent=2, ensure_ascii=False)
+
+    print(f"[SUCCESS] Results saved: {output_path}")
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Render a batch of OpenSCAD files from a JSON/YAML manifest"
+    )
+    parser.add_argument("manifest", help="Manifest file (JSON or YAML)")
+    parser.add_argument(
+        "--results",
+        default="render_results.json",
+        help="Results JSON file (default: render_results.json)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="Retries per failed job (default: 1)"
+    )
+    parser.add_argument(
+        "--display",
+        type=int,
+        default=99,
+        help="First Xvfb display number of the worker pool (default: 99)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="GL backend: xvfb, egl, software or auto (default: $OPENSCAD_RENDER_BACKEND or xvfb)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Enable the render cache in this directory"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Maximum render cache size in MB (default: 512)"
+    )
+    parser.add_argument(
+        "--metrics-log",
+        help="Append per-render metrics to this JSON-lines file"
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        help="Write render metrics to this Prometheus textfile-collector file"
+    )
+
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    tasks = expand_jobs(manifest, base_dir=Path(args.manifest).parent)
+    unique_tasks = deduplicate(tasks)
+    print(f"Loaded {len(tasks)} jobs ({len(tasks) - len(unique_tasks)} duplicates)")
+
+    metrics = None
+    if args.metrics_log or args.prometheus_textfile:
+        metrics = RenderMetricsRecorder(args.metrics_log, args.prometheus_textfile)
+
+    start_time = time.time()
+    results = run_batch(
+        unique_tasks,
+        workers=args.workers,
+        retries=args.retries,
+        base_display=args.display,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        backend=args.backend,
+        metrics=metrics
+    )
+    write_results(results, args.results, wall_seconds=time.time() - start_time)
+
+    return 0 if all(r["status"] == "success" for r in results) else 1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+OpenSCADレンダリング結果のキャッシュ
+
+SCADソース（import()/use/includeで参照される依存ファイルを含む）、
+OpenSCADのバージョン、全てのCLIオプション、描画バックエンドからキーを計算し、
+レンダリング済み画像をディスク上にキャッシュする。
+容量上限を超えた場合は最終使用時刻の古いものから削除する（LRU）。
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+
+# コメント除去用
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+# import("file") / import(file="file") / surface("file")
+_IMPORT_RE = re.compile(r"\b(?:import|surface)\s*\(\s*(?:file\s*=\s*)?\"([^\"]+)\"")
+# use <file> / include <file>
+_USE_RE = re.compile(r"\b(?:use|include)\s*<([^>]+)>")
+
+
+def collect_dependencies(scad_file: str) -> List[Path]:
+    """
+    SCADファイルが参照する依存ファイルを再帰的に収集
+
+    Args:
+        scad_file: SCADファイルパス
+
+    Returns:
+        List[Path]: 依存ファイルのパス（入力ファイル自身は含まない、存在しないものも含む）
+    """
+    root = Path(scad_file).resolve()
+    seen = {root}
+    dependencies = []
+    stack = [root]
+
+    while stack:
+        current = stack.pop()
+        try:
+            source = current.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+
+        source = _COMMENT_RE.sub("", source)
+        names = _IMPORT_RE.findall(source) + _USE_RE.findall(source)
+
+        for name in names:
+            path = (current.parent / name).resolve()
+            if path in seen:
+                continue
+            seen.add(path)
+            dependencies.append(path)
+            if path.suffix.lower() == ".scad":
+                stack.append(path)
+
+    return dependencies
+
+
+@lru_cache(maxsize=None)
+def openscad_version(executable: str = "openscad") -> str:
+    """
+    OpenSCADのバージョン文字列を取得（プロセス内でキャッシュ）
+
+    Args:
+        executable: OpenSCAD実行ファイル
+
+    Returns:
+        str: バージョン文字列（取得できない場合は"unknown"）
+    """
+    try:
+        result = subprocess.run(
+            [executable, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    # OpenSCADはバージョンをstderrに出力する
+    return (result.stderr or result.stdout).decode(errors="replace").strip() or "unknown"
+
+
+def _hash_file(hasher, path: Path):
+    """ファイル内容をハッシュに追加（パスではなく内容で識別する）"""
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+    except OSError:
+        hasher.update(b"<missing>")
+
+
+class RenderCache:
+    """
+    レンダリング画像のディスクキャッシュ
+
+    Usage:
+        cache = RenderCache(max_bytes=512 * 1024 * 1024)
+        with OpenSCADRenderer(cache=cache) as renderer:
+            renderer.render("model.scad", "output.png")
+        print(cache.stats())
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（Noneの場合は環境変数
+                OPENSCAD_RENDER_CACHE_DIR または ~/.cache/openscad-sandbox/renders）
+            max_bytes: キャッシュの最大サイズ（バイト）
+        """
+        self.cache_dir = Path(
+            cache_dir
+            or os.environ.get("OPENSCAD_RENDER_CACHE_DIR")
+            or Path.home() / ".cache" / "openscad-sandbox" / "renders"
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def compute_key(
+        self,
+        scad_file: str,
+        options: List[str],
+        output_suffix: str = ".png",
+        executable: str = "openscad",
+        backend: str = None
+    ) -> str:
+        """
+        キャッシュキーを計算
+
+        Args:
+            scad_file: 入力SCADファイル
+            options: OpenSCADに渡すCLIオプション（出力/入力ファイルパスを除く）
+            output_suffix: 出力ファイルの拡張子（出力形式に影響するため）
+            executable: OpenSCAD実行ファイル
+            backend: 解決済みの描画バックエンド（GLドライバーによって画像の
+                アンチエイリアス等が異なるため、別のバックエンドの画像は返さない）
+
+        Returns:
+            str: SHA-256の16進文字列
+        """
+        hasher = hashlib.sha256()
+        hasher.update(openscad_version(executable).encode())
+        hasher.update(json.dumps([output_suffix.lower(), *options]).encode())
+        if backend is not None:
+            hasher.update(f"backend={backend}".encode())
+
+        _hash_file(hasher, Path(scad_file).resolve())
+        for dependency in collect_dependencies(scad_file):
+            _hash_file(hasher, dependency)
+
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / f"{key}{suffix.lower()}"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def fetch(self, key: str, output_file: str) -> bool:
+        """
+        キャッシュから出力ファイルを復元
+
+        Args:
+            key: キャッシュキー
+            output_file: 出力ファイルパス
+
+        Returns:
+            bool: キャッシュヒット時True
+        """
+        entry = self._entry_path(key, Path(output_file).suffix)
+        try:
+            shutil.copyfile(entry, output_file)
+            # LRU用に最終使用時刻を更新
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        render_seconds = 0.0
+        try:
+            render_seconds = json.loads(self._meta_path(key).read_text())["render_seconds"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += render_seconds
+        return True
+
+    def store(self, key: str, output_file: str, render_seconds: float = 0.0):
+        """
+        レンダリング結果をキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            output_file: レンダリング済みの出力ファイル
+            render_seconds: レンダリングに要した時間（ヒット時の節約時間として記録）
+        """
+        entry = self._entry_path(key, Path(output_file).suffix)
+
+        # 並行書き込みに備えて一時ファイル経由でアトミックに配置
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(output_file, tmp_path)
+            os.replace(tmp_path, entry)
+        except OSError as e:
+            Path(tmp_path).unlink(missing_ok=True)
+            print(f"[WARNING] Render cache store failed: {e}")
+            return
+
+        self._meta_path(key).write_text(json.dumps({"render_seconds": render_seconds}))
+        self.evict()
+
+    def evict(self):
+        """最大サイズを超えた分を最終使用時刻の古い順に削除"""
+        entries = []
+        total = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".json", ".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            self._meta_path(path.stem).unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """キャッシュを全て削除"""
+        for path in self.cache_dir.iterdir():
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """
+        キャッシュ統計を取得
+
+        Returns:
+            dict: {"hits", "misses", "hit_rate", "saved_seconds"}
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
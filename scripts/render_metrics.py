@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+レンダリング計測モジュール
+
+OpenSCADの1回のレンダリングについて、経過時間のフェーズ内訳（stderrのログから推定）、
+子プロセスのピークRSS、出力サイズ、キャッシュヒット有無を構造化して保持し、
+JSON Lines形式のログやPrometheusのtextfile形式で出力する。
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# CGAL（またはManifold）によるジオメトリ評価の開始行
+_GEOMETRY_START_RE = re.compile(r"Rendering Polygon Mesh using|Rendering polygon mesh")
+# ジオメトリ評価の終了行
+_GEOMETRY_END_RE = re.compile(r"Total rendering time|Rendering finished")
+# "Total rendering time: 0:00:01.234"（OpenSCAD自身が計測した時間）
+_TOTAL_TIME_RE = re.compile(r"Total rendering time:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+@dataclass
+class RenderResult:
+    """
+    1回のレンダリング結果と計測値
+
+    真偽値として評価すると成功可否になる（従来のbool戻り値と互換）。
+    """
+
+    success: bool
+    scad_file: str
+    output_file: str
+    error: Optional[str] = None
+    cache_hit: bool = False
+    # 全体の経過時間（秒）
+    wall_seconds: float = 0.0
+    # フェーズ内訳（秒）: spawn=起動〜最初のログ, compile=パース・CSG木構築,
+    # cgal=ジオメトリ評価, rasterize=最後のログ〜終了（画像描画・書き出し）
+    phases: Dict[str, float] = field(default_factory=dict)
+    # 子プロセスのピークRSS（バイト）
+    peak_rss_bytes: Optional[int] = None
+    output_bytes: Optional[int] = None
+    stderr: str = ""
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def to_dict(self, include_stderr: bool = False) -> dict:
+        """
+        辞書に変換
+
+        Args:
+            include_stderr: OpenSCADのstderr全文を含めるか
+
+        Returns:
+            dict: 計測値の辞書
+        """
+        data = asdict(self)
+        if not include_stderr:
+            data.pop("stderr")
+        return data
+
+
+def parse_phases(stderr_lines: List[Tuple[float, str]], wall_seconds: float) -> Dict[str, float]:
+    """
+    タイムスタンプ付きのstderrログからフェーズ内訳を推定
+
+    Args:
+        stderr_lines: [(プロセス起動からの経過秒, 行), ...]
+        wall_seconds: 全体の経過時間
+
+    Returns:
+        Dict[str, float]: {"spawn", "compile", "cgal", "rasterize"}（判別できないフェーズは含まない）
+    """
+    if not stderr_lines:
+        return {}
+
+    first_time = stderr_lines[0][0]
+    last_time = stderr_lines[-1][0]
+    phases = {"spawn": first_time}
+
+    geometry_start = next((t for t, line in stderr_lines if _GEOMETRY_START_RE.search(line)), None)
+    geometry_end = next((t for t, line in stderr_lines if _GEOMETRY_END_RE.search(line)), None)
+
+    if geometry_start is not None:
+        phases["compile"] = geometry_start - first_time
+        if geometry_end is not None and geometry_end >= geometry_start:
+            phases["cgal"] = geometry_end - geometry_start
+    else:
+        phases["compile"] = last_time - first_time
+
+    # OpenSCAD自身が出力したジオメトリ評価時間があればそちらを優先
+    for _, line in stderr_lines:
+        match = _TOTAL_TIME_RE.search(line)
+        if match:
+            hours, minutes, seconds = match.groups()
+            phases["cgal"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            break
+
+    phases["rasterize"] = max(wall_seconds - last_time, 0.0)
+    return phases
+
+
+class RenderMetricsRecorder:
+    """
+    レンダリング計測値の記録先
+
+    Usage:
+        metrics = RenderMetricsRecorder(jsonl_path="render_metrics.jsonl",
+                                        prometheus_path="/var/lib/node_exporter/openscad.prom")
+        with OpenSCADRenderer(metrics=metrics) as renderer:
+            renderer.render("model.scad", "output.png")
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """
+        Args:
+            jsonl_path: 1レンダリング1行で追記するJSON Linesファイル
+            prometheus_path: 累積値を書き出すPrometheus textfileのパス
+        """
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self._lock = threading.Lock()
+
+        self.renders = {"success": 0, "failure": 0}
+        self.cache_hits = 0
+        self.wall_seconds_sum = 0.0
+        self.phase_seconds_sum: Dict[str, float] = {}
+        self.output_bytes_sum = 0
+        self.peak_rss_bytes_max = 0
+
+    def record(self, result: RenderResult):
+        """
+        計測値を記録
+
+        Args:
+            result: レンダリング結果
+        """
+        with self._lock:
+            self.renders["success" if result.success else "failure"] += 1
+            self.cache_hits += int(result.cache_hit)
+            self.wall_seconds_sum += result.wall_seconds
+            for phase, seconds in result.phases.items():
+                self.phase_seconds_sum[phase] = self.phase_seconds_sum.get(phase, 0.0) + seconds
+            self.output_bytes_sum += result.output_bytes or 0
+            self.peak_rss_bytes_max = max(self.peak_rss_bytes_max, result.peak_rss_bytes or 0)
+
+            if self.jsonl_path:
+                record = {"timestamp": time.time(), **result.to_dict()}
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            if self.prometheus_path:
+                self._write_prometheus()
+
+    def prometheus_text(self) -> str:
+        """
+        累積値をPrometheusのテキスト形式に変換
+
+        Returns:
+            str: textfile collector用のテキスト
+        """
+        lines = [
+            "# HELP openscad_render_total Number of OpenSCAD renders by status.",
+            "# TYPE openscad_render_total counter",
+        ]
+        for status, count in sorted(self.renders.items()):
+            lines.append(f'openscad_render_total{{status="{status}"}} {count}')
+
+        lines += [
+            "# HELP openscad_render_cache_hits_total Renders served from the render cache.",
+            "# TYPE openscad_render_cache_hits_total counter",
+            f"openscad_render_cache_hits_total {self.cache_hits}",
+            "# HELP openscad_render_wall_seconds_total Total wall time spent rendering.",
+            "# TYPE openscad_render_wall_seconds_total counter",
+            f"openscad_render_wall_seconds_total {self.wall_seconds_sum:.6f}",
+            "# HELP openscad_render_phase_seconds_total Wall time per render phase.",
+            "# TYPE openscad_render_phase_seconds_total counter",
+        ]
+        for phase, seconds in sorted(self.phase_seconds_sum.items()):
+            lines.append(f'openscad_render_phase_seconds_total{{phase="{phase}"}} {seconds:.6f}')
+
+        lines += [
+            "# HELP openscad_render_output_bytes_total Bytes of rendered images written.",
+            "# TYPE openscad_render_output_bytes_total counter",
+            f"openscad_render_output_bytes_total {self.output_bytes_sum}",
+            "# HELP openscad_render_peak_rss_bytes Largest peak RSS of an OpenSCAD child process.",
+            "# TYPE openscad_render_peak_rss_bytes gauge",
+            f"openscad_render_peak_rss_bytes {self.peak_rss_bytes_max}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self):
+        # textfile collectorが書きかけのファイルを読まないよう、一時ファイル経由で置き換える
+        path = Path(self.prometheus_path)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.prometheus_text())
+        os.replace(tmp_path, path)
@@ -5,12 +5,174 @@ OpenSCADレンダリング共通モジュール
 headlessモードでOpenSCADを実行し、画像を生成するための再利用可能なモジュール。
 """
 
+import os
+import re
 import subprocess
 import signal
+import sys
+import tempfile
+import threading
 import time
-import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from .xvfb_pool import XvfbDisplayPool, get_default_pool, wait_for_display, xvfb_command
+    from .render_cache import RenderCache, openscad_version
+    from .render_backends import BACKENDS, backend_env, resolve_backend
+    from .render_metrics import RenderMetricsRecorder, RenderResult, parse_phases
+except ImportError:
+    # scripts/renderer.py として直接実行された場合
+    from xvfb_pool import XvfbDisplayPool, get_default_pool, wait_for_display, xvfb_command
+    from render_cache import RenderCache, openscad_version
+    from render_backends import BACKENDS, backend_env, resolve_backend
+    from render_metrics import RenderMetricsRecorder, RenderResult, parse_phases
+
+
+# バイナリSTL出力（--export-format binstl）に対応したOpenSCADの最初のリリース年
+_BINSTL_MIN_YEAR = 2021
+
+
+def mesh_export_options(mesh_file: str, executable: str = "openscad") -> list:
+    """
+    メッシュ出力用のOpenSCADオプションを構築
+
+    OpenSCADはSTLをデフォルトでASCII形式で書き出すため、対応するバージョンでは
+    バイナリSTLを指定する（ファイルサイズが約1/5になり、書き出し・import()も速い）。
+
+    Args:
+        mesh_file: 出力メッシュファイルパス
+        executable: OpenSCAD実行ファイル
+
+    Returns:
+        list: コマンドライン引数
+    """
+    if Path(mesh_file).suffix.lower() != ".stl":
+        return []
+    match = re.search(r"(\d{4})\.\d+", openscad_version(executable))
+    if match and int(match.group(1)) >= _BINSTL_MIN_YEAR:
+        return ["--export-format", "binstl"]
+    return []
+
+
+def build_render_options(
+    imgsize: tuple = (1920, 1080),
+    colorscheme: str = "Tomorrow",
+    projection: str = "p",
+    render_mode: bool = True,
+    camera: tuple = None,
+    autocenter: bool = True,
+    viewall: bool = True
+) -> list:
+    """
+    画像出力用のOpenSCADオプションを構築（入出力ファイル以外）
+
+    引数の意味はOpenSCADRenderer.render()と同じ。
+
+    Returns:
+        list: コマンドライン引数
+    """
+    options = [
+        "--imgsize", f"{imgsize[0]},{imgsize[1]}",
+        "--colorscheme", colorscheme,
+        f"--projection={projection}",
+    ]
+
+    if render_mode:
+        options.append("--render")
+
+    if camera:
+        cam_str = ",".join(map(str, camera))
+        options.extend(["--camera", cam_str])
+
+    if autocenter:
+        options.append("--autocenter")
+
+    if viewall:
+        options.append("--viewall")
+
+    return options
+
+
+def run_openscad(cmd: list, env: dict = None, timeout: float = None) -> dict:
+    """
+    OpenSCADを実行し、stderrの各行の時刻と子プロセスのピークRSSを計測
+
+    Args:
+        cmd: コマンドライン
+        env: 環境変数
+        timeout: タイムアウト秒数（超過時はkillしてtimed_out=Trueを返す）
+
+    Returns:
+        dict: {"returncode", "stderr_lines": [(経過秒, 行), ...], "wall_seconds",
+               "peak_rss_bytes", "timed_out"}
+    """
+    start_time = time.monotonic()
+    process = subprocess.Popen(
+        cmd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+
+    stderr_lines = []
+
+    def read_stderr():
+        for raw_line in process.stderr:
+            stderr_lines.append((time.monotonic() - start_time, raw_line.decode(errors="replace")))
+
+    reader = threading.Thread(target=read_stderr, daemon=True)
+    reader.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout is not None else None
+    if timer is not None:
+        timer.start()
+
+    peak_rss_bytes = None
+    try:
+        if hasattr(os, "wait4"):
+            # wait4で回収すると、その子プロセス単体のrusage（ピークRSS）が得られる
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrssはLinuxではKB単位、macOSではバイト単位
+            peak_rss_bytes = rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+        else:
+            process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+    wall_seconds = time.monotonic() - start_time
+    reader.join()
+    process.stderr.close()
+
+    return {
+        "returncode": process.returncode,
+        "stderr_lines": stderr_lines,
+        "wall_seconds": wall_seconds,
+        "peak_rss_bytes": peak_rss_bytes,
+        "timed_out": timed_out.is_set(),
+    }
+
+
+# render_multiple_views()のデフォルトビュー
+DEFAULT_VIEWS = {
+    "front": {"camera": (0, -150, 50, 60, 0, 0, 250)},
+    "top": {"camera": (0, 0, 200, 0, 0, 0, 250)},
+    "side": {"camera": (150, 0, 50, 60, 0, 90, 250)},
+    "iso": {"camera": (100, -100, 100, 55, 0, 45, 300)},
+}
+
 
 class OpenSCADRenderer:
     """
@@ -19,42 +181,85 @@ class OpenSCADRenderer:
     Usage:
         with OpenSCADRenderer(display=99) as renderer:
             renderer.render("model.scad", "output.png")
+
+        # 起動済みXvfbをプールから借りる（起動コストなし）
+        with OpenSCADRenderer(pool=get_default_pool(size=4)) as renderer:
+            renderer.render("model.scad", "output.png")
+
+        # 同一入力・同一オプションのレンダリング結果をキャッシュから返す
+        with OpenSCADRenderer(cache=RenderCache()) as renderer:
+            renderer.render("model.scad", "output.png")
+
+        # Xサーバーを使わないオフスクリーン描画（使えなければXvfbにフォールバック）
+        with OpenSCADRenderer(backend="auto") as renderer:
+            renderer.render("model.scad", "output.png")
+
+        # フェーズ別の所要時間・ピークRSS等をJSON Lines/Prometheus textfileに記録
+        metrics = RenderMetricsRecorder(jsonl_path="render_metrics.jsonl")
+        with OpenSCADRenderer(metrics=metrics) as renderer:
+            result = renderer.render("model.scad", "output.png")
+            print(result.phases, result.peak_rss_bytes)
     """
 
-    def __init__(self, display: int = 99):
+    def __init__(
+        self,
+        display: int = 99,
+        pool: XvfbDisplayPool = None,
+        cache: RenderCache = None,
+        backend: str = None,
+        metrics: RenderMetricsRecorder = None
+    ):
         """
         Args:
             display: Xvfbディスプレイ番号（デフォルト: 99）
+            pool: Xvfbディスプレイプール（指定時はXvfbを起動せずプールから借りる）
+            cache: レンダリングキャッシュ（指定時は同一キーの画像をキャッシュから返す）
+            backend: 描画バックエンド（"xvfb", "egl", "software", "auto"。
+                Noneの場合は環境変数 OPENSCAD_RENDER_BACKEND、未設定なら"xvfb"）
+            metrics: レンダリング計測値の記録先
         """
         self.display = display
+        self.pool = pool
+        self.cache = cache
+        self.backend = backend
+        self.metrics = metrics
         self.xvfb_process = None
+        self._leased = False
 
     def __enter__(self):
-        """コンテキストマネージャー: Xvfbを起動"""
-        self.start_xvfb()
+        """コンテキストマネージャー: Xvfbを起動（またはプールから借りる）"""
+        self.backend = resolve_backend(self.backend)
+        if self.backend != "xvfb":
+            # オフスクリーンバックエンドはXサーバー不要
+            return self
+        if self.pool is not None:
+            self.display = self.pool.lease()
+            self._leased = True
+        else:
+            self.start_xvfb()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """コンテキストマネージャー: Xvfbを停止"""
-        self.stop_xvfb()
+        """コンテキストマネージャー: Xvfbを停止（またはプールへ返却）"""
+        if self._leased:
+            self.pool.release(self.display)
+            self._leased = False
+        else:
+            self.stop_xvfb()
 
     def start_xvfb(self):
         """Xvfb（仮想フレームバッファ）を起動"""
         print(f"Starting Xvfb on display :{self.display}...")
         self.xvfb_process = subprocess.Popen(
-            [
-                "Xvfb",
-                f":{self.display}",
-                "-screen", "0", "1920x1080x24",
-                "-ac",
-                "+extension", "GLX",
-                "+render",
-                "-noreset"
-            ],
+            xvfb_command(self.display),
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
-        time.sleep(2)
+        # 固定時間sleepせず、接続可能になるまでプローブ
+        if not wait_for_display(self.display, process=self.xvfb_process):
+            print(f"[FAILED] Xvfb did not become ready on display :{self.display}")
+            self.stop_xvfb()
+            raise RuntimeError(f"Xvfb failed to start on display :{self.display}")
         print(f"[SUCCESS] Xvfb started on display :{self.display}")
 
     def stop_xvfb(self):
@@ -66,8 +271,18 @@ class OpenSCADRenderer:
                 self.xvfb_process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self.xvfb_process.kill()
+            self.xvfb_process = None
             print("[SUCCESS] Xvfb stopped")
 
+    def openscad_env(self) -> dict:
+        """
+        OpenSCAD実行用の環境変数（バックエンド・ディスプレイに応じて設定）
+
+        Returns:
+            dict: 環境変数
+        """
+        return backend_env(resolve_backend(self.backend), self.display)
+
     def render(
         self,
         scad_file: str,
@@ -78,8 +293,9 @@ class OpenSCADRenderer:
         render_mode: bool = True,
         camera: tuple = None,
         autocenter: bool = True,
-        viewall: bool = True
-    ):
+        viewall: bool = True,
+        timeout: float = None
+    ) -> RenderResult:
         """
         OpenSCADファイルをレンダリングして画像を生成
 
@@ -93,37 +309,62 @@ class OpenSCADRenderer:
             camera: カメラ位置 (x,y,z,rx,ry,rz,d) または None
             autocenter: 自動センタリング
             viewall: 全体表示
+            timeout: タイムアウト秒数（超過時はOpenSCADを停止して失敗扱い）
 
         Returns:
-            bool: 成功時True、失敗時False
+            RenderResult: 結果と計測値（真偽値として評価すると成功可否）
         """
-        # 環境変数を設定
-        env = os.environ.copy()
-        env["DISPLAY"] = f":{self.display}"
-
-        # OpenSCADコマンドを構築
-        cmd = [
-            "openscad",
-            "-o", output_file,
-            "--imgsize", f"{imgsize[0]},{imgsize[1]}",
-            "--colorscheme", colorscheme,
-            f"--projection={projection}",
-        ]
-
-        if render_mode:
-            cmd.append("--render")
-
-        if camera:
-            cam_str = ",".join(map(str, camera))
-            cmd.extend(["--camera", cam_str])
-
-        if autocenter:
-            cmd.append("--autocenter")
+        result = self._render(
+            scad_file, output_file, imgsize, colorscheme, projection,
+            render_mode, camera, autocenter, viewall, timeout
+        )
+        if self.metrics is not None:
+            self.metrics.record(result)
+        return result
 
-        if viewall:
-            cmd.append("--viewall")
+    def _render(
+        self,
+        scad_file: str,
+        output_file: str,
+        imgsize: tuple = (1920, 1080),
+        colorscheme: str = "Tomorrow",
+        projection: str = "p",
+        render_mode: bool = True,
+        camera: tuple = None,
+        autocenter: bool = True,
+        viewall: bool = True,
+        timeout: float = None
+    ) -> RenderResult:
+        """
+        render()の本体（計測値の記録は行わない）
 
-        cmd.append(scad_file)
+        Returns:
+            RenderResult: 結果と計測値
+        """
+        env = self.openscad_env()
+        options = build_render_options(
+            imgsize, colorscheme, projection, render_mode, camera, autocenter, viewall
+        )
+        cmd = ["openscad", "-o", output_file, *options, scad_file]
+
+        # キャッシュ確認
+        cache_key = None
+        if self.cache is not None:
+            start_time = time.monotonic()
+            cache_key = self.cache.compute_key(
+                scad_file, options, output_suffix=Path(output_file).suffix,
+                backend=resolve_backend(self.backend)
+            )
+            if self.cache.fetch(cache_key, output_file):
+                print(f"[CACHE HIT] {scad_file} -> {output_file}")
+                return RenderResult(
+                    success=True,
+                    scad_file=scad_file,
+                    output_file=output_file,
+                    cache_hit=True,
+                    wall_seconds=time.monotonic() - start_time,
+                    output_bytes=Path(output_file).stat().st_size
+                )
 
         # レンダリング実行
         print(f"Rendering {scad_file}...")
@@ -131,25 +372,74 @@ class OpenSCADRenderer:
         print(f"  Projection: {'Perspective' if projection == 'p' else 'Orthogonal'}")
         print(f"  Color scheme: {colorscheme}")
 
+        run = run_openscad(cmd, env=env, timeout=timeout)
+        elapsed_time = run["wall_seconds"]
+        result = RenderResult(
+            success=run["returncode"] == 0 and not run["timed_out"],
+            scad_file=scad_file,
+            output_file=output_file,
+            wall_seconds=elapsed_time,
+            phases=parse_phases(run["stderr_lines"], elapsed_time),
+            peak_rss_bytes=run["peak_rss_bytes"],
+            stderr="".join(line for _, line in run["stderr_lines"])
+        )
+
+        if run["timed_out"]:
+            result.error = f"Timed out after {timeout}s"
+            print(f"[FAILED] Rendering failed")
+            print(f"  Error: {result.error}")
+        elif result.success:
+            if cache_key is not None:
+                self.cache.store(cache_key, output_file, elapsed_time)
+            result.output_bytes = Path(output_file).stat().st_size
+            print(f"[SUCCESS] Rendered successfully: {output_file}")
+            print(f"  File size: {result.output_bytes / 1024:.1f} KB")
+            print(f"  Time: {elapsed_time:.2f}s")
+        else:
+            result.error = result.stderr
+            print(f"[FAILED] Rendering failed")
+            print(f"  Error: {result.error}")
+
+        return result
+
+
+    def export_mesh(self, scad_file: str, mesh_file: str, timeout: float = None) -> bool:
+        """
+        SCADファイルのジオメトリを一度だけ評価してメッシュファイルに書き出す
+
+        Args:
+            scad_file: 入力SCADファイルパス
+            mesh_file: 出力メッシュファイルパス（.off, .stl, .3mf等、拡張子で形式を判定）
+            timeout: タイムアウト秒数
+
+        Returns:
+            bool: 成功時True、失敗時False
+        """
+        print(f"Evaluating geometry {scad_file} -> {mesh_file}...")
         start_time = time.time()
 
-        result = subprocess.run(
-            cmd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        try:
+            result = subprocess.run(
+                ["openscad", *mesh_export_options(mesh_file), "-o", mesh_file, scad_file],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            print(f"[FAILED] Geometry evaluation failed")
+            print(f"  Error: Timed out after {timeout}s")
+            return False
 
         elapsed_time = time.time() - start_time
 
-        if result.returncode == 0:
-            file_size = Path(output_file).stat().st_size / 1024
-            print(f"[SUCCESS] Rendered successfully: {output_file}")
+        if result.returncode == 0 and Path(mesh_file).exists():
+            file_size = Path(mesh_file).stat().st_size / 1024
+            print(f"[SUCCESS] Geometry evaluated: {mesh_file}")
             print(f"  File size: {file_size:.1f} KB")
             print(f"  Time: {elapsed_time:.2f}s")
             return True
         else:
-            print(f"[FAILED] Rendering failed")
+            print(f"[FAILED] Geometry evaluation failed")
             print(f"  Error: {result.stderr.decode()}")
             return False
 
@@ -158,39 +448,211 @@ def render_multiple_views(
     scad_file: str,
     output_prefix: str,
     views: dict = None,
-    display: int = 99
+    display: int = 99,
+    pool: XvfbDisplayPool = None,
+    max_workers: int = 1,
+    timeout: float = None,
+    errors: dict = None,
+    cache: RenderCache = None,
+    evaluate_once: bool = False,
+    mesh_format: str = "off",
+    backend: str = None,
+    metrics: RenderMetricsRecorder = None
 ):
     """
     複数のビューを一度にレンダリング
 
+    max_workers > 1 の場合、ビューをスレッドプールで並行にレンダリングする
+    （OpenSCADの各プロセスはシングルスレッドのため、コア数分まで並列化が効く）。
+    poolを指定すると各ワーカーが個別のディスプレイを借り、
+    指定しない場合は1つのXvfbを全ワーカーで共有する。
+
+    evaluate_once=True の場合、CSG/CGAL評価を最初に一度だけ行ってメッシュに書き出し、
+    各ビューはそのメッシュをimport()したSCADからレンダリングする
+    （カメラ位置を変えるだけのためにビューごとにジオメトリを再評価しない）。
+    中間メッシュにはcolor()の指定が残らないため、全ビューがカラースキームの色になる。
+    cacheを指定した場合は評価の前に元のSCADファイルのキーで全ビューのキャッシュを確認し、
+    ミスしたビューがある場合だけ評価してそのビューをレンダリングする。
+
+    逐次・並行のどちらでも、ビューのレンダリング中の例外はそのビューの失敗として
+    errorsに記録し、他のビューのレンダリングを続ける。
+
     Args:
         scad_file: 入力SCADファイル
         output_prefix: 出力ファイル名のプレフィックス
         views: ビュー設定の辞書 {"view_name": {"camera": (...), ...}}
         display: Xvfbディスプレイ番号
+        pool: Xvfbディスプレイプール（指定時はdisplayを無視してプールから借りる）
+        max_workers: 同時にレンダリングするビュー数の上限（1なら逐次実行）
+        timeout: ビューごとのタイムアウト秒数
+        errors: 失敗したビューのエラー（例外を含む）を格納する辞書 {"view_name": "message"}
+        cache: レンダリングキャッシュ
+        evaluate_once: ジオメトリを一度だけ評価してメッシュを全ビューで共有する
+        mesh_format: evaluate_once時の中間メッシュ形式（"off", "stl", "3mf"等）
+        backend: 描画バックエンド（"xvfb", "egl", "software", "auto"）
+        metrics: ビューごとのレンダリング計測値の記録先
 
     Returns:
-        dict: {"view_name": "output_file_path", ...}
+        dict: {"view_name": "output_file_path", ...}（viewsの順）
     """
     if views is None:
-        # デフォルトビュー
-        views = {
-            "front": {"camera": (0, -150, 50, 60, 0, 0, 250)},
-            "top": {"camera": (0, 0, 200, 0, 0, 0, 250)},
-            "side": {"camera": (150, 0, 50, 60, 0, 90, 250)},
-            "iso": {"camera": (100, -100, 100, 55, 0, 45, 300)},
-        }
+        views = DEFAULT_VIEWS
+
+    if errors is None:
+        errors = {}
+
+    outputs = {
+        view_name: f"{output_prefix}_{view_name}.png" for view_name in views
+    }
+
+    cached = {}
+    if evaluate_once:
+        keys = {}
+        if cache is not None:
+            # 中間メッシュのキーはメッシュの内容に依存するため、元のSCADファイルから計算した
+            # キーで全ビューを確認し、1つでもミスした場合だけジオメトリを評価する
+            for view_name in views:
+                keys[view_name] = _evaluate_once_key(
+                    cache, scad_file, views[view_name], mesh_format, backend
+                )
+                start_time = time.monotonic()
+                if cache.fetch(keys[view_name], outputs[view_name]):
+                    print(f"[CACHE HIT] {scad_file} -> {outputs[view_name]}")
+                    cached[view_name] = outputs[view_name]
+                    if metrics is not None:
+                        metrics.record(RenderResult(
+                            success=True,
+                            scad_file=scad_file,
+                            output_file=outputs[view_name],
+                            cache_hit=True,
+                            wall_seconds=time.monotonic() - start_time,
+                            output_bytes=Path(outputs[view_name]).stat().st_size
+                        ))
+            if len(cached) == len(views):
+                return cached
+
+        pending = {name: settings for name, settings in views.items() if name not in cached}
+        with tempfile.TemporaryDirectory(prefix="openscad_mesh_") as mesh_dir:
+            mesh_name = f"model.{mesh_format}"
+            mesh_scad = Path(mesh_dir) / "model.scad"
+            start_time = time.monotonic()
+            renderer = OpenSCADRenderer(display=display)
+            if renderer.export_mesh(scad_file, str(Path(mesh_dir) / mesh_name), timeout):
+                mesh_scad.write_text(f'import("{mesh_name}");\n')
+                rendered = render_multiple_views(
+                    str(mesh_scad), output_prefix, pending, display, pool,
+                    max_workers, timeout, errors, backend=backend, metrics=metrics
+                )
+                if cache is not None and rendered:
+                    # 全ビューがヒットすれば評価とレンダリングの合計時間を節約できる
+                    seconds = (time.monotonic() - start_time) / len(rendered)
+                    for view_name in rendered:
+                        cache.store(keys[view_name], outputs[view_name], seconds)
+                merged = {**cached, **rendered}
+                return {name: merged[name] for name in views if name in merged}
+            # 2Dモデル等でメッシュ化できない場合はビューごとの評価にフォールバック
+            print("[WARNING] Falling back to per-view geometry evaluation")
+            views = pending
+
+    def render_with(renderer, view_name):
+        settings = {"timeout": timeout, **views[view_name]}
+        result = renderer.render(scad_file, outputs[view_name], **settings)
+        return result.success, result.error
+
+    if max_workers <= 1:
+        with OpenSCADRenderer(
+            display=display, pool=pool, cache=cache, backend=backend, metrics=metrics
+        ) as renderer:
+            outcomes = _run_views(lambda view_name: render_with(renderer, view_name), views)
+    elif pool is not None:
+        # ワーカーごとにプールからディスプレイを借りる
+        def render_view(view_name):
+            with OpenSCADRenderer(
+                pool=pool, cache=cache, backend=backend, metrics=metrics
+            ) as renderer:
+                return render_with(renderer, view_name)
+
+        outcomes = _run_views(render_view, views, max_workers)
+    else:
+        # 1つのXvfbを全ワーカーで共有
+        with OpenSCADRenderer(
+            display=display, cache=cache, backend=backend, metrics=metrics
+        ) as renderer:
+            outcomes = _run_views(
+                lambda view_name: render_with(renderer, view_name), views, max_workers
+            )
+
+    results = dict(cached)
+    for view_name in views:
+        success, error = outcomes[view_name]
+        if success:
+            results[view_name] = outputs[view_name]
+        else:
+            errors[view_name] = error
 
-    results = {}
+    return {name: results[name] for name in outputs if name in results}
 
-    with OpenSCADRenderer(display=display) as renderer:
-        for view_name, settings in views.items():
-            output_file = f"{output_prefix}_{view_name}.png"
-            success = renderer.render(scad_file, output_file, **settings)
-            if success:
-                results[view_name] = output_file
 
-    return results
+def _evaluate_once_key(
+    cache: RenderCache,
+    scad_file: str,
+    settings: dict,
+    mesh_format: str,
+    backend: str = None
+) -> str:
+    """
+    evaluate_once時のビューのキャッシュキー（元のSCADファイルと依存ファイルから計算）
+
+    中間メッシュからの画像はcolor()の指定が残らず直接のレンダリングと異なるため、
+    キーに評価方法（実在しないオプション）を含めて区別する。
+
+    Args:
+        cache: レンダリングキャッシュ
+        scad_file: 入力SCADファイル
+        settings: ビュー設定（render()のキーワード引数）
+        mesh_format: 中間メッシュ形式
+        backend: 描画バックエンド（Noneの場合はdefault_backend()）
+
+    Returns:
+        str: キャッシュキー
+    """
+    options = build_render_options(
+        **{name: value for name, value in settings.items() if name != "timeout"}
+    )
+    return cache.compute_key(
+        scad_file, [*options, f"--evaluate-once={mesh_format}"], backend=resolve_backend(backend)
+    )
+
+
+def _run_views(func, view_names, max_workers: int = 1) -> dict:
+    """
+    ビューごとの処理を実行し、結果を集約（例外はそのビューの失敗として扱う）
+
+    Args:
+        func: ビュー名を受け取り (成功可否, エラー) を返す関数
+        view_names: ビュー名のイテラブル
+        max_workers: 最大ワーカー数（1以下なら逐次実行、それ以外はスレッドプール）
+
+    Returns:
+        dict: {"view_name": (success, error)}（view_namesの順）
+    """
+    outcomes = {}
+    if max_workers <= 1:
+        for name in view_names:
+            try:
+                outcomes[name] = func(name)
+            except Exception as e:
+                outcomes[name] = (False, str(e))
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(func, name) for name in view_names}
+        for name, future in futures.items():
+            try:
+                outcomes[name] = future.result()
+            except Exception as e:
+                outcomes[name] = (False, str(e))
+    return outcomes
 
 
 def main():
@@ -232,11 +694,54 @@ def main():
         default=99,
         help="Xvfb display number (default: 99)"
     )
+    parser.add_argument(
+        "--xvfb-pool",
+        action="store_true",
+        help="Reuse a persistent Xvfb server across invocations instead of starting one per call"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="GL backend: xvfb, egl, software or auto (default: $OPENSCAD_RENDER_BACKEND or xvfb)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Enable the render cache in this directory"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Maximum render cache size in MB (default: 512)"
+    )
+    parser.add_argument(
+        "--metrics-log",
+        help="Append per-render metrics to this JSON-lines file"
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        help="Write render metrics to this Prometheus textfile-collector file"
+    )
 
     args = parser.parse_args()
 
-    with OpenSCADRenderer(display=args.display) as renderer:
-        success = renderer.render(
+    pool = None
+    if args.xvfb_pool:
+        pool = get_default_pool(size=1, base_display=args.display)
+
+    cache = None
+    if args.cache_dir:
+        cache = RenderCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    metrics = None
+    if args.metrics_log or args.prometheus_textfile:
+        metrics = RenderMetricsRecorder(args.metrics_log, args.prometheus_textfile)
+
+    with OpenSCADRenderer(
+        display=args.display, pool=pool, cache=cache, backend=args.backend, metrics=metrics
+    ) as renderer:
+        result = renderer.render(
             scad_file=args.scad_file,
             output_file=args.output_file,
             imgsize=tuple(args.imgsize),
@@ -245,7 +750,18 @@ def main():
             render_mode=not args.preview
         )
 
-        return 0 if success else 1
+    if result.phases:
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result.phases.items())
+        print(f"  Phases: {phases}")
+    if result.peak_rss_bytes:
+        print(f"  Peak RSS: {result.peak_rss_bytes / (1024 * 1024):.1f} MB")
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Render cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['saved_seconds']:.2f}s saved")
+
+    return 0 if result else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+2D空間索引（一様グリッド）
+
+エンティティのバウンディングボックスを一様グリッドのセルに登録し、
+矩形領域（ウィンドウ）と最近傍のクエリを全件走査せずに処理する。
+グリッドはセルごとのエンティティ番号をCSR形式（オフセット配列 + 連結した番号配列）で保持する。
+多数のセルにまたがるエンティティ（図面を横切る長い斜めの線分等）はセルに登録せず、
+別のリストに分けてクエリごとに全件判定する（登録数がセル数×エンティティ数に膨らまないように）。
+
+ジオメトリ（線分・円弧等への正確な距離）は扱わず、最近傍クエリでは呼び出し側が
+距離関数を渡す（DXFParser.nearest_entity()等）。
+"""
+
+import math
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# 1軸あたりの最大セル数（退化した図面でセル数が爆発しないように）
+MAX_CELLS_PER_AXIS = 1024
+
+# 1エンティティあたりの最大登録セル数（超えるエンティティは全件判定のリストに分ける）
+MAX_CELLS_PER_ENTITY = 64
+
+
+class GridIndex:
+    """エンティティのバウンディングボックスに対する一様グリッド索引"""
+
+    def __init__(
+        self,
+        extents: Dict[str, Tuple[np.ndarray, np.ndarray]],
+        cell_size: Optional[float] = None
+    ):
+        """
+        Args:
+            extents: {エンティティタイプ: (最小座標 (N, 2), 最大座標 (N, 2))}
+            cell_size: セルの一辺の長さ（Noneの場合はエンティティ数と大きさから決める）
+        """
+        self.types = list(extents)
+        counts = [len(mins) for mins, _ in extents.values()]
+        self._mins = np.concatenate([np.empty((0, 2))] + [mins for mins, _ in extents.values()])
+        self._maxs = np.concatenate([np.empty((0, 2))] + [maxs for _, maxs in extents.values()])
+        # 登録番号 → (タイプ番号, タイプ内のインデックス)
+        self._type_codes = np.repeat(np.arange(len(self.types)), counts)
+        self._ids = np.concatenate([np.empty(0, dtype=np.intp)] + [np.arange(n) for n in counts])
+
+        count = len(self._mins)
+        if count:
+            self.origin = self._mins.min(axis=0)
+            self.extent = self._maxs.max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(2)
+            self.extent = np.zeros(2)
+
+        if cell_size is None:
+            cell_size = self._default_cell_size()
+        self.cell_size = float(cell_size)
+        self.shape = tuple(int(n) for n in np.floor(self.extent / self.cell_size) + 1)
+
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._mins)
+
+    def _default_cell_size(self) -> float:
+        """平均して数個のエンティティが入り、典型的なエンティティより小さくならないセルの大きさ"""
+        count = len(self._mins)
+        width, height = self.extent
+        longest = max(width, height)
+        if not count or longest <= 0:
+            return 1.0
+        # 1セルあたり平均4個程度（細長い図面では短辺を長辺/個数まで広げて面積を見積もる）
+        area = max(width, longest / count) * max(height, longest / count)
+        size = math.sqrt(area / count) * 2
+        typical = float(np.median((self._maxs - self._mins).max(axis=1)))
+        return max(size, typical, longest / MAX_CELLS_PER_AXIS)
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """座標 → セル番号 (ix, iy)（グリッド外はグリッドの端に丸める）"""
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.intp)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def _build(self):
+        """各エンティティが重なるセルに登録し、セル番号順に並べる（大きいエンティティは別のリストへ）"""
+        nx, ny = self.shape
+        low = self._cells(self._mins)
+        high = self._cells(self._maxs)
+        spans = high - low + 1
+        counts = spans[:, 0] * spans[:, 1]
+        large = counts > MAX_CELLS_PER_ENTITY
+        self._large = np.flatnonzero(large)
+        counts[large] = 0
+
+        entries = np.repeat(np.arange(len(counts)), counts)
+        # エンティティごとの重なるセルを列挙（セル範囲内の通し番号 → (ix, iy)）
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        widths = spans[entries, 0]
+        cx = low[entries, 0] + local % widths
+        cy = low[entries, 1] + local // widths
+        keys = cy * nx + cx
+
+        order = np.argsort(keys, kind="stable")
+        self._entries = entries[order]
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=nx * ny))])
+
+    def _type_filter(self, types: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        if types is None:
+            return None
+        return np.array([self.types.index(t) for t in types if t in self.types], dtype=np.intp)
+
+    def _window(self, box_min, box_max, type_codes: Optional[np.ndarray]) -> np.ndarray:
+        """ウィンドウとバウンディングボックスが重なるエンティティの登録番号"""
+        box_min = np.asarray(box_min, dtype=float)
+        box_max = np.asarray(box_max, dtype=float)
+        if not len(self) or np.any(box_max < self.origin) or np.any(box_min > self.origin + self.extent):
+            return np.empty(0, dtype=np.intp)
+
+        nx = self.shape[0]
+        (ix0, iy0), (ix1, iy1) = self._cells(box_min), self._cells(box_max)
+        # 同じ行のセルはキーが連続するため、行ごとにスライスで取り出す
+        chunks = [
+            self._entries[self._offsets[iy * nx + ix0]:self._offsets[iy * nx + ix1 + 1]]
+            for iy in range(iy0, iy1 + 1)
+        ]
+        candidates = np.unique(np.concatenate(chunks + [self._large]))
+
+        mask = (np.all(self._maxs[candidates] >= box_min, axis=1)
+                & np.all(self._mins[candidates] <= box_max, axis=1))
+        if type_codes is not None:
+            mask &= np.isin(self._type_codes[candidates], type_codes)
+        return candidates[mask]
+
+    def _split(self, entries: np.ndarray, types: Optional[Iterable[str]]) -> Dict[str, np.ndarray]:
+        """登録番号をタイプごとのインデックスに分ける"""
+        names = self.types if types is None else [t for t in types if t in self.types]
+        codes = self._type_codes[entries]
+        return {
+            name: np.sort(self._ids[entries[codes == self.types.index(name)]])
+            for name in names
+        }
+
+    def query(
+        self,
+        box_min: Tuple[float, float],
+        box_max: Tuple[float, float],
+        types: Optional[Iterable[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        ウィンドウクエリ
+
+        Args:
+            box_min: ウィンドウの最小座標 (X, Y)
+            box_max: ウィンドウの最大座標 (X, Y)
+            types: 対象のエンティティタイプ（Noneの場合は全て）
+
+        Returns:
+            Dict[str, np.ndarray]: {エンティティタイプ: バウンディングボックスがウィンドウと重なるインデックス}
+        """
+        types = None if types is None else list(types)
+        return self._split(self._window(box_min, box_max, self._type_filter(types)), types)
+
+    def nearest(
+        self,
+        point: Tuple[float, float],
+        distance: Callable[[str, np.ndarray], np.ndarray],
+        types: Optional[Iterable[str]] = None
+    ) -> Optional[Tuple[str, int, float]]:
+        """
+        最近傍クエリ
+
+        点を中心とするウィンドウを倍々に広げ、ウィンドウの半幅以内で最も近いエンティティが
+        見つかった時点で終了する（それより近いエンティティはウィンドウと必ず重なるため）。
+
+        Args:
+            point: 点の座標 (X, Y)
+            distance: 距離関数 distance(エンティティタイプ, インデックス配列) -> 距離の配列
+            types: 対象のエンティティタイプ（Noneの場合は全て）
+
+        Returns:
+            Optional[Tuple[str, int, float]]: (エンティティタイプ, インデックス, 距離)。該当なしの場合はNone
+        """
+        types = None if types is None else list(types)
+        point = np.asarray(point, dtype=float)
+        grid_min, grid_max = self.origin, self.origin + self.extent
+        half = self.cell_size
+        while True:
+            best = None
+            for name, ids in self.query(point - half, point + half, types).items():
+                if not len(ids):
+                    continue
+                distances = distance(name, ids)
+                i = int(distances.argmin())
+                if best is None or distances[i] < best[2]:
+                    best = (name, int(ids[i]), float(distances[i]))
+
+            covers_grid = np.all(point - half <= grid_min) and np.all(point + half >= grid_max)
+            if (best is not None and best[2] <= half) or covers_grid or not len(self):
+                return best
+            half *= 2
@@ -4,45 +4,125 @@ SVGファイルパーサー
 
 xml.etree.ElementTreeを使用してSVGファイルから形状情報、投影データ、統計を抽出し、
 Claude Codeにフィードバック可能なテキストレポートを生成します。
+
+streaming=True の場合はiterparseでファイルを1回だけ走査し、要素数の集計と
+path/circle/rect/line/text要素の抽出を走査中に行います。処理済みの要素は木から
+取り除くため、文書の木全体をメモリに保持しません（数十MBの投影SVG向け）。
 """
 
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional
 from collections import Counter
 import re
 
+try:
+    from .analysis_result import REPORT_SAMPLE_SIZE, SVGAnalysis
+except ImportError:
+    # scripts/svg_parser.py として直接実行された場合
+    from analysis_result import REPORT_SAMPLE_SIZE, SVGAnalysis
+
+
+# SVG名前空間URI
+SVG_NAMESPACE = 'http://www.w3.org/2000/svg'
+
+
+def _path_record(path) -> Dict:
+    d = path.get('d', '')
+    return {
+        "d": d,
+        "id": path.get('id', ''),
+        "class": path.get('class', ''),
+        "command_count": len(re.findall(r'[MLHVCSQTAZ]', d, re.IGNORECASE))
+    }
+
+
+def _circle_record(circle) -> Dict:
+    cx = float(circle.get('cx', 0))
+    cy = float(circle.get('cy', 0))
+    r = float(circle.get('r', 0))
+    return {"cx": cx, "cy": cy, "r": r, "diameter": r * 2}
+
+
+def _rect_record(rect) -> Dict:
+    x = float(rect.get('x', 0))
+    y = float(rect.get('y', 0))
+    width = float(rect.get('width', 0))
+    height = float(rect.get('height', 0))
+    return {"x": x, "y": y, "width": width, "height": height}
+
+
+def _line_record(line) -> Dict:
+    x1 = float(line.get('x1', 0))
+    y1 = float(line.get('y1', 0))
+    x2 = float(line.get('x2', 0))
+    y2 = float(line.get('y2', 0))
+    length = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
+    return {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "length": length}
+
+
+def _text_record(text) -> Dict:
+    x = float(text.get('x', 0))
+    y = float(text.get('y', 0))
+    return {"text": text.text or '', "x": x, "y": y}
+
+
+# 抽出する形状要素のタグ → 要素から情報を取り出す関数
+SHAPE_RECORDS = {
+    "path": _path_record,
+    "circle": _circle_record,
+    "rect": _rect_record,
+    "line": _line_record,
+    "text": _text_record,
+}
+
 
 class SVGParser:
     """SVGファイル解析クラス"""
 
     # SVG名前空間
-    NS = {'svg': 'http://www.w3.org/2000/svg'}
+    NS = {'svg': SVG_NAMESPACE}
 
-    def __init__(self, svg_path: str):
+    def __init__(self, svg_path: str, streaming: bool = False):
         """
         Args:
             svg_path: SVGファイルのパス
+            streaming: 木を構築せずにiterparseで1回だけ走査する（大きなファイル向け）。
+                tree は使えず、root は子要素を持たないルート要素のコピーになる
         """
         self.svg_path = Path(svg_path)
+        self.streaming = streaming
         self.tree = None
         self.root = None
         self.element_types = Counter()
         self.viewbox = None
         self.width = None
         self.height = None
+        # ストリーミングモードで抽出した形状要素 {タグ: [get_*()の要素情報, ...]}
+        self.shapes = None
 
     def load(self) -> bool:
         """
         SVGファイルを読み込み
 
+        ストリーミングモードではルート要素（viewBox・幅・高さ）のみを読む。
+
         Returns:
             bool: 成功時True
         """
         try:
-            self.tree = ET.parse(str(self.svg_path))
-            self.root = self.tree.getroot()
-            print(f"[SUCCESS] SVG loaded: {self.svg_path}")
+            if self.streaming:
+                with open(self.svg_path, 'rb') as f:
+                    for _, elem in ET.iterparse(f, events=("start",)):
+                        self.root = ET.Element(elem.tag, dict(elem.attrib))
+                        break
+                if self.root is None:
+                    raise ValueError("No root element")
+                print(f"[SUCCESS] SVG opened for streaming: {self.svg_path}")
+            else:
+                self.tree = ET.parse(str(self.svg_path))
+                self.root = self.tree.getroot()
+                print(f"[SUCCESS] SVG loaded: {self.svg_path}")
             return True
         except Exception as e:
             print(f"[FAILED] SVG load failed: {e}")
@@ -60,8 +140,11 @@ class SVGParser:
         # 幅と高さを取得
         self._parse_dimensions()
 
-        # 全要素をカウント
-        self._count_elements()
+        # 全要素をカウント（ストリーミングモードでは形状要素の抽出も同じ走査で行う）
+        if self.streaming:
+            self._stream_elements()
+        else:
+            self._count_elements()
 
     def _parse_viewbox(self):
         """viewBox属性を解析"""
@@ -100,6 +183,56 @@ class SVGParser:
             tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
             self.element_types[tag] += 1
 
+    def _stream_elements(self):
+        """
+        iterparseで1回だけ走査し、要素数の集計と形状要素の抽出を行う
+
+        各要素は終了タグの時点で処理し、親要素から取り除く（終了した要素は常に親の最後の子）。
+        """
+        self.element_types = Counter()
+        # {タグ: (SVG名前空間の要素, 名前空間なしの要素)}
+        found = {tag: ([], []) for tag in SHAPE_RECORDS}
+        targets = {}
+        for tag in SHAPE_RECORDS:
+            targets[f"{{{SVG_NAMESPACE}}}{tag}"] = (tag, 0)
+            targets[tag] = (tag, 1)
+
+        parents = []
+        with open(self.svg_path, 'rb') as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    parents.append(elem)
+                    continue
+                parents.pop()
+
+                tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
+                self.element_types[tag] += 1
+                target = targets.get(elem.tag)
+                if target is not None:
+                    shape, plain = target
+                    found[shape][plain].append(SHAPE_RECORDS[shape](elem))
+
+                elem.clear()
+                if parents:
+                    del parents[-1][-1]
+
+        # 通常モードと同じく、SVG名前空間の要素がない場合のみ名前空間なしの要素を使う
+        self.shapes = {tag: namespaced or plain for tag, (namespaced, plain) in found.items()}
+
+    def _find_records(self, tag: str) -> List[Dict]:
+        """形状要素の情報を抽出（SVG名前空間の要素がなければ名前空間なしでも検索）"""
+        if self.streaming:
+            if self.shapes is None:
+                self.analyze()
+            return list((self.shapes or {}).get(tag, []))
+
+        build = SHAPE_RECORDS[tag]
+        records = [build(elem) for elem in self.root.findall(f'.//svg:{tag}', self.NS)]
+        # 名前空間なしでも検索（互換性のため）
+        if not records:
+            records = [build(elem) for elem in self.root.findall(f'.//{tag}')]
+        return records
+
     def get_paths(self) -> List[Dict]:
         """
         path要素を抽出
@@ -107,32 +240,7 @@ class SVGParser:
         Returns:
             List[Dict]: path情報のリスト [{d, id, class}, ...]
         """
-        paths = []
-        for path in self.root.findall('.//svg:path', self.NS):
-            d = path.get('d', '')
-            path_id = path.get('id', '')
-            path_class = path.get('class', '')
-            paths.append({
-                "d": d,
-                "id": path_id,
-                "class": path_class,
-                "command_count": len(re.findall(r'[MLHVCSQTAZ]', d, re.IGNORECASE))
-            })
-
-        # 名前空間なしでも検索（互換性のため）
-        if not paths:
-            for path in self.root.findall('.//path'):
-                d = path.get('d', '')
-                path_id = path.get('id', '')
-                path_class = path.get('class', '')
-                paths.append({
-                    "d": d,
-                    "id": path_id,
-                    "class": path_class,
-                    "command_count": len(re.findall(r'[MLHVCSQTAZ]', d, re.IGNORECASE))
-                })
-
-        return paths
+        return self._find_records("path")
 
     def get_circles(self) -> List[Dict]:
         """
@@ -141,22 +249,7 @@ class SVGParser:
         Returns:
             List[Dict]: 円情報のリスト [{cx, cy, r}, ...]
         """
-        circles = []
-        for circle in self.root.findall('.//svg:circle', self.NS):
-            cx = float(circle.get('cx', 0))
-            cy = float(circle.get('cy', 0))
-            r = float(circle.get('r', 0))
-            circles.append({"cx": cx, "cy": cy, "r": r, "diameter": r * 2})
-
-        # 名前空間なしでも検索
-        if not circles:
-            for circle in self.root.findall('.//circle'):
-                cx = float(circle.get('cx', 0))
-                cy = float(circle.get('cy', 0))
-                r = float(circle.get('r', 0))
-                circles.append({"cx": cx, "cy": cy, "r": r, "diameter": r * 2})
-
-        return circles
+        return self._find_records("circle")
 
     def get_rects(self) -> List[Dict]:
         """
@@ -165,24 +258,7 @@ class SVGParser:
         Returns:
             List[Dict]: 矩形情報のリスト [{x, y, width, height}, ...]
         """
-        rects = []
-        for rect in self.root.findall('.//svg:rect', self.NS):
-            x = float(rect.get('x', 0))
-            y = float(rect.get('y', 0))
-            width = float(rect.get('width', 0))
-            height = float(rect.get('height', 0))
-            rects.append({"x": x, "y": y, "width": width, "height": height})
-
-        # 名前空間なしでも検索
-        if not rects:
-            for rect in self.root.findall('.//rect'):
-                x = float(rect.get('x', 0))
-                y = float(rect.get('y', 0))
-                width = float(rect.get('width', 0))
-                height = float(rect.get('height', 0))
-                rects.append({"x": x, "y": y, "width": width, "height": height})
-
-        return rects
+        return self._find_records("rect")
 
     def get_lines(self) -> List[Dict]:
         """
@@ -191,30 +267,7 @@ class SVGParser:
         Returns:
             List[Dict]: 線分情報のリスト [{x1, y1, x2, y2, length}, ...]
         """
-        lines = []
-        for line in self.root.findall('.//svg:line', self.NS):
-            x1 = float(line.get('x1', 0))
-            y1 = float(line.get('y1', 0))
-            x2 = float(line.get('x2', 0))
-            y2 = float(line.get('y2', 0))
-            length = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-            lines.append({
-                "x1": x1, "y1": y1, "x2": x2, "y2": y2, "length": length
-            })
-
-        # 名前空間なしでも検索
-        if not lines:
-            for line in self.root.findall('.//line'):
-                x1 = float(line.get('x1', 0))
-                y1 = float(line.get('y1', 0))
-                x2 = float(line.get('x2', 0))
-                y2 = float(line.get('y2', 0))
-                length = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-                lines.append({
-                    "x1": x1, "y1": y1, "x2": x2, "y2": y2, "length": length
-                })
-
-        return lines
+        return self._find_records("line")
 
     def get_texts(self) -> List[Dict]:
         """
@@ -223,26 +276,34 @@ class SVGParser:
         Returns:
             List[Dict]: テキスト情報のリスト [{text, x, y}, ...]
         """
-        texts = []
-        for text in self.root.findall('.//svg:text', self.NS):
-            x = float(text.get('x', 0))
-            y = float(text.get('y', 0))
-            content = text.text or ''
-            texts.append({"text": content, "x": x, "y": y})
-
-        # 名前空間なしでも検索
-        if not texts:
-            for text in self.root.findall('.//text'):
-                x = float(text.get('x', 0))
-                y = float(text.get('y', 0))
-                content = text.text or ''
-                texts.append({"text": content, "x": x, "y": y})
-
-        return texts
+        return self._find_records("text")
+
+    def get_result(self) -> SVGAnalysis:
+        """
+        解析結果を構造化データとして取得
+
+        Returns:
+            SVGAnalysis: viewBox・要素統計・全てのcircle要素・形状要素ごとの先頭 REPORT_SAMPLE_SIZE 個
+        """
+        shapes = {tag: self._find_records(tag) for tag in SHAPE_RECORDS}
+        samples = {tag: records[:REPORT_SAMPLE_SIZE] for tag, records in shapes.items() if records}
+        if "path" in samples:
+            samples["path"] = [{k: v for k, v in path.items() if k != "d"} for path in samples["path"]]
+        return SVGAnalysis(
+            path=str(self.svg_path),
+            file_size=self.svg_path.stat().st_size,
+            width=self.width,
+            height=self.height,
+            viewbox=self.viewbox,
+            element_types=dict(self.element_types),
+            shape_counts={tag: len(records) for tag, records in shapes.items()},
+            circles=shapes["circle"],
+            samples=samples,
+        )
 
     def generate_report(self, output_path: Optional[str] = None) -> str:
         """
-        解析結果レポートを生成
+        解析結果レポートを生成（get_result()の結果を描画）
 
         Args:
             output_path: レポート出力先パス（Noneの場合は標準出力のみ）
@@ -250,113 +311,25 @@ class SVGParser:
         Returns:
             str: レポートテキスト
         """
-        lines = []
-        lines.append("=" * 80)
-        lines.append(f"SVG解析レポート: {self.svg_path.name}")
-        lines.append("=" * 80)
-        lines.append("")
-
-        # ファイル情報
-        lines.append("## ファイル情報")
-        file_size = self.svg_path.stat().st_size / 1024
-        lines.append(f"- ファイルパス: {self.svg_path}")
-        lines.append(f"- ファイルサイズ: {file_size:.1f} KB")
-        if self.width and self.height:
-            lines.append(f"- 幅 x 高さ: {self.width} x {self.height}")
-        lines.append("")
-
-        # viewBox情報
-        if self.viewbox:
-            lines.append("## viewBox情報")
-            lines.append(f"- 最小座標 (X, Y): ({self.viewbox['min_x']:.2f}, {self.viewbox['min_y']:.2f})")
-            lines.append(f"- 幅 x 高さ: {self.viewbox['width']:.2f} x {self.viewbox['height']:.2f}")
-            lines.append("")
-
-        # 要素統計
-        lines.append("## 要素統計")
-        lines.append(f"- 総要素数: {sum(self.element_types.values())}")
-        for elem_type, count in sorted(self.element_types.items()):
-            if count > 0:
-                lines.append(f"  - {elem_type}: {count}")
-        lines.append("")
-
-        # 詳細要素情報
-        lines.append("## 詳細要素情報")
-
-        # path要素
-        path_elements = self.get_paths()
-        if path_elements:
-            lines.append(f"\n### path要素: {len(path_elements)} 個")
-            for i, path in enumerate(path_elements[:5], 1):
-                id_str = f", id='{path['id']}'" if path['id'] else ""
-                lines.append(f"  {i}. コマンド数 {path['command_count']}{id_str}")
-            if len(path_elements) > 5:
-                lines.append(f"  ... 他 {len(path_elements) - 5} 個")
-
-        # circle要素
-        circle_elements = self.get_circles()
-        if circle_elements:
-            lines.append(f"\n### circle要素: {len(circle_elements)} 個")
-            for i, circle in enumerate(circle_elements[:5], 1):
-                lines.append(f"  {i}. 中心 ({circle['cx']:.2f}, {circle['cy']:.2f}), 半径 {circle['r']:.2f}, 直径 {circle['diameter']:.2f}")
-            if len(circle_elements) > 5:
-                lines.append(f"  ... 他 {len(circle_elements) - 5} 個")
-
-        # rect要素
-        rect_elements = self.get_rects()
-        if rect_elements:
-            lines.append(f"\n### rect要素: {len(rect_elements)} 個")
-            for i, rect in enumerate(rect_elements[:5], 1):
-                lines.append(f"  {i}. 位置 ({rect['x']:.2f}, {rect['y']:.2f}), サイズ {rect['width']:.2f} x {rect['height']:.2f}")
-            if len(rect_elements) > 5:
-                lines.append(f"  ... 他 {len(rect_elements) - 5} 個")
-
-        # line要素
-        line_elements = self.get_lines()
-        if line_elements:
-            lines.append(f"\n### line要素: {len(line_elements)} 個")
-            for i, line in enumerate(line_elements[:5], 1):
-                lines.append(f"  {i}. ({line['x1']:.2f}, {line['y1']:.2f}) → ({line['x2']:.2f}, {line['y2']:.2f}), 長さ {line['length']:.2f}")
-            if len(line_elements) > 5:
-                lines.append(f"  ... 他 {len(line_elements) - 5} 個")
-
-        # text要素
-        text_elements = self.get_texts()
-        if text_elements:
-            lines.append(f"\n### text要素: {len(text_elements)} 個")
-            for i, text in enumerate(text_elements[:5], 1):
-                lines.append(f"  {i}. 位置 ({text['x']:.2f}, {text['y']:.2f}), テキスト '{text['text']}'")
-            if len(text_elements) > 5:
-                lines.append(f"  ... 他 {len(text_elements) - 5} 個")
-
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("[完了] SVG解析完了")
-        lines.append("=" * 80)
-
-        report = "\n".join(lines)
-
-        # ファイルに保存
+        result = self.get_result()
         if output_path:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(report)
-            print(f"[SUCCESS] レポート保存: {output_path}")
-
-        return report
+            return result.save_report(output_path)
+        return result.to_report()
 
 
-def parse_svg(svg_path: str, report_path: Optional[str] = None) -> SVGParser:
+def parse_svg(svg_path: str, report_path: Optional[str] = None, streaming: bool = False) -> SVGParser:
     """
     SVGファイルを解析してレポートを生成
 
     Args:
         svg_path: SVGファイルのパス
         report_path: レポート出力先パス（Noneの場合は保存しない）
+        streaming: 木を構築せずに1回の走査で解析する（大きなファイル向け）
 
     Returns:
         SVGParser: 解析済みパーサーインスタンス
     """
-    parser = SVGParser(svg_path)
+    parser = SVGParser(svg_path, streaming=streaming)
 
     if not parser.load():
         return None
@@ -371,11 +344,12 @@ def parse_svg(svg_path: str, report_path: Optional[str] = None) -> SVGParser:
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) < 2:
-        print("Usage: python3 svg_parser.py <svg_file> [output_report.txt]")
+    args = [arg for arg in sys.argv[1:] if arg != "--streaming"]
+    if not args:
+        print("Usage: python3 svg_parser.py [--streaming] <svg_file> [output_report.txt]")
         sys.exit(1)
 
-    svg_file = sys.argv[1]
-    report_file = sys.argv[2] if len(sys.argv) > 2 else None
+    svg_file = args[0]
+    report_file = args[1] if len(args) > 1 else None
 
-    parse_svg(svg_file, report_file)
+    parse_svg(svg_file, report_file, streaming="--streaming" in sys.argv)
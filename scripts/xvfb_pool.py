@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Xvfbディスプレイプール
+
+複数のXvfbサーバーを一度だけ起動し、レンダラーインスタンス間・プロセス間で
+リース/リリース方式で使い回すためのモジュール。
+
+- 起動確認は固定sleepではなく、X11ソケットへの接続プローブで行う
+- ディスプレイの貸し出しはロックファイル(flock)で排他するため、別プロセスからも共有可能
+- 一定時間使われなかったサーバーはアイドルタイムアウトで停止する
+  （プール作成時とlease()時に、最終使用から idle_timeout を超えたサーバーを停止する）
+- プロセスが起動したサーバーはプロセス終了時に停止する（xvfb_pool.py start で起動したものを除く）
+"""
+
+import atexit
+import fcntl
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Xサーバーが作成するUnixドメインソケットのディレクトリ
+X11_SOCKET_DIR = Path("/tmp/.X11-unix")
+
+
+def xvfb_command(display: int, screen: str = "1920x1080x24") -> List[str]:
+    """
+    Xvfb起動コマンドを構築
+
+    Args:
+        display: ディスプレイ番号
+        screen: スクリーン設定（WxHxDepth）
+
+    Returns:
+        List[str]: コマンドライン
+    """
+    return [
+        "Xvfb",
+        f":{display}",
+        "-screen", "0", screen,
+        "-ac",
+        "+extension", "GLX",
+        "+render",
+        "-noreset"
+    ]
+
+
+def is_display_ready(display: int) -> bool:
+    """
+    Xサーバーが接続を受け付けるか確認
+
+    Args:
+        display: ディスプレイ番号
+
+    Returns:
+        bool: 接続可能ならTrue
+    """
+    socket_path = X11_SOCKET_DIR / f"X{display}"
+    if not socket_path.exists():
+        return False
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(0.5)
+    try:
+        sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def wait_for_display(
+    display: int,
+    timeout: float = 10.0,
+    process: Optional[subprocess.Popen] = None,
+    interval: float = 0.02
+) -> bool:
+    """
+    Xサーバーの起動完了を待機（固定sleepの代わりに接続をプローブ）
+
+    Args:
+        display: ディスプレイ番号
+        timeout: 最大待機時間（秒）
+        process: 起動したXvfbプロセス（異常終了を検出するため）
+        interval: プローブ間隔（秒）
+
+    Returns:
+        bool: 起動確認できた場合True
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if is_display_ready(display):
+            return True
+        if process is not None and process.poll() is not None:
+            return False
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+class XvfbDisplayPool:
+    """
+    再利用可能なXvfbディスプレイプール
+
+    Usage:
+        pool = XvfbDisplayPool(size=4)
+        with pool.display() as display:
+            ...  # DISPLAY=:{display} でOpenSCADを実行
+
+        with OpenSCADRenderer(pool=pool) as renderer:
+            renderer.render("model.scad", "output.png")
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        base_display: int = 99,
+        idle_timeout: Optional[float] = 300.0,
+        screen: str = "1920x1080x24",
+        state_dir: Optional[str] = None,
+        ready_timeout: float = 10.0,
+        shutdown_on_exit: bool = True
+    ):
+        """
+        Args:
+            size: プールするディスプレイ数
+            base_display: 先頭のディスプレイ番号（base_display〜base_display+size-1を使用）
+            idle_timeout: 未使用のサーバーを停止するまでの秒数（Noneなら自動停止しない）
+            screen: Xvfbのスクリーン設定
+            state_dir: ロックファイル・PIDファイルの保存先（プロセス間で共有）
+            ready_timeout: Xvfb起動確認の最大待機時間（秒）
+            shutdown_on_exit: プロセス終了時に、このプールが起動したXvfbを停止する
+                （Falseの場合は次にプールを使うプロセスがアイドルタイムアウトで停止する）
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+
+        self.displays = list(range(base_display, base_display + size))
+        self.idle_timeout = idle_timeout
+        self.screen = screen
+        self.ready_timeout = ready_timeout
+        self.state_dir = Path(
+            state_dir
+            or os.environ.get("OPENSCAD_XVFB_POOL_DIR")
+            or f"/tmp/openscad-xvfb-pool-{os.getuid()}"
+        )
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._leases: Dict[int, int] = {}  # display -> ロックファイルのfd
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self._idle_timer: Optional[threading.Timer] = None
+
+        if shutdown_on_exit:
+            atexit.register(self.close)
+        # 以前のプロセスが残したアイドルなサーバーを停止
+        self.reap_idle()
+
+    def _lock_path(self, display: int) -> Path:
+        return self.state_dir / f"display-{display}.lock"
+
+    def _pid_path(self, display: int) -> Path:
+        return self.state_dir / f"display-{display}.pid"
+
+    def _try_lock(self, display: int) -> Optional[int]:
+        """ディスプレイのロックを非ブロッキングで取得（取得できなければNone）"""
+        fd = os.open(self._lock_path(display), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    @staticmethod
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _ensure_server(self, display: int):
+        """ディスプレイのXvfbが起動していなければ起動"""
+        if is_display_ready(display):
+            return
+
+        print(f"Starting pooled Xvfb on display :{display}...")
+        # プロセス終了後も他のプロセスから再利用できるよう、別セッションで起動
+        process = subprocess.Popen(
+            xvfb_command(display, self.screen),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        if not wait_for_display(display, self.ready_timeout, process):
+            process.kill()
+            process.wait()
+            raise RuntimeError(f"Xvfb failed to start on display :{display}")
+
+        self._processes[display] = process
+        self._pid_path(display).write_text(str(process.pid))
+        # 起動時刻を最終使用時刻とする（古いロックファイルのmtimeで即座に停止されないように）
+        os.utime(self._lock_path(display))
+        print(f"[SUCCESS] Pooled Xvfb ready on display :{display}")
+
+    def lease(self, timeout: Optional[float] = None) -> int:
+        """
+        空いているディスプレイを貸し出す（必要ならXvfbを起動）
+
+        Args:
+            timeout: 空きを待つ最大時間（秒、Noneなら無期限）
+
+        Returns:
+            int: ディスプレイ番号
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.reap_idle()
+
+        while True:
+            with self._lock:
+                for display in self.displays:
+                    if display in self._leases:
+                        continue
+                    fd = self._try_lock(display)
+                    if fd is None:
+                        continue
+                    try:
+                        self._ensure_server(display)
+                    except BaseException:
+                        self._unlock(fd)
+                        raise
+                    self._leases[display] = fd
+                    self._cancel_idle_timer()
+                    return display
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("No Xvfb display available in pool")
+            time.sleep(0.05)
+
+    def release(self, display: int):
+        """
+        貸し出したディスプレイを返却
+
+        Args:
+            display: lease()で取得したディスプレイ番号
+        """
+        with self._lock:
+            fd = self._leases.pop(display, None)
+            if fd is None:
+                return
+            # ロックファイルのmtimeを最終使用時刻として記録
+            os.utime(self._lock_path(display))
+            self._unlock(fd)
+
+            if not self._leases:
+                self._schedule_idle_timer()
+
+    @contextmanager
+    def display(self, timeout: Optional[float] = None):
+        """
+        ディスプレイを貸し出すコンテキストマネージャー
+
+        Args:
+            timeout: 空きを待つ最大時間（秒）
+
+        Yields:
+            int: ディスプレイ番号
+        """
+        display = self.lease(timeout)
+        try:
+            yield display
+        finally:
+            self.release(display)
+
+    def _schedule_idle_timer(self):
+        if self.idle_timeout is None:
+            return
+        self._cancel_idle_timer()
+        self._idle_timer = threading.Timer(self.idle_timeout, self.reap_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _stop_server(self, display: int):
+        """ディスプレイのXvfbを停止（他プロセスが起動したものも含む）"""
+        process = self._processes.pop(display, None)
+        pid_path = self._pid_path(display)
+
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        elif pid_path.exists():
+            try:
+                pid = int(pid_path.read_text().strip())
+                # PID再利用による誤killを避けるため、Xvfbであることを確認
+                cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+                if b"Xvfb" in cmdline:
+                    os.kill(pid, signal.SIGTERM)
+            except (ValueError, OSError):
+                pass
+
+        pid_path.unlink(missing_ok=True)
+        print(f"[SUCCESS] Pooled Xvfb on display :{display} stopped")
+
+    def reap_idle(self):
+        """アイドルタイムアウトを超えて未使用のXvfbを停止"""
+        if self.idle_timeout is None:
+            return
+        self._reap(max_idle=self.idle_timeout)
+
+    def shutdown(self):
+        """貸し出し中でない全てのXvfbを停止"""
+        self._cancel_idle_timer()
+        self._reap(max_idle=0.0)
+
+    def close(self):
+        """このプールが起動したXvfbを停止（他プロセスが貸し出し中のものを除く）"""
+        self._cancel_idle_timer()
+        with self._lock:
+            for display in list(self._leases):
+                self._unlock(self._leases.pop(display))
+        self._reap(max_idle=0.0, own_only=True)
+
+    def _reap(self, max_idle: float, own_only: bool = False):
+        with self._lock:
+            now = time.time()
+            for display in self.displays:
+                if display in self._leases:
+                    continue
+                if own_only and display not in self._processes:
+                    continue
+                fd = self._try_lock(display)
+                if fd is None:
+                    # 他のプロセスが使用中
+                    continue
+                try:
+                    idle = now - self._lock_path(display).stat().st_mtime
+                    running = display in self._processes or self._pid_path(display).exists()
+                    if running and idle >= max_idle:
+                        self._stop_server(display)
+                finally:
+                    self._unlock(fd)
+
+
+_default_pool: Optional[XvfbDisplayPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool(**kwargs) -> XvfbDisplayPool:
+    """
+    プロセス内で共有されるデフォルトのディスプレイプールを取得
+
+    初回呼び出し時の引数でプールを作成し、以降は同じインスタンスを返す。
+
+    Args:
+        **kwargs: XvfbDisplayPoolのコンストラクタ引数
+
+    Returns:
+        XvfbDisplayPool: 共有プール
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = XvfbDisplayPool(**kwargs)
+        return _default_pool
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Manage the persistent Xvfb display pool"
+    )
+    parser.add_argument(
+        "action",
+        choices=["start", "reap", "shutdown"],
+        help="start: start all servers, reap: stop idle servers, shutdown: stop all servers"
+    )
+    parser.add_argument("--size", type=int, default=1, help="Pool size (default: 1)")
+    parser.add_argument("--display", type=int, default=99, help="Base display number (default: 99)")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=300.0,
+        help="Idle timeout in seconds (default: 300)"
+    )
+
+    args = parser.parse_args()
+
+    pool = XvfbDisplayPool(
+        size=args.size,
+        base_display=args.display,
+        idle_timeout=args.idle_timeout,
+        # start で起動したサーバーはこのプロセスの終了後も残す
+        shutdown_on_exit=args.action != "start"
+    )
+
+    if args.action == "start":
+        leased = [pool.lease() for _ in pool.displays]
+        for display in leased:
+            pool.release(display)
+        pool._cancel_idle_timer()
+    elif args.action == "reap":
+        pool.reap_idle()
+    else:
+        pool.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
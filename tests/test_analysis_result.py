@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+解析結果の構造化データのテスト
+
+テキストレポートが構造化データの描画と一致すること、
+JSON / MessagePack / Arrow を経由しても同じ結果・レポートに戻ることを検証します。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import ezdxf
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.analysis_result import (
+    DXFAnalysis, SVGAnalysis, load_results, result_from_dict, results_to_arrow, save_results
+)
+from scripts.dxf_parser import DXFParser
+from scripts.svg_parser import SVGParser
+
+
+@pytest.fixture
+def dxf_result(tmp_path):
+    """外形と穴2個・多数の線分を含むDXFの解析結果"""
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    corners = [(0, 0), (40, 0), (40, 30), (0, 30)]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        msp.add_line(start, end)
+    for i in range(6):
+        msp.add_line((50 + i, 0), (50 + i, 5))
+    msp.add_circle((10, 10), 2)
+    msp.add_circle((30, 10), 3)
+    path = tmp_path / "plate.dxf"
+    doc.saveas(path)
+
+    parser = DXFParser(str(path), contours=True)
+    assert parser.load()
+    parser.analyze()
+    return parser, parser.get_result()
+
+
+@pytest.fixture
+def svg_result(tmp_path):
+    path = tmp_path / "top.svg"
+    path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100mm" height="50mm" viewBox="0 0 100 50">'
+        '<circle cx="10" cy="20" r="3"/><path id="p1" d="M 0 0 L 10 10 Z"/>'
+        '<line x1="0" y1="0" x2="3" y2="4"/><text x="1" y="2">A</text></svg>'
+    )
+    parser = SVGParser(str(path))
+    assert parser.load()
+    parser.analyze()
+    return parser, parser.get_result()
+
+
+def test_dxf_result_fields_and_report(dxf_result):
+    """DXFの解析結果は集計値と先頭のエンティティを持ち、レポートはその描画"""
+    parser, result = dxf_result
+
+    assert isinstance(result, DXFAnalysis)
+    assert result.entity_types == {"LINE": 10, "CIRCLE": 2}
+    assert [circle["diameter"] for circle in result.circles] == [4, 6]
+    assert len(result.samples["LINE"]) == 5
+    assert result.contours["holes"] == 2
+    assert result.contours["samples"][0]["hole_count"] == 2
+    assert result.to_report() == parser.generate_report()
+    assert "... 他 5 個" in result.to_report()
+
+
+def test_svg_result_fields_and_report(svg_result):
+    """SVGの解析結果はpathのdを含まず、レポートはその描画"""
+    parser, result = svg_result
+
+    assert isinstance(result, SVGAnalysis)
+    assert result.width == 100 and result.viewbox["height"] == 50
+    assert result.shape_counts == {"path": 1, "circle": 1, "rect": 0, "line": 1, "text": 1}
+    assert result.samples["path"] == [{"id": "p1", "class": "", "command_count": 3}]
+    assert "rect" not in result.samples
+    assert result.to_report() == parser.generate_report()
+
+
+def test_json_and_msgpack_round_trip(dxf_result, svg_result, tmp_path):
+    """JSON / MessagePack から復元した結果は同じレポートを描画する"""
+    results = [dxf_result[1], svg_result[1]]
+    for result in results:
+        restored = result_from_dict(json.loads(result.to_json()))
+        assert restored.to_report() == result.to_report()
+
+    msgpack = pytest.importorskip("msgpack")
+    for result in results:
+        restored = result_from_dict(msgpack.unpackb(result.to_msgpack()))
+        assert restored.to_report() == result.to_report()
+
+    for suffix in (".json", ".msgpack"):
+        path = tmp_path / f"results{suffix}"
+        save_results(results, str(path))
+        assert [r.to_report() for r in load_results(str(path))] == [r.to_report() for r in results]
+
+    with pytest.raises(ValueError):
+        result_from_dict({"kind": "stl"})
+
+
+def test_arrow_table(dxf_result, svg_result, tmp_path):
+    """Arrowの表は1ファイル1行で集計用の列を持ち、data列から復元できる"""
+    pytest.importorskip("pyarrow")
+    results = [dxf_result[1], svg_result[1]]
+
+    table = results_to_arrow(results)
+    assert table.num_rows == 2
+    assert table.column("kind").to_pylist() == ["dxf", "svg"]
+    assert table.column("circle_count").to_pylist() == [2, 1]
+    assert table.column("hole_count").to_pylist() == [2, None]
+    assert table.column("bbox_max_x").to_pylist() == [pytest.approx(55), 100]
+    assert dict(table.column("entity_types")[0].as_py()) == {"CIRCLE": 2, "LINE": 10}
+
+    path = tmp_path / "results.arrow"
+    save_results(results, str(path))
+    assert [r.to_report() for r in load_results(str(path))] == [r.to_report() for r in results]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+非同期レンダラーのテスト
+
+OpenSCADの代わりにstderrへ進捗を出して待機するだけの偽 `openscad` をPATHに置き、
+正常終了・タイムアウト・タスクのキャンセル・on_progressの例外のいずれでも
+子プロセスが残らない（killされて回収される）ことを検証します。
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.async_renderer import AsyncOpenSCADRenderer
+
+
+# 偽のOpenSCAD: PIDを記録して進捗を出し、FAKE_OPENSCAD_SLEEP秒待ってから出力ファイルを書く
+FAKE_OPENSCAD = textwrap.dedent(f'''\
+    #!{sys.executable}
+    import os, sys, time
+    with open(os.environ["FAKE_OPENSCAD_PID_FILE"], "w") as f:
+        f.write(str(os.getpid()))
+    print("Parsing design (AST generation)...", file=sys.stderr, flush=True)
+    time.sleep(float(os.environ.get("FAKE_OPENSCAD_SLEEP", "0")))
+    print("Total rendering time: 0:00:00.010", file=sys.stderr, flush=True)
+    with open(sys.argv[sys.argv.index("-o") + 1], "wb") as f:
+        f.write(b"PNG")
+''')
+
+
+@pytest.fixture
+def fake_openscad(tmp_path, monkeypatch):
+    """偽のopenscadをPATHの先頭に置き、PIDの記録先を返す"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "openscad"
+    script.write_text(FAKE_OPENSCAD)
+    script.chmod(0o755)
+    pid_file = tmp_path / "openscad.pid"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_OPENSCAD_PID_FILE", str(pid_file))
+    return pid_file
+
+
+def _assert_reaped(pid_file):
+    """偽のopenscadが終了し、ゾンビとしても残っていない"""
+    pid = int(pid_file.read_text())
+    assert not Path(f"/proc/{pid}").exists()
+
+
+async def _render(tmp_path, **kwargs):
+    async with AsyncOpenSCADRenderer(backend="software") as renderer:
+        return await renderer.render(
+            str(tmp_path / "model.scad"), str(tmp_path / "model.png"), **kwargs
+        )
+
+
+def test_render_success_reports_progress(tmp_path, fake_openscad):
+    """stderrを1行ずつコールバックに渡し、成功した結果を返す"""
+    lines = []
+    result = asyncio.run(_render(tmp_path, on_progress=lines.append))
+
+    assert result.success and result.output_bytes == 3
+    assert lines == ["Parsing design (AST generation)...", "Total rendering time: 0:00:00.010"]
+    _assert_reaped(fake_openscad)
+
+
+def test_timeout_kills_process(tmp_path, fake_openscad, monkeypatch):
+    """タイムアウトしたプロセスはkillされ、失敗として返る"""
+    monkeypatch.setenv("FAKE_OPENSCAD_SLEEP", "60")
+    result = asyncio.run(_render(tmp_path, timeout=1))
+
+    assert not result.success
+    assert result.error == "Timed out after 1s"
+    _assert_reaped(fake_openscad)
+
+
+def test_cancel_kills_process(tmp_path, fake_openscad, monkeypatch):
+    """タスクがキャンセルされるとプロセスをkillしてからCancelledErrorを伝える"""
+    monkeypatch.setenv("FAKE_OPENSCAD_SLEEP", "60")
+
+    async def cancel_after_start():
+        started = asyncio.Event()
+        task = asyncio.create_task(_render(tmp_path, on_progress=lambda line: started.set()))
+        await started.wait()
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_after_start())
+    _assert_reaped(fake_openscad)
+
+
+def test_raising_callback_kills_process(tmp_path, fake_openscad, monkeypatch):
+    """on_progressが例外を送出した場合もプロセスをkillしてから例外を伝える"""
+    monkeypatch.setenv("FAKE_OPENSCAD_SLEEP", "60")
+
+    def on_progress(line):
+        raise RuntimeError("callback failed")
+
+    with pytest.raises(RuntimeError, match="callback failed"):
+        asyncio.run(_render(tmp_path, on_progress=on_progress))
+    _assert_reaped(fake_openscad)
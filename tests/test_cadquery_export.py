@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+CadQueryエクスポートパイプラインのテスト
+
+BRepシリアライズによるワーカーへの受け渡しと、
+並行エクスポートが逐次エクスポートと同じファイルを生成すること、
+複数高さの断面エクスポートがexport_dxf()と同じ断面を生成すること、
+三角形分割の許容差指定・適応モード（許容差の記録がないShapeの再分割を含む）、
+STLのバイナリ/ASCII出力を検証します。
+"""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import cadquery as cq
+import ezdxf
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import cadquery_utils
+from scripts.cadquery_utils import (
+    _deserialize_model, _serialize_model, export_3mf, export_all_formats, export_dxf,
+    export_section_stack, export_stl, mesh_statistics, tessellate_model
+)
+from scripts.dxf_parser import parse_dxf
+from scripts.export_cache import worker_context
+from scripts.mesh_preview import load_stl
+
+
+def _model():
+    return cq.Workplane("XY").box(20, 10, 5).faces(">Z").workplane().hole(3)
+
+
+def test_brep_round_trip_keeps_objects():
+    """シリアライズ前後でWorkplaneのオブジェクト列と体積が保たれる"""
+    sketch = cq.Workplane("XY").rect(40, 30).rect(20, 10, forConstruction=True).vertices().circle(2)
+    restored = _deserialize_model(_serialize_model(sketch))
+    assert len(restored.vals()) == len(sketch.vals())
+
+    model = _model()
+    restored = _deserialize_model(_serialize_model(model))
+    assert abs(restored.val().Volume() - model.val().Volume()) < 1e-6
+
+
+def test_parallel_export_matches_serial(tmp_path, capsys):
+    """プロセスプールでの書き出しと逐次書き出しが同じ結果になり、ワーカーのログも呼び出し元に出る"""
+    formats = ("step", "stl", "3mf", "dxf", "svg")
+    serial = export_all_formats(_model(), "serial", str(tmp_path), formats=formats, workers=1)
+    capsys.readouterr()
+    parallel = export_all_formats(_model(), "parallel", str(tmp_path), formats=formats, workers=3)
+
+    assert f"[SUCCESS] STEP export: {parallel['step']}" in capsys.readouterr().out
+    assert sorted(serial) == sorted(parallel) == sorted(formats)
+    # ワーカーはOCPのスレッドごとforkせずに起動する
+    assert worker_context().get_start_method() in ("forkserver", "spawn")
+    assert Path(serial["stl"]).read_bytes() == Path(parallel["stl"]).read_bytes()
+    assert Path(serial["dxf"]).stat().st_size > 0
+    assert Path(parallel["svg"]).stat().st_size > 0
+
+
+def test_export_is_sequential_by_default(tmp_path, monkeypatch):
+    """workersを指定しなければプロセスプールを起動しない"""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(cadquery_utils, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(cadquery_utils.os, "cpu_count", lambda: 8)
+    results = export_all_formats(_model(), "default", str(tmp_path), formats=("step", "dxf", "svg"))
+    assert sorted(results) == ["dxf", "step", "svg"]
+
+
+def _circles(path):
+    return sorted(
+        (round(c['center'][0], 2), round(c['center'][1], 2), round(c['diameter'], 2))
+        for c in parse_dxf(str(path)).get_circles()
+    )
+
+
+def test_section_stack_matches_export_dxf(tmp_path):
+    """高さごとのファイルがexport_dxf()の断面と一致し、1ファイル時は高さごとのレイヤーになる"""
+    model = _model()
+    heights = [-1.0, 0.0, 1.0]
+
+    paths = export_section_stack(model, str(tmp_path / "stack.dxf"), heights, "XY", separate_files=True)
+    assert sorted(paths) == heights
+    for height in heights:
+        expected = tmp_path / f"single_{height}.dxf"
+        assert export_dxf(model, str(expected), "XY", height)
+        assert len(_circles(paths[height])) == 1
+        assert _circles(paths[height]) == _circles(expected)
+
+    layered = export_section_stack(model, str(tmp_path / "layers.dxf"), heights, "XY")
+    assert set(layered.values()) == {str(tmp_path / "layers.dxf")}
+    doc = ezdxf.readfile(str(tmp_path / "layers.dxf"))
+    layers = {entity.dxf.layer for entity in doc.modelspace()}
+    assert layers == {"XY_-1", "XY_0", "XY_1"}
+    assert len(doc.modelspace().query('CIRCLE[layer=="XY_1"]')) == 1
+
+
+def test_section_stack_close_heights_get_distinct_files(tmp_path):
+    """近い高さの断面は丸められず、別々のファイル・レイヤーに書き出される"""
+    model = _model()
+    paths = export_section_stack(
+        model, str(tmp_path / "s.dxf"), [1.21, 1.24, 1.0, 1.0000001, 1e-07], "XY", separate_files=True
+    )
+    assert paths == {
+        1.21: str(tmp_path / "s_h1.21.dxf"), 1.24: str(tmp_path / "s_h1.24.dxf"),
+        1.0: str(tmp_path / "s_h1.dxf"), 1.0000001: str(tmp_path / "s_h1.0000001.dxf"),
+        1e-07: str(tmp_path / "s_h1e-07.dxf"),
+    }
+    assert all(Path(path).exists() for path in paths.values())
+    # 近接した平面の断面もそれぞれ穴を含む
+    assert _circles(paths[1.0]) == _circles(paths[1.0000001]) == _circles(paths[1.21])
+    assert len(_circles(paths[1.0])) == 1
+
+    layered = export_section_stack(model, str(tmp_path / "layers.dxf"), [1.0, 1.0000001], "XY")
+    assert set(layered) == {1.0, 1.0000001}
+    doc = ezdxf.readfile(str(tmp_path / "layers.dxf"))
+    assert {entity.dxf.layer for entity in doc.modelspace()} == {"XY_1", "XY_1.0000001"}
+    assert len(doc.modelspace().query('CIRCLE[layer=="XY_1"]')) == 1
+    assert len(doc.modelspace().query('CIRCLE[layer=="XY_1.0000001"]')) == 1
+
+
+def test_tessellation_tolerance_and_adaptive(tmp_path):
+    """許容差の変更で分割がやり直され、適応モードはフィレットの多い板を粗く分割する"""
+    plate = (
+        cq.Workplane("XY").box(200, 200, 5).edges("|Z").fillet(20)
+        .faces(">Z").workplane().rarray(20, 20, 5, 5).hole(3)
+    )
+    default = mesh_statistics(tessellate_model(plate))["triangles"]
+    fine = mesh_statistics(tessellate_model(plate, tolerance=0.01, angular_tolerance=0.05))["triangles"]
+    adaptive = mesh_statistics(tessellate_model(plate, adaptive=True))["triangles"]
+    assert fine > default > adaptive > 0
+    # 細かい分割の後でも、元の許容差に戻せば同じ分割になる
+    assert mesh_statistics(tessellate_model(plate))["triangles"] == default
+
+    assert export_stl(plate, str(tmp_path / "default.stl"))
+    assert export_stl(plate, str(tmp_path / "adaptive.stl"), adaptive=True)
+    default_size = (tmp_path / "default.stl").stat().st_size
+    adaptive_size = (tmp_path / "adaptive.stl").stat().st_size
+    # バイナリSTL: 84バイトのヘッダー + 三角形あたり50バイト
+    assert adaptive_size == 84 + 50 * adaptive < default_size
+
+
+def _triangles(shape):
+    return mesh_statistics(shape)["triangles"]
+
+
+def test_tessellation_without_recorded_params(tmp_path):
+    """許容差の記録がないShapeは既存の分割を破棄し、書き出しは実際のメッシュの許容差を使う"""
+    solids = [cq.Solid.makeBox(10, 10, 10), cq.Solid.makeCylinder(5, 10, cq.Vector(30, 0, 0))]
+    # 複数ソリッドのWorkplaneは呼び出しごとに新しいCompoundになる
+    default = _triangles(tessellate_model(cq.Workplane("XY").newObject(solids)))
+    fine = _triangles(tessellate_model(cq.Workplane("XY").newObject(solids), 0.01, 0.05))
+    assert fine > default
+    assert _triangles(tessellate_model(cq.Workplane("XY").newObject(solids))) == default
+
+    # 他で細かく分割されたShapeは、指定の許容差で分割し直してから書き出す
+    model = _model()
+    expected = _triangles(tessellate_model(_model()))
+    shape = _model().val()
+    shape.mesh(0.01, 0.05)
+    assert export_stl(model, str(tmp_path / "foreign.stl"), mesh=shape, use_cache=True)
+    assert (tmp_path / "foreign.stl").stat().st_size == 84 + 50 * expected
+
+    # 適応モードのメッシュは3MFでも再分割されない
+    mesh = tessellate_model(model, adaptive=True)
+    assert export_3mf(model, str(tmp_path / "adaptive.3mf"), mesh=mesh, use_cache=True)
+    with zipfile.ZipFile(tmp_path / "adaptive.3mf") as archive:
+        xml = archive.read("3D/3dmodel.model").decode()
+    assert xml.count("<triangle ") == _triangles(mesh) < expected
+
+
+def test_stl_binary_by_default(tmp_path):
+    """STLはデフォルトでバイナリ、ascii=Trueでテキストになり、同じ三角形を読み込める"""
+    model = _model()
+    assert export_stl(model, str(tmp_path / "binary.stl"))
+    assert export_stl(model, str(tmp_path / "ascii.stl"), ascii=True)
+
+    binary = (tmp_path / "binary.stl").read_bytes()
+    assert not binary.startswith(b"solid")
+    assert (tmp_path / "ascii.stl").read_bytes().startswith(b"solid")
+
+    triangles = load_stl(str(tmp_path / "binary.stl"))
+    assert len(binary) == 84 + 50 * len(triangles)
+    assert abs(triangles - load_stl(str(tmp_path / "ascii.stl"))).max() < 1e-4
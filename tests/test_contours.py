@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+輪郭復元のテスト
+
+向き・順序がばらばらで端点に誤差のあるLINE/ARCから閉じた輪郭を復元し、
+面積・周長・包含関係（穴）が正しく求まること、
+export_and_verify_dxf()が円形でない穴の直径を検証しないことを検証します。
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import ezdxf
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.contours import snap_points
+from scripts.dxf_parser import DXFParser
+
+
+@pytest.fixture
+def plate_dxf(tmp_path):
+    """100x60の外形（線分の向きはばらばら）、長穴（線分+円弧）、丸穴、離れた正方形と開いた線分"""
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((100, 0), (0, 0))
+    msp.add_line((100, 0), (100, 60))
+    msp.add_line((0, 60), (100, 60))
+    msp.add_line((0, 60), (0, 0))
+    # 長穴: 端点に許容差以内の誤差
+    msp.add_line((30, 25), (60, 25 + 1e-6))
+    msp.add_arc((60, 30), 5, -90, 90)
+    msp.add_line((60, 35), (30, 35))
+    msp.add_arc((30, 30), 5, 90, 270)
+    msp.add_circle((80, 30), 4)
+    msp.add_lwpolyline([(200, 0), (210, 0), (210, 10), (200, 10)], close=True)
+    msp.add_line((300, 0), (310, 0))
+    path = tmp_path / "plate.dxf"
+    doc.saveas(path)
+    return path
+
+
+def test_snap_points_merges_within_tolerance():
+    """許容差以内の点はセル境界をまたいでも同じ節点になる"""
+    points = np.array([[0.0, 0.0], [0.99e-4, 0.0], [1.0, 1.0], [1.0, 1.0 - 0.5e-4], [2.0, 2.0]])
+    nodes = snap_points(points, 1e-4)
+    assert nodes[0] == nodes[1]
+    assert nodes[2] == nodes[3]
+    assert len(set(nodes.tolist())) == 3
+
+
+def test_contours_area_perimeter_and_holes(plate_dxf):
+    """外形・長穴・丸穴・ポリラインの輪郭と包含関係を復元する"""
+    parser = DXFParser(str(plate_dxf), contours=True)
+    assert parser.load()
+    parser.analyze()
+    contours = parser.get_contours()
+
+    assert [round(c["area"], 3) for c in contours] == [
+        6000.0, round(300 + 25 * math.pi, 3), 100.0, round(16 * math.pi, 3)
+    ]
+    assert contours[1]["perimeter"] == pytest.approx(60 + 10 * math.pi, abs=1e-4)
+    assert [c["is_hole"] for c in contours] == [False, True, False, True]
+    assert [c["parent"] for c in contours] == [None, 0, None, 0]
+    assert sorted(contours[1]["entities"]) == [("ARC", 0), ("ARC", 1), ("LINE", 4), ("LINE", 5)]
+    assert contours[2]["entities"] == [("LWPOLYLINE", 0)] * 4
+    assert contours[3]["entities"] == [("CIRCLE", 0)]
+    assert parser.contours["open_edges"] == 1
+
+    report = parser.generate_report()
+    assert "- 閉じた輪郭: 4 個（外形 2, 穴 2）" in report
+    assert "- 閉じていない辺: 1 本" in report
+
+
+def test_section_contours_from_export_dxf(tmp_path):
+    """export_dxf()の断面から外形と穴を復元する（島のある穴は深さ2）"""
+    from scripts.cadquery_utils import export_dxf
+
+    model = (
+        cq.Workplane("XY").box(60, 40, 10)
+        .faces(">Z").workplane().pushPoints([(-15, 0), (15, 0)]).hole(8)
+        .faces(">Z").workplane().rect(20, 20).cutBlind(-5)
+        .union(cq.Workplane("XY").box(6, 6, 10))
+    )
+    path = tmp_path / "section.dxf"
+    assert export_dxf(model, str(path), "XY", 2.0)
+
+    parser = DXFParser(str(path))
+    assert parser.load()
+    parser.analyze()
+    contours = parser.build_contours()
+
+    assert contours["open_edges"] == 0
+    assert contours["depths"].tolist() == [0, 1, 1, 1, 2]
+    assert contours["areas"][0] == pytest.approx(60 * 40)
+    holes = contours["depths"] == 1
+    np.testing.assert_allclose(np.sort(contours["perimeters"][holes])[:2] / math.pi, (8, 8))
+
+
+def test_export_and_verify_dxf_rejects_non_circular_holes(tmp_path, monkeypatch):
+    """円形の穴は直径を検証し、周長から換算できない四角い穴は円形でないとして失敗する"""
+    from tests.test_utils import export_and_verify_dxf
+
+    monkeypatch.chdir(tmp_path)
+    plate = cq.Workplane("XY").box(40, 40, 10)
+    round_hole = plate.faces(">Z").workplane().hole(6)
+    # 周長/πが6になる正方形の穴
+    square_hole = plate.faces(">Z").workplane().rect(1.5 * math.pi, 1.5 * math.pi).cutThruAll()
+
+    assert export_and_verify_dxf(round_hole, "round", "XY", 5.0, 1, expected_diameter=6.0) == (
+        True, "✅ PASS: 1 holes detected, φ6.00mm"
+    )
+    success, message = export_and_verify_dxf(square_hole, "square", "XY", 5.0, 1, expected_diameter=6.0)
+    assert not success
+    assert "non-circular hole" in message
+    assert export_and_verify_dxf(square_hole, "square", "XY", 5.0, 1)[0]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+DXFパーサーのテスト
+
+ストリーミングモード（iterdxf）と通常モードで同じ解析結果・レポートになること、
+バウンディングボックスと形状統計が正しく求まること、列ストアとget_*()が一致することを検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import ezdxf
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.dxf_parser import DXFParser
+
+
+@pytest.fixture
+def sample_dxf(tmp_path):
+    """線分4本の枠と円弧・円を含むDXF（最後のエンティティは円）"""
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    corners = [(0, 0), (40, 0), (40, 30), (0, 30)]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        msp.add_line(start, end)
+    msp.add_arc((20, 30), 5, 0, 180)
+    msp.add_circle((10, 10), 2)
+    msp.add_circle((30, 10), 3)
+    path = tmp_path / "sample.dxf"
+    doc.saveas(path)
+    return path
+
+
+def _analyzed(path, streaming):
+    parser = DXFParser(str(path), streaming=streaming)
+    assert parser.load()
+    parser.analyze()
+    return parser
+
+
+def test_analyze_counts_bbox_and_statistics(sample_dxf):
+    """エンティティ数・バウンディングボックス・形状統計を求める"""
+    parser = _analyzed(sample_dxf, streaming=False)
+
+    assert parser.entity_count == 7
+    assert parser.entity_types == {"LINE": 4, "ARC": 1, "CIRCLE": 2}
+    assert parser.bbox["min"] == pytest.approx((0, 0))
+    assert parser.bbox["max"] == pytest.approx((40, 35))
+
+    assert parser.statistics["LINE"]["total_length"] == pytest.approx(140)
+    assert parser.statistics["LINE"]["min_length"] == pytest.approx(30)
+    assert parser.statistics["CIRCLE"]["min_diameter"] == pytest.approx(4)
+    assert parser.statistics["CIRCLE"]["max_diameter"] == pytest.approx(6)
+    assert parser.statistics["ARC"]["total_length"] == pytest.approx(5 * 3.141592653589793)
+
+
+def test_streaming_matches_in_memory(sample_dxf):
+    """ストリーミングモードは最後のエンティティまで含めて通常モードと同じ結果になる"""
+    in_memory = _analyzed(sample_dxf, streaming=False)
+    streaming = _analyzed(sample_dxf, streaming=True)
+
+    assert streaming.doc is None
+    assert streaming.dxfversion == in_memory.dxfversion
+    assert streaming.entity_types == in_memory.entity_types
+    assert streaming.bbox == in_memory.bbox
+    assert streaming.statistics == in_memory.statistics
+    assert streaming.get_circles() == in_memory.get_circles()
+    assert streaming.get_lines() == in_memory.get_lines()
+    assert streaming.generate_report() == in_memory.generate_report()
+
+
+def test_columnar_stores_back_getters(sample_dxf):
+    """1回の走査で構築した列ストアからget_*()の結果を返す"""
+    parser = _analyzed(sample_dxf, streaming=False)
+
+    assert parser.lines["starts"].shape == (4, 2)
+    np.testing.assert_allclose(parser.lines["ends"][0], (40, 0))
+    np.testing.assert_allclose(parser.circles["radii"], (2, 3))
+    np.testing.assert_allclose(parser.arcs["end_angles"], (180,))
+
+    assert parser.get_circles() == [
+        {"center": (10.0, 10.0), "radius": 2.0, "diameter": 4.0},
+        {"center": (30.0, 10.0), "radius": 3.0, "diameter": 6.0},
+    ]
+    assert [line["length"] for line in parser.get_lines()] == pytest.approx([40, 30, 40, 30])
+
+
+def test_polylines_are_stored_with_offsets(tmp_path):
+    """ポリラインの頂点は連結した配列とオフセットで保持される"""
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0), (10, 0), (10, 5)], close=True)
+    msp.add_lwpolyline([(0, 10), (5, 10)])
+    path = tmp_path / "polylines.dxf"
+    doc.saveas(path)
+
+    parser = DXFParser(str(path))
+    assert parser.load()
+    assert parser.get_polylines() == [
+        {"points": [(0.0, 0.0), (10.0, 0.0), (10.0, 5.0)], "is_closed": True, "vertex_count": 3},
+        {"points": [(0.0, 10.0), (5.0, 10.0)], "is_closed": False, "vertex_count": 2},
+    ]
+    assert parser.polylines["offsets"].tolist() == [0, 3, 5]
+    assert parser.bbox["max"] == pytest.approx((10, 10))
+
+
+def test_vectorized_queries(sample_dxf):
+    """直径範囲・矩形領域・最近傍・中心間距離のクエリ"""
+    parser = _analyzed(sample_dxf, streaming=False)
+
+    assert parser.circles_in_diameter_range(3.9, 4.1).tolist() == [0]
+    assert parser.circles_in_diameter_range(4, 6).tolist() == [0, 1]
+
+    found = parser.entities_in_box((0, 0), (20, 20))
+    assert found["CIRCLE"].tolist() == [0]
+    assert found["LINE"].tolist() == []
+    found = parser.entities_in_box((-1, -1), (41, 36), types=("LINE", "ARC"))
+    assert found["LINE"].tolist() == [0, 1, 2, 3]
+    assert found["ARC"].tolist() == [0]
+    # 円弧は上半分のみなので y=34 までの領域には含まれない
+    assert parser.entities_in_box((-1, -1), (41, 34), types=("ARC",))["ARC"].tolist() == []
+
+    index, distance = parser.nearest_circle((28, 10))
+    assert index == 1 and distance == pytest.approx(2)
+    indices, distances = parser.nearest_circles([(0, 0), (40, 0)])
+    assert indices.tolist() == [0, 1]
+    assert distances == pytest.approx([200 ** 0.5, 200 ** 0.5])
+
+    spacings = parser.hole_spacings()
+    assert spacings.shape == (2, 2)
+    assert spacings[0, 1] == pytest.approx(20)
+    assert parser.hole_spacings([1]).shape == (1, 1)
+
+
+def test_spatial_index_queries(sample_dxf):
+    """空間索引の有無でウィンドウ・最近傍クエリの結果が変わらない"""
+    plain = _analyzed(sample_dxf, streaming=False)
+    parser = DXFParser(str(sample_dxf), spatial_index=True)
+    assert parser.load()
+    parser.analyze()
+    assert parser.index is not None and plain.index is None
+
+    for found in (parser.query_window((35, 5), (45, 15)), plain.query_window((35, 5), (45, 15))):
+        assert found["LINE"].tolist() == [1]
+        assert found["CIRCLE"].tolist() == []
+
+    # 円弧の外側の点は円弧の円周まで、矩形の内側の点は最も近い辺まで
+    assert parser.nearest_entity((20, 37)) == ("ARC", 0, pytest.approx(2))
+    assert parser.nearest_entity((5, 15), types=("LINE",)) == ("LINE", 3, pytest.approx(5))
+    assert parser.nearest_entity((5, 15)) == plain.nearest_entity((5, 15))
+
+    # φ4の穴は左辺から8、φ6の穴は右辺から7
+    np.testing.assert_allclose(parser.hole_edge_distances(), (8, 7))
+    np.testing.assert_allclose(plain.hole_edge_distances(), (8, 7))
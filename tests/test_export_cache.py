@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+CadQueryエクスポートキャッシュのテスト
+
+BRepハッシュの安定性と、未変更モデルの書き出し省略・別名へのハードリンク・
+モデル変更時の再書き出しを検証します。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import cadquery as cq
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.cadquery_utils import export_step, tessellate_model
+from scripts.export_cache import shape_hash
+
+
+def _model(size: float = 20):
+    return cq.Workplane("XY").box(size, 10, 5).faces(">Z").workplane().hole(3)
+
+
+def test_shape_hash_is_stable():
+    """同じ手順のモデルは同じハッシュになり、メッシュ化の有無に依存しない"""
+    model = _model()
+    digest = shape_hash(model)
+    tessellate_model(model)
+
+    assert shape_hash(model) == digest == shape_hash(_model())
+    assert shape_hash(_model(21)) != digest
+
+
+def test_unchanged_model_skips_export(tmp_path, capsys):
+    """未変更なら書き出しを省略し、別名には同じファイルをハードリンクする"""
+    step_path = tmp_path / "part.step"
+    assert export_step(_model(), str(step_path), use_cache=True)
+    mtime = step_path.stat().st_mtime_ns
+    capsys.readouterr()
+
+    assert export_step(_model(), str(step_path), use_cache=True)
+    assert "[CACHED]" in capsys.readouterr().out
+    assert step_path.stat().st_mtime_ns == mtime
+
+    copy_path = tmp_path / "copy.step"
+    assert export_step(_model(), str(copy_path), use_cache=True)
+    assert os.path.samefile(step_path, copy_path)
+    capsys.readouterr()
+
+    # モデルを変更すると書き出し直し、リンク先は変更しない
+    assert export_step(_model(21), str(copy_path), use_cache=True)
+    assert "[CACHED]" not in capsys.readouterr().out
+    assert not os.path.samefile(step_path, copy_path)
+    assert step_path.stat().st_mtime_ns == mtime
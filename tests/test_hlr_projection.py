@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+BRepからの2D投影（隠線処理）のテスト
+
+上面図で穴が正確な円として検出されること、ビューの向き、
+並行生成と逐次生成が同じ図形を出力することを検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import cadquery as cq
+import ezdxf
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.dxf_parser import parse_dxf
+from scripts.hlr_projection import create_native_projections, project_view
+from scripts.svg_parser import parse_svg
+
+
+def _plate():
+    # 40x30x10の板、中心から(10, 5)ずれた位置にφ5の貫通穴
+    return cq.Workplane("XY").box(40, 30, 10).faces(">Z").workplane().center(10, 5).hole(5)
+
+
+def _circles(path):
+    return sorted(
+        (round(c['center'][0], 3), round(c['center'][1], 3), round(c['diameter'], 3))
+        for c in parse_dxf(str(path)).get_circles()
+    )
+
+
+def test_view_orientation():
+    """上面図は(X, Y)、正面図は(X, Z)、側面図は(Y, Z)の範囲になる"""
+    plate = _plate()
+    expected = {"top": (40, 30), "front": (40, 10), "side": (30, 10)}
+    for view, (width, height) in expected.items():
+        bb = project_view(plate, view)["visible"].BoundingBox()
+        assert abs(bb.xlen - width) < 1e-6 and abs(bb.ylen - height) < 1e-6, view
+        assert bb.zlen < 1e-6
+
+
+def test_native_projections_keep_exact_circles(tmp_path):
+    """上面図の穴はDXF/SVGとも円として出力され、隠れ線は別レイヤーになる"""
+    results = create_native_projections(_plate(), "plate", str(tmp_path), hidden=True)
+    assert sorted(results) == ["front", "side", "top"]
+
+    # 上面（可視）と下面（隠れ線）の穴の縁
+    assert _circles(results["top"]["dxf"]) == [(10.0, 5.0, 5.0), (10.0, 5.0, 5.0)]
+    assert _circles(results["front"]["dxf"]) == []
+
+    svg_circles = parse_svg(results["top"]["svg"]).get_circles()
+    assert len(svg_circles) == 2
+    assert {(c["cx"], c["cy"], c["r"]) for c in svg_circles} == {(10.0, -5.0, 2.5)}
+
+    layers = {e.dxf.layer for e in ezdxf.readfile(results["top"]["dxf"]).modelspace()}
+    assert layers == {"VISIBLE", "HIDDEN"}
+
+
+def test_parallel_projections_match_serial(tmp_path):
+    """ワーカープロセスでの生成と逐次生成が同じ図形になる"""
+    serial = create_native_projections(_plate(), "serial", str(tmp_path), formats=("dxf",), workers=1)
+    parallel = create_native_projections(_plate(), "parallel", str(tmp_path), formats=("dxf",), workers=3)
+    for view in ("top", "front", "side"):
+        serial_parser = parse_dxf(serial[view]["dxf"])
+        parallel_parser = parse_dxf(parallel[view]["dxf"])
+        assert serial_parser.entity_types == parallel_parser.entity_types
+        assert _circles(serial[view]["dxf"]) == _circles(parallel[view]["dxf"])
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+メッシュプレビューレンダラーのテスト
+
+立方体のSTLをラスタライズし、STL読み込み（バイナリ/ASCII）、
+カメラ変換、PNG出力が正しく動作することを検証します。
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.mesh_preview import load_stl, render_preview
+
+
+def _cube_triangles(size: float = 10.0) -> np.ndarray:
+    """原点中心の立方体の三角形 (12, 3, 3)"""
+    h = size / 2
+    v = np.array([[x, y, z] for x in (-h, h) for y in (-h, h) for z in (-h, h)])
+    faces = [
+        (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5),
+        (0, 4, 5), (0, 5, 1), (2, 3, 7), (2, 7, 6),
+        (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+    ]
+    return v[np.array(faces)]
+
+
+def _write_binary_stl(path: Path, triangles: np.ndarray):
+    with open(path, 'wb') as f:
+        f.write(b"\0" * 80 + struct.pack("<I", len(triangles)))
+        for tri in triangles:
+            f.write(struct.pack("<12fH", 0, 0, 0, *tri.ravel(), 0))
+
+
+def _write_ascii_stl(path: Path, triangles: np.ndarray):
+    lines = ["solid cube"]
+    for tri in triangles:
+        lines.append("facet normal 0 0 0\nouter loop")
+        lines.extend(f"vertex {x} {y} {z}" for x, y, z in tri)
+        lines.append("endloop\nendfacet")
+    lines.append("endsolid cube")
+    path.write_text("\n".join(lines))
+
+
+def test_load_stl_binary_and_ascii(tmp_path):
+    """バイナリ/ASCIIのSTLから同じ三角形が読み込める"""
+    triangles = _cube_triangles()
+    _write_binary_stl(tmp_path / "cube_bin.stl", triangles)
+    _write_ascii_stl(tmp_path / "cube_ascii.stl", triangles)
+
+    assert np.allclose(load_stl(tmp_path / "cube_bin.stl"), triangles)
+    assert np.allclose(load_stl(tmp_path / "cube_ascii.stl"), triangles)
+
+
+def test_top_view_silhouette_is_square(tmp_path):
+    """平行投影のトップビューで立方体のシルエットが正方形になる"""
+    stl_path = tmp_path / "cube.stl"
+    _write_binary_stl(stl_path, _cube_triangles())
+    output = tmp_path / "cube_top.png"
+
+    image = render_preview(
+        str(stl_path), str(output),
+        imgsize=(100, 100), camera=(0, 0, 0, 0, 0, 0, 100),
+        projection="o", mode="silhouette"
+    )
+
+    covered = (image != image[0, 0]).any(axis=2)
+    rows, cols = np.nonzero(covered)
+    # viewallの余白5%を除いた90x90画素がちょうど埋まる
+    assert covered.sum() == 90 * 90
+    assert (rows.min(), rows.max(), cols.min(), cols.max()) == (5, 94, 5, 94)
+    assert output.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
+
+
+def test_perspective_view_is_shaded(tmp_path):
+    """デフォルト視点（透視投影）では見えている3面が異なる明るさで描画される"""
+    image = render_preview(_cube_triangles(), imgsize=(64, 64))
+
+    colors = {tuple(c) for c in image.reshape(-1, 3)}
+    assert len(colors) >= 4  # 背景 + 3面
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+scriptsパッケージの遅延インポートのテスト
+
+SVGの解析やレンダリングだけを使う場合にcadquery/OCP・solid2・ezdxfが
+読み込まれないこと、公開名が従来通り参照できることを検証します。
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _loaded_modules(statement: str) -> list:
+    """新しいプロセスでstatementを実行し、読み込まれた重い依存パッケージを返す"""
+    code = (
+        f"import json, sys\n{statement}\n"
+        "print(json.dumps([m for m in ('cadquery', 'OCP', 'solid2', 'ezdxf') if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, stdout=subprocess.PIPE, check=True
+    )
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def test_light_imports_skip_heavy_dependencies():
+    """パッケージ本体・SVGParser・OpenSCADRendererのインポートで重い依存を読み込まない"""
+    assert _loaded_modules("import scripts") == []
+    assert _loaded_modules("from scripts import SVGParser, parse_svg") == []
+    assert _loaded_modules("from scripts import OpenSCADRenderer, render_multiple_views") == []
+    assert _loaded_modules("from scripts import DXFParser") == ["ezdxf"]
+
+
+def test_public_names_resolve_lazily():
+    """公開名は定義元モジュールの同じオブジェクトになり、未定義の名前はAttributeError"""
+    import scripts
+    from scripts import svg_parser
+
+    assert scripts.SVGParser is svg_parser.SVGParser
+    assert "parse_svg" in dir(scripts)
+    assert set(scripts.__all__) >= {"OpenSCADRenderer", "export_stl", "DXFParser", "SVGParser"}
+    with pytest.raises(AttributeError):
+        scripts.no_such_name
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+DXF/SVG一括解析のテスト
+
+並列解析の結果が入力順に並び、逐次解析と一致すること、
+1ファイルの失敗が他のファイルに影響しないこと、ワーカーをforkせずに起動することを検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import ezdxf
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import parse_batch
+from scripts.parse_batch import parse_many
+
+
+def _write_dxf(path, radius):
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    msp.add_line((0, 0), (50, 0))
+    msp.add_circle((10, 10), radius)
+    doc.saveas(path)
+    return str(path)
+
+
+def _write_svg(path):
+    path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="50" viewBox="0 0 100 50">'
+        '<circle cx="10" cy="20" r="3"/><path d="M 0 0 L 10 10"/></svg>'
+    )
+    return str(path)
+
+
+def test_parse_many_ordered_and_isolated(tmp_path, monkeypatch):
+    """結果は入力順、失敗したファイルはstatus/errorに記録され、他のファイルは解析される"""
+    broken = tmp_path / "broken.dxf"
+    broken.write_text("not a dxf")
+    paths = [
+        _write_dxf(tmp_path / "a.dxf", 2),
+        str(broken),
+        _write_svg(tmp_path / "top.svg"),
+        str(tmp_path / "missing.dxf"),
+        _write_dxf(tmp_path / "b.dxf", 3),
+        str(tmp_path / "notes.txt"),
+    ]
+    report_paths = [str(tmp_path / f"report_{i}.txt") for i in range(len(paths))]
+
+    # OCPのスレッドを持つプロセスから呼ばれてもよいよう、forkしないコンテキストで起動する
+    start_methods = []
+    executor = parse_batch.ProcessPoolExecutor
+
+    def recording_executor(*args, **kwargs):
+        start_methods.append(kwargs["mp_context"].get_start_method())
+        return executor(*args, **kwargs)
+
+    monkeypatch.setattr(parse_batch, "ProcessPoolExecutor", recording_executor)
+    results = parse_many(paths, workers=2, report_paths=report_paths)
+    assert start_methods and "fork" not in start_methods
+
+    assert [r["path"] for r in results] == paths
+    assert [r["status"] for r in results] == ["success", "failed", "success", "failed", "success", "failed"]
+    assert "Unsupported file type" in results[5]["error"]
+    assert results[0]["data"]["circles"][0]["diameter"] == 4
+    assert results[4]["data"]["circles"][0]["diameter"] == 6
+    assert results[4]["data"]["entity_types"] == {"LINE": 1, "CIRCLE": 1}
+    assert results[2]["data"]["circles"] == [{"cx": 10.0, "cy": 20.0, "r": 3.0, "diameter": 6.0}]
+    assert Path(results[0]["report_path"]).read_text(encoding="utf-8") == results[0]["report"]
+    assert results[1]["report_path"] is None
+
+    serial = parse_many(paths, workers=1, report_paths=report_paths)
+    strip = lambda rs: [{k: v for k, v in r.items() if k != "seconds"} for r in rs]
+    assert strip(serial) == strip(results)
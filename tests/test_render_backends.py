@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+描画バックエンドのテスト
+
+デフォルトバックエンドの選択、バックエンドごとの環境変数、
+autoのプローブ順・フォールバック・結果のキャッシュを（プローブを差し替えて）検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import render_backends
+from scripts.render_backends import backend_env, default_backend, detect_backend, resolve_backend
+
+
+def test_default_backend_from_environment(monkeypatch):
+    """未設定ならxvfb、OPENSCAD_RENDER_BACKENDで変更でき、未知の名前はValueError"""
+    monkeypatch.delenv("OPENSCAD_RENDER_BACKEND", raising=False)
+    assert default_backend() == "xvfb"
+    assert resolve_backend() == "xvfb"
+
+    monkeypatch.setenv("OPENSCAD_RENDER_BACKEND", "egl")
+    assert resolve_backend() == "egl"
+    assert resolve_backend("software") == "software"
+
+    monkeypatch.setenv("OPENSCAD_RENDER_BACKEND", "osmesa")
+    with pytest.raises(ValueError):
+        default_backend()
+    with pytest.raises(ValueError):
+        resolve_backend("opengl")
+
+
+def test_backend_env():
+    """xvfbはDISPLAYを設定し、オフスクリーンはXサーバーを使わずsoftwareのみllvmpipeを指定する"""
+    base = {"PATH": "/usr/bin", "DISPLAY": ":0", "WAYLAND_DISPLAY": "wayland-0"}
+
+    assert backend_env("xvfb", 99, base) == {**base, "DISPLAY": ":99"}
+
+    egl = backend_env("egl", base_env=base)
+    assert egl == {"PATH": "/usr/bin", "EGL_PLATFORM": "surfaceless"}
+
+    software = backend_env("software", base_env=base)
+    assert "DISPLAY" not in software and "WAYLAND_DISPLAY" not in software
+    assert software["LIBGL_ALWAYS_SOFTWARE"] == "1"
+    assert software["GALLIUM_DRIVER"] == "llvmpipe"
+
+    with pytest.raises(ValueError):
+        backend_env("auto", base_env=base)
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """probe_backend()を差し替え、使えるバックエンドの集合とプローブ履歴を返す"""
+    available = set()
+    calls = []
+
+    def probe_backend(backend, executable="openscad", timeout=30.0):
+        calls.append((backend, executable))
+        return backend in available
+
+    monkeypatch.setattr(render_backends, "probe_backend", probe_backend)
+    detect_backend.cache_clear()
+    yield available, calls
+    detect_backend.cache_clear()
+
+
+@pytest.mark.parametrize("usable, expected, probed", [
+    ({"egl", "software"}, "egl", ["egl"]),
+    ({"software"}, "software", ["egl", "software"]),
+    (set(), "xvfb", ["egl", "software"]),
+])
+def test_auto_probes_in_order(probes, usable, expected, probed):
+    """autoはegl→softwareの順にプローブし、どれも使えなければxvfbにフォールバックする"""
+    available, calls = probes
+    available.update(usable)
+
+    assert resolve_backend("auto") == expected
+    assert [backend for backend, _ in calls] == probed
+
+
+def test_auto_probe_cached_per_executable(probes):
+    """プローブ結果は実行ファイルごとにプロセス内でキャッシュされる"""
+    available, calls = probes
+    available.add("software")
+
+    assert resolve_backend("auto") == resolve_backend("auto") == "software"
+    assert len(calls) == 2
+    assert resolve_backend("auto", executable="/opt/openscad/bin/openscad") == "software"
+    assert len(calls) == 4 and calls[-1] == ("software", "/opt/openscad/bin/openscad")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+バッチレンダリングキューのテスト
+
+マニフェストの展開・重複排除と、優先度順の実行・リトライ・ワーカー異常終了時の扱い、
+ワーカーをforkせずに起動して呼び出し元の環境変数を引き継ぐことを
+OpenSCADを使わずに（レンダリング関数を差し替えて）検証します。
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import render_batch
+from scripts.process_pool import worker_context
+from scripts.render_batch import deduplicate, expand_jobs, run_batch
+
+
+def test_expand_jobs_views_defaults_and_paths(tmp_path):
+    """ビューごとに1タスクへ展開し、既定値・相対パス・タプル変換を適用する"""
+    manifest = {
+        "defaults": {"imgsize": [800, 600], "colorscheme": "Tomorrow", "priority": 1},
+        "jobs": [
+            {"scad": "gear.scad", "output": "previews/gear.png", "priority": 10},
+            {"scad": "flange.scad", "output_prefix": "previews/flange", "views": ["front", "top"],
+             "imgsize": [400, 300]},
+            {"scad": "plate.scad", "output": "plate.png",
+             "views": {"custom": {"camera": [0, 0, 0, 45, 0, 30, 100]}}},
+        ],
+    }
+    tasks = expand_jobs(manifest, base_dir=str(tmp_path))
+
+    assert [task["id"] for task in tasks] == ["0", "1:front", "1:top", "2:custom"]
+    assert tasks[0]["scad"] == str(tmp_path / "gear.scad")
+    assert tasks[0]["output"] == str(tmp_path / "previews" / "gear.png")
+    assert tasks[0]["priority"] == 10 and tasks[1]["priority"] == 1
+    assert tasks[0]["options"] == {"imgsize": (800, 600), "colorscheme": "Tomorrow"}
+    assert tasks[1]["options"]["imgsize"] == (400, 300)
+    assert tasks[2]["output"] == str(tmp_path / "previews" / "flange_top.png")
+    assert tasks[3]["output"] == str(tmp_path / "plate_custom.png")
+    assert tasks[3]["options"]["camera"] == (0, 0, 0, 45, 0, 30, 100)
+
+
+def test_expand_jobs_unknown_view(tmp_path):
+    """未知のビュー名はマニフェストのジョブを示すValueErrorになる"""
+    manifest = {"jobs": [{"scad": "gear.scad", "output": "gear.png", "views": ["front", "diagonal"]}]}
+    with pytest.raises(ValueError, match=r"'diagonal' in manifest job 0 \(gear.scad\)"):
+        expand_jobs(manifest, base_dir=str(tmp_path))
+
+
+def test_deduplicate_merges_and_keeps_highest_priority(tmp_path):
+    """同一内容のタスクは1つにまとめ、最も高い優先度で実行する"""
+    job = {"scad": "gear.scad", "output": "gear.png"}
+    manifest = {"jobs": [dict(job, priority=1), {"scad": "other.scad", "output": "o.png"},
+                         dict(job, priority=5)]}
+    unique = deduplicate(expand_jobs(manifest, base_dir=str(tmp_path)))
+
+    assert [task["id"] for task in unique] == ["0", "1"]
+    assert unique[0]["duplicates"] == ["2"]
+    assert unique[0]["priority"] == 5
+
+
+def _fake_render(task):
+    """
+    レンダリングの代わりに実行順を記録する
+
+    出力ファイル名の "fail_once" は1回目だけ失敗、"crash" はワーカープロセスを異常終了させる。
+    """
+    with open(os.environ["RENDER_BATCH_LOG"], "a") as f:
+        f.write(task["id"] + "\n")
+    name = Path(task["output"]).name
+    if "crash" in name:
+        os._exit(1)
+    marker = Path(task["output"] + ".attempted")
+    if "fail_once" in name and not marker.exists():
+        marker.touch()
+        return {"success": False, "error": "first attempt failed", "seconds": 0.0, "metrics": None}
+    return {"success": True, "error": None, "seconds": 0.0, "metrics": None}
+
+
+@pytest.fixture
+def fake_render(tmp_path, monkeypatch):
+    """レンダリング関数を差し替え、実行順のログファイルを返す"""
+    log = tmp_path / "order.log"
+    monkeypatch.setenv("RENDER_BATCH_LOG", str(log))
+    monkeypatch.setattr(render_batch, "_render_task", _fake_render)
+    return log
+
+
+def _tasks(tmp_path, jobs):
+    manifest = {"jobs": [{"scad": "m.scad", "output": output, "priority": priority}
+                         for output, priority in jobs]}
+    return deduplicate(expand_jobs(manifest, base_dir=str(tmp_path)))
+
+
+def test_run_batch_priority_order_and_retry(tmp_path, fake_render):
+    """優先度の高い順に実行し、失敗したタスクは同じ優先度でリトライする"""
+    tasks = _tasks(tmp_path, [("low.png", 1), ("fail_once.png", 5), ("high.png", 10), ("mid.png", 5)])
+    results = run_batch(tasks, workers=1, retries=1, backend="software")
+
+    assert fake_render.read_text().split() == ["2", "1", "1", "3", "0"]
+    assert [r["status"] for r in results] == ["success"] * 4
+    assert results[1]["attempts"] == 2 and results[1]["error"] is None
+
+
+def test_run_batch_broken_pool_fails_remaining(tmp_path, fake_render):
+    """ワーカーが異常終了しても例外にならず、実行中・未実行のタスクは失敗として記録される"""
+    tasks = _tasks(tmp_path, [("first.png", 10), ("crash.png", 5), ("never.png", 1)])
+    results = run_batch(tasks, workers=1, retries=3, backend="software")
+
+    assert [r["status"] for r in results] == ["success", "failed", "failed"]
+    assert results[1]["attempts"] == 1
+    assert "broken" in results[1]["error"] and "broken" in results[2]["error"]
+    assert results[2]["attempts"] == 0
+    assert fake_render.read_text().split() == ["0", "1"]
+    json.dumps(results)
+
+
+def test_run_batch_workers_see_caller_environment(tmp_path, monkeypatch, fake_render):
+    """ワーカーはforkせずに起動し、forkserverの起動後に変更した環境変数も引き継ぐ"""
+    # 先にforkserverを起動しておく
+    with ProcessPoolExecutor(max_workers=1, mp_context=worker_context()) as executor:
+        executor.submit(os.getpid).result()
+
+    start_methods = []
+
+    def recording_executor(*args, **kwargs):
+        start_methods.append(kwargs["mp_context"].get_start_method())
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    monkeypatch.setattr(render_batch, "ProcessPoolExecutor", recording_executor)
+    log = tmp_path / "later.log"
+    monkeypatch.setenv("RENDER_BATCH_LOG", str(log))
+    results = run_batch(_tasks(tmp_path, [("a.png", 1)]), workers=1, backend="software")
+
+    assert start_methods and "fork" not in start_methods
+    assert results[0]["status"] == "success"
+    assert log.read_text().split() == ["0"]
+
+
+def _fake_render_on_display(task):
+    """ワーカーのXvfbプールからディスプレイを借りて、起動したサーバーのPIDを記録する"""
+    from scripts import xvfb_pool
+
+    # ワーカープロセスはforkされないため、偽のXvfbへの差し替えはワーカー内で行う
+    script = os.environ["FAKE_XVFB_SCRIPT"]
+    xvfb_pool.X11_SOCKET_DIR = Path(os.environ["FAKE_X11_SOCKET_DIR"])
+    xvfb_pool.xvfb_command = lambda display, screen="": [sys.executable, script, f":{display}"]
+
+    pool = render_batch._worker_pool
+    with pool.display() as display:
+        with open(os.environ["RENDER_BATCH_LOG"], "a") as f:
+            f.write(f"{pool._processes[display].pid}\n")
+    return {"success": True, "error": None, "seconds": 0.0, "metrics": None}
+
+
+def test_run_batch_stops_worker_xvfb(tmp_path, monkeypatch, fake_render):
+    """バッチ終了時に各ワーカーが起動したXvfbは停止される"""
+    from test_xvfb_pool import FAKE_XVFB
+
+    socket_dir = tmp_path / "x11"
+    socket_dir.mkdir()
+    script = tmp_path / "fake_Xvfb.py"
+    script.write_text(FAKE_XVFB)
+    monkeypatch.setenv("FAKE_X11_SOCKET_DIR", str(socket_dir))
+    monkeypatch.setenv("FAKE_XVFB_SCRIPT", str(script))
+    monkeypatch.setenv("OPENSCAD_XVFB_POOL_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(render_batch, "_render_task", _fake_render_on_display)
+
+    tasks = _tasks(tmp_path, [("a.png", 1), ("b.png", 1)])
+    results = run_batch(tasks, workers=2, base_display=299, backend="xvfb")
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    pids = {int(pid) for pid in fake_render.read_text().split()}
+    assert pids and not any(Path(f"/proc/{pid}").exists() for pid in pids)
+    assert not list(socket_dir.iterdir())
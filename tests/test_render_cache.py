@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+レンダリングキャッシュのテスト
+
+キャッシュキーが依存ファイル・オプション・描画バックエンドの変更を反映すること、
+ヒット/ミスの集計、容量超過時のLRU削除を検証します。
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.render_cache import RenderCache, collect_dependencies
+
+
+def _write_model(tmp_path: Path):
+    """STLをimportするSCADファイル（convert_to_openscad()の出力と同形式）を作成"""
+    stl_path = tmp_path / "part.stl"
+    stl_path.write_text("solid part\nendsolid part\n")
+    lib_path = tmp_path / "lib.scad"
+    lib_path.write_text("module lib() { cube(1); }\n")
+    scad_path = tmp_path / "part.scad"
+    scad_path.write_text(
+        '// import("commented_out.stl");\n'
+        "use <lib.scad>\n"
+        'import("part.stl");\n'
+    )
+    return scad_path, stl_path, lib_path
+
+
+def test_collect_dependencies(tmp_path):
+    """import()/useの依存ファイルを収集し、コメントは無視する"""
+    scad_path, stl_path, lib_path = _write_model(tmp_path)
+
+    dependencies = collect_dependencies(str(scad_path))
+
+    assert set(dependencies) == {stl_path.resolve(), lib_path.resolve()}
+
+
+def test_key_changes_with_dependencies_and_options(tmp_path):
+    """依存ファイルやオプションが変わるとキーも変わる"""
+    scad_path, stl_path, _ = _write_model(tmp_path)
+    cache = RenderCache(tmp_path / "cache")
+    options = ["--imgsize", "800,600", "--colorscheme", "Tomorrow"]
+
+    key = cache.compute_key(str(scad_path), options)
+    assert key == cache.compute_key(str(scad_path), list(options))
+    assert key != cache.compute_key(str(scad_path), options + ["--render"])
+
+    # バックエンドが異なる画像は別のキーになる
+    software = cache.compute_key(str(scad_path), options, backend="software")
+    assert software == cache.compute_key(str(scad_path), options, backend="software")
+    assert len({key, software, cache.compute_key(str(scad_path), options, backend="xvfb")}) == 3
+
+    stl_path.write_text("solid part\nfacet normal 0 0 1\nendsolid part\n")
+    assert key != cache.compute_key(str(scad_path), options)
+
+
+def test_fetch_store_and_counters(tmp_path):
+    """保存した画像がヒット時に復元され、節約時間が集計される"""
+    cache = RenderCache(tmp_path / "cache")
+    rendered = tmp_path / "rendered.png"
+    rendered.write_bytes(b"png-data")
+
+    restored = tmp_path / "restored.png"
+    assert not cache.fetch("abc", str(restored))
+
+    cache.store("abc", str(rendered), render_seconds=1.5)
+    assert cache.fetch("abc", str(restored))
+    assert restored.read_bytes() == b"png-data"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["saved_seconds"] == 1.5
+
+
+def test_lru_eviction(tmp_path):
+    """容量を超えると最終使用時刻の古いエントリから削除される"""
+    cache = RenderCache(tmp_path / "cache", max_bytes=250)
+    image = tmp_path / "image.png"
+    image.write_bytes(b"x" * 100)
+
+    cache.store("old", str(image))
+    cache.store("new", str(image))
+    # "old"の最終使用時刻を過去にずらす
+    old_entry = cache.cache_dir / "old.png"
+    os.utime(old_entry, (1, 1))
+
+    cache.store("newest", str(image))
+
+    assert not old_entry.exists()
+    assert (cache.cache_dir / "new.png").exists()
+    assert (cache.cache_dir / "newest.png").exists()
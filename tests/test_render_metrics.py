@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+レンダリング計測のテスト
+
+OpenSCADのstderrログからのフェーズ推定と、
+JSON Lines / Prometheus textfileへの記録を検証します。
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.render_metrics import RenderMetricsRecorder, RenderResult, parse_phases
+
+
+def test_parse_phases_from_render_log():
+    """CGALの開始/終了行からフェーズを分割し、OpenSCAD自身の計測値を優先する"""
+    stderr_lines = [
+        (0.1, "Parsing design (AST generation)...\n"),
+        (0.3, "Rendering Polygon Mesh using CGAL...\n"),
+        (2.0, "Total rendering time: 0:00:01.650\n"),
+    ]
+
+    phases = parse_phases(stderr_lines, wall_seconds=2.5)
+
+    assert phases["spawn"] == 0.1
+    assert abs(phases["compile"] - 0.2) < 1e-9
+    assert phases["cgal"] == 1.65
+    assert abs(phases["rasterize"] - 0.5) < 1e-9
+
+
+def test_result_is_truthy_and_recorded(tmp_path):
+    """RenderResultは成功可否で真偽評価され、記録先に集計される"""
+    jsonl_path = tmp_path / "metrics.jsonl"
+    prom_path = tmp_path / "metrics.prom"
+    metrics = RenderMetricsRecorder(str(jsonl_path), str(prom_path))
+
+    ok = RenderResult(True, "a.scad", "a.png", wall_seconds=1.5,
+                      phases={"cgal": 1.0}, peak_rss_bytes=1024, output_bytes=10)
+    failed = RenderResult(False, "b.scad", "b.png", error="boom", stderr="ERROR: boom")
+    assert ok and not failed
+
+    metrics.record(ok)
+    metrics.record(failed)
+
+    records = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert [r["success"] for r in records] == [True, False]
+    assert "stderr" not in records[1]
+
+    prom = prom_path.read_text()
+    assert 'openscad_render_total{status="success"} 1' in prom
+    assert 'openscad_render_total{status="failure"} 1' in prom
+    assert 'openscad_render_phase_seconds_total{phase="cgal"} 1.000000' in prom
+    assert "openscad_render_peak_rss_bytes 1024" in prom
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+複数ビューのレンダリングのテスト
+
+OpenSCADの代わりに出力ファイル名に応じて待機・失敗する偽 `openscad` をPATHに置き、
+逐次・並行のどちらでも結果がビューの順に揃い、失敗・例外が同じ形でerrorsに記録されること、
+evaluate_once時は全ビューのキャッシュを確認してからジオメトリを評価すること、
+キャッシュが描画バックエンドごとに分かれることを検証します。
+"""
+
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.render_cache import RenderCache
+from scripts.renderer import OpenSCADRenderer, render_multiple_views
+
+
+# 偽のOpenSCAD: 出力ファイル名の "slow" は待機、"fail" はエラー終了。終了順に出力ファイル名を記録する
+FAKE_OPENSCAD = textwrap.dedent(f'''\
+    #!{sys.executable}
+    import os, sys, time
+    if "--version" in sys.argv:
+        print("OpenSCAD version 2021.01", file=sys.stderr)
+        sys.exit(0)
+    output = sys.argv[sys.argv.index("-o") + 1]
+    name = os.path.basename(output)
+    if "slow" in name:
+        time.sleep(0.5)
+    with open(os.environ["FAKE_OPENSCAD_LOG"], "a") as f:
+        f.write(name + "\\n")
+    if "fail" in name:
+        print("ERROR: fake failure", file=sys.stderr)
+        sys.exit(1)
+    with open(output, "wb") as f:
+        f.write(b"PNG")
+''')
+
+
+@pytest.fixture
+def fake_openscad(tmp_path, monkeypatch):
+    """偽のopenscadをPATHの先頭に置き、出力ファイル名の記録先を返す"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "openscad"
+    script.write_text(FAKE_OPENSCAD)
+    script.chmod(0o755)
+    log = tmp_path / "openscad.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_OPENSCAD_LOG", str(log))
+    return log
+
+
+@pytest.fixture
+def raising_view(monkeypatch):
+    """出力ファイル名に "boom" を含むビューのrender()を例外にする"""
+    render = OpenSCADRenderer.render
+
+    def raising_render(self, scad_file, output_file, **kwargs):
+        if "boom" in Path(output_file).name:
+            raise RuntimeError("renderer crashed")
+        return render(self, scad_file, output_file, **kwargs)
+
+    monkeypatch.setattr(OpenSCADRenderer, "render", raising_render)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_views_in_order_with_same_error_contract(tmp_path, fake_openscad, raising_view, max_workers):
+    """完了順に関わらず結果はビューの順になり、失敗・例外はerrorsに記録される"""
+    scad = tmp_path / "model.scad"
+    scad.write_text("cube(1);\n")
+    views = {"slow": {}, "fail": {}, "boom": {}, "fast": {}}
+    errors = {}
+    prefix = str(tmp_path / "model")
+
+    results = render_multiple_views(
+        str(scad), prefix, views, max_workers=max_workers, errors=errors, backend="software"
+    )
+
+    assert list(results) == ["slow", "fast"]
+    assert results == {"slow": f"{prefix}_slow.png", "fast": f"{prefix}_fast.png"}
+    assert list(errors) == ["fail", "boom"]
+    assert "fake failure" in errors["fail"]
+    assert errors["boom"] == "renderer crashed"
+    if max_workers > 1:
+        # 並行実行では待機中のビューより先に他のビューが終わる
+        assert fake_openscad.read_text().split()[-1] == "model_slow.png"
+
+
+def test_evaluate_once_checks_cache_before_evaluation(tmp_path, fake_openscad):
+    """全ビューがキャッシュにあれば評価せず、ミスしたビューがあれば評価してそのビューだけ描画する"""
+    scad = tmp_path / "model.scad"
+    scad.write_text("cube(1);\n")
+    prefix = str(tmp_path / "model")
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+    views = {"front": {"camera": (0, -150, 50, 60, 0, 0, 250)}, "top": {"camera": (0, 0, 200, 0, 0, 0, 250)}}
+
+    def render(views):
+        fake_openscad.write_text("")
+        results = render_multiple_views(
+            str(scad), prefix, views, cache=cache, evaluate_once=True, backend="software"
+        )
+        return results, fake_openscad.read_text().split()
+
+    results, calls = render(views)
+    assert list(results) == ["front", "top"]
+    assert calls == ["model.off", "model_front.png", "model_top.png"]
+
+    results, calls = render(views)
+    assert list(results) == ["front", "top"]
+    assert calls == [] and cache.hits == 2
+
+    # 追加したビューだけがミスする
+    views = {"iso": {"camera": (100, -100, 100, 55, 0, 45, 300)}, **views}
+    results, calls = render(views)
+    assert list(results) == ["iso", "front", "top"]
+    assert calls == ["model.off", "model_iso.png"]
+
+    # 元のSCADファイルが変わると全ビューを評価し直す
+    scad.write_text("cube(2);\n")
+    assert render(views)[1] == ["model.off", "model_iso.png", "model_front.png", "model_top.png"]
+
+
+def test_cache_is_per_backend(tmp_path, fake_openscad):
+    """別のバックエンドで描画した画像はキャッシュから返さない"""
+    scad = tmp_path / "model.scad"
+    scad.write_text("cube(1);\n")
+    cache = RenderCache(cache_dir=str(tmp_path / "cache"))
+
+    for backend in ("software", "software", "egl"):
+        with OpenSCADRenderer(cache=cache, backend=backend) as renderer:
+            assert renderer.render(str(scad), str(tmp_path / "model.png"))
+
+    assert fake_openscad.read_text().split() == ["model.png", "model.png"]
+    assert cache.hits == 1
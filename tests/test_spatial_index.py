@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+空間索引（一様グリッド）のテスト
+
+ウィンドウクエリと最近傍クエリが全件走査と同じ結果になること、
+長い斜めの線分が多数あっても登録数がエンティティ数に比例する範囲に収まることを検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.spatial_index import MAX_CELLS_PER_ENTITY, GridIndex
+
+
+def _random_boxes(rng, count, size):
+    mins = rng.random((count, 2)) * 100
+    return mins, mins + rng.random((count, 2)) * size
+
+
+def test_window_query_matches_brute_force():
+    """索引のウィンドウクエリはバウンディングボックスの重なり判定の全件走査と一致する"""
+    rng = np.random.default_rng(1)
+    extents = {"LINE": _random_boxes(rng, 500, 3), "CIRCLE": _random_boxes(rng, 50, 20)}
+    index = GridIndex(extents)
+    assert len(index) == 550
+
+    for _ in range(50):
+        low = rng.random(2) * 120 - 10
+        high = low + rng.random(2) * 15
+        found = index.query(low, high)
+        for dxftype, (mins, maxs) in extents.items():
+            expected = np.flatnonzero(np.all(maxs >= low, axis=1) & np.all(mins <= high, axis=1))
+            assert found[dxftype].tolist() == expected.tolist()
+
+    assert list(index.query((0, 0), (100, 100), types=["CIRCLE"])) == ["CIRCLE"]
+    assert index.query((500, 500), (600, 600))["LINE"].tolist() == []
+
+
+def test_long_diagonals_do_not_fill_every_cell():
+    """多数のセルにまたがるエンティティはセルに登録せず、クエリ結果は全件走査と一致する"""
+    rng = np.random.default_rng(2)
+    small = _random_boxes(rng, 20000, 0.5)
+    # 図面全体を横切る斜めの線分のバウンディングボックス
+    starts = rng.random((200, 2)) * 10
+    diagonals = (starts, starts + 90)
+    extents = {"LINE": (np.concatenate([small[0], diagonals[0]]), np.concatenate([small[1], diagonals[1]]))}
+    index = GridIndex(extents)
+
+    assert len(index._entries) <= len(index) * MAX_CELLS_PER_ENTITY
+    assert len(index._large) >= 200
+    for _ in range(20):
+        low = rng.random(2) * 100
+        high = low + rng.random(2) * 5
+        mins, maxs = extents["LINE"]
+        expected = np.flatnonzero(np.all(maxs >= low, axis=1) & np.all(mins <= high, axis=1))
+        assert index.query(low, high)["LINE"].tolist() == expected.tolist()
+
+
+def test_nearest_uses_distance_function():
+    """最近傍クエリはウィンドウを広げながら距離関数の最小値を返す"""
+    points = np.array([[0.0, 0.0], [50.0, 50.0], [99.0, 1.0]])
+    index = GridIndex({"POINT": (points, points)}, cell_size=1.0)
+
+    def distance(dxftype, ids):
+        return np.linalg.norm(points[ids] - target, axis=1)
+
+    target = np.array([90.0, 10.0])
+    assert index.nearest(target, distance) == ("POINT", 2, np.hypot(9, 9))
+    target = np.array([-500.0, -500.0])
+    assert index.nearest(target, distance)[1] == 0
+
+    empty = GridIndex({"POINT": (np.empty((0, 2)), np.empty((0, 2)))})
+    assert empty.nearest((0, 0), distance) is None
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+SVGパーサーのテスト
+
+ストリーミングモード（iterparse）と通常モードで同じ解析結果・レポートになること、
+名前空間なしのSVGも同じ規則で抽出されることを検証します。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.svg_parser import SVGParser
+
+
+NAMESPACED_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="100mm" height="50mm" viewBox="-5 0 100 50">'
+    '<g stroke="black"><g>'
+    '<path id="outline" d="M 0 0 L 10 0 L 10 10 Z"/><path d="M 1 1 L 2 2"/>'
+    '<circle cx="10" cy="20" r="3"/><circle cx="30" cy="20" r="4"/>'
+    '</g><rect x="1" y="2" width="3" height="4"/></g>'
+    '<line x1="0" y1="0" x2="3" y2="4"/>'
+    '<text x="1" y="2">A<tspan>1</tspan></text>'
+    '</svg>'
+)
+
+PLAIN_SVG = (
+    '<svg width="20" height="10"><g><circle cx="1" cy="2" r="0.5"/></g>'
+    '<path d="M 0 0 L 1 1"/></svg>'
+)
+
+
+def _analyzed(path, streaming):
+    parser = SVGParser(str(path), streaming=streaming)
+    assert parser.load()
+    parser.analyze()
+    return parser
+
+
+def _extracted(parser):
+    return (parser.get_paths(), parser.get_circles(), parser.get_rects(),
+            parser.get_lines(), parser.get_texts())
+
+
+@pytest.mark.parametrize("content", [NAMESPACED_SVG, PLAIN_SVG])
+def test_streaming_matches_in_memory(tmp_path, content):
+    """ストリーミングモードは通常モードと同じ要素数・要素情報・レポートになる"""
+    path = tmp_path / "drawing.svg"
+    path.write_text(content)
+    in_memory = _analyzed(path, streaming=False)
+    streaming = _analyzed(path, streaming=True)
+
+    assert streaming.tree is None
+    assert streaming.element_types == in_memory.element_types
+    assert (streaming.viewbox, streaming.width, streaming.height) == \
+        (in_memory.viewbox, in_memory.width, in_memory.height)
+    assert _extracted(streaming) == _extracted(in_memory)
+    assert streaming.generate_report() == in_memory.generate_report()
+
+
+def test_extracted_elements(tmp_path):
+    """入れ子のグループ内の要素も抽出し、要素数はルート要素を含めて数える"""
+    path = tmp_path / "drawing.svg"
+    path.write_text(NAMESPACED_SVG)
+    parser = _analyzed(path, streaming=True)
+
+    assert parser.viewbox == {"min_x": -5, "min_y": 0, "width": 100, "height": 50}
+    assert parser.width == 100
+    assert parser.element_types == {
+        "svg": 1, "g": 2, "path": 2, "circle": 2, "rect": 1, "line": 1, "text": 1, "tspan": 1
+    }
+    assert [p["command_count"] for p in parser.get_paths()] == [4, 2]
+    assert [c["diameter"] for c in parser.get_circles()] == [6, 8]
+    assert parser.get_lines()[0]["length"] == pytest.approx(5)
+    assert parser.get_texts() == [{"text": "A", "x": 1.0, "y": 2.0}]
+
+
+def test_streaming_load_failure(tmp_path):
+    """ルート要素を読めないファイルはload()がFalseを返す"""
+    path = tmp_path / "empty.svg"
+    path.write_text("")
+    assert not SVGParser(str(path), streaming=True).load()
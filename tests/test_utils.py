@@ -12,9 +12,14 @@ from typing import Optional, List, Tuple
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import cadquery as cq
+import numpy as np
 from scripts.dxf_parser import parse_dxf
 
 
+# 円形とみなす真円度 4πA/P² の下限（円・全周の円弧の輪郭は1、正方形はπ/4）
+MIN_CIRCULARITY = 0.999
+
+
 def export_and_verify_dxf(
     model,
     test_name: str,
@@ -33,7 +38,7 @@ def export_and_verify_dxf(
         section_plane: "XY" or "XZ"
         section_height: 断面の高さ
         expected_circles: 期待される円の数
-        expected_diameter: 期待される直径（Noneなら検証しない）
+        expected_diameter: 期待される直径（Noneなら検証しない。円形でない穴があれば失敗）
         tolerance: 許容誤差
 
     Returns:
@@ -58,20 +63,33 @@ def export_and_verify_dxf(
         if not parser:
             return False, "DXF parse failed"
 
-        circles = parser.get_circles()
+        # 断面の輪郭を復元し、外形の内側の輪郭（穴）を数える
+        contours = parser.build_contours()
+        holes = np.flatnonzero(contours["depths"] % 2 == 1)
+        # 穴の直径（周長から換算。円形の穴でのみ意味を持つ）
+        areas, perimeters = contours["areas"][holes], contours["perimeters"][holes]
+        diameters = perimeters / np.pi
+        circularity = 4 * np.pi * areas / perimeters ** 2
 
-        # 円の数を検証
-        if len(circles) != expected_circles:
-            return False, f"Expected {expected_circles} circles, got {len(circles)}"
+        # 穴の数を検証
+        if len(holes) != expected_circles:
+            return False, f"Expected {expected_circles} holes, got {len(holes)}"
 
         # 直径を検証（指定されている場合）
         if expected_diameter is not None:
-            for i, circle in enumerate(circles):
-                diameter = circle['diameter']
-                if abs(diameter - expected_diameter) > tolerance:
-                    return False, f"Circle {i+1}: Expected φ{expected_diameter}mm, got φ{diameter:.2f}mm"
-
-        return True, f"✅ PASS: {len(circles)} circles detected, φ{circles[0]['diameter']:.2f}mm"
+            non_circular = np.flatnonzero(circularity < MIN_CIRCULARITY)
+            if len(non_circular):
+                i = non_circular[0]
+                return False, (f"Hole {i+1}: non-circular hole (circularity {circularity[i]:.3f}), "
+                               f"cannot check φ{expected_diameter}mm")
+            mismatched = np.flatnonzero(np.abs(diameters - expected_diameter) > tolerance)
+            if len(mismatched):
+                i = mismatched[0]
+                return False, f"Hole {i+1}: Expected φ{expected_diameter}mm, got φ{diameters[i]:.2f}mm"
+
+        if expected_diameter is None or not len(holes):
+            return True, f"✅ PASS: {len(holes)} holes detected"
+        return True, f"✅ PASS: {len(holes)} holes detected, φ{diameters[0]:.2f}mm"
 
     except Exception as e:
         return False, f"Exception: {str(e)}"
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Xvfbディスプレイプールのテスト
+
+Xvfbの代わりにX11ソケットを作るだけの偽サーバーを起動し、
+リース/リリース、アイドルタイムアウトを超えたサーバーの停止（プール作成時・lease()時）、
+プロセス終了時の停止を検証します。
+"""
+
+import os
+import re
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import xvfb_pool
+from scripts.xvfb_pool import XvfbDisplayPool
+
+
+# 偽のXvfb: ":<番号>" のソケットを作って待ち受けるだけ（ファイル名にXvfbを含める）
+FAKE_XVFB = textwrap.dedent('''
+    import os, signal, socket, sys
+    display = sys.argv[1].lstrip(":")
+    path = os.path.join(os.environ["FAKE_X11_SOCKET_DIR"], "X" + display)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(8)
+    def stop(*args):
+        os.unlink(path)
+        sys.exit(0)
+    signal.signal(signal.SIGTERM, stop)
+    while True:
+        conn, _ = sock.accept()
+        conn.close()
+''')
+
+
+@pytest.fixture
+def fake_xvfb(tmp_path, monkeypatch):
+    """偽のXvfbを使うようにプールを差し替え、状態ディレクトリを返す"""
+    socket_dir = tmp_path / "x11"
+    socket_dir.mkdir()
+    script = tmp_path / "fake_Xvfb.py"
+    script.write_text(FAKE_XVFB)
+
+    monkeypatch.setenv("FAKE_X11_SOCKET_DIR", str(socket_dir))
+    monkeypatch.setattr(xvfb_pool, "X11_SOCKET_DIR", socket_dir)
+    monkeypatch.setattr(
+        xvfb_pool, "xvfb_command",
+        lambda display, screen="": [sys.executable, str(script), f":{display}"]
+    )
+    state_dir = tmp_path / "state"
+    yield state_dir
+
+    # テストで残ったサーバーを停止
+    XvfbDisplayPool(size=2, base_display=199, state_dir=str(state_dir), idle_timeout=None).shutdown()
+
+
+def _pool(state_dir, **kwargs):
+    kwargs.setdefault("size", 2)
+    kwargs.setdefault("shutdown_on_exit", False)
+    return XvfbDisplayPool(base_display=199, state_dir=str(state_dir), **kwargs)
+
+
+def _age(state_dir, display, seconds):
+    """ロックファイルの最終使用時刻を過去にずらす"""
+    lock = state_dir / f"display-{display}.lock"
+    past = time.time() - seconds
+    os.utime(lock, (past, past))
+
+
+def test_lease_release_and_shutdown(fake_xvfb):
+    """リースでサーバーを起動し、返却後も再利用され、shutdown()で停止する"""
+    pool = _pool(fake_xvfb, idle_timeout=None)
+    with pool.display() as display:
+        assert display == 199
+        assert xvfb_pool.is_display_ready(199)
+    process = pool._processes[199]
+
+    # 返却済みのサーバーは起動し直さずに貸し出す
+    with pool.display() as display:
+        assert display == 199
+        assert pool._processes[199] is process
+
+    pool.shutdown()
+    assert process.poll() is not None
+    assert not (fake_xvfb / "display-199.pid").exists()
+    assert not xvfb_pool.is_display_ready(199)
+
+
+def test_stale_servers_reaped_on_create_and_lease(fake_xvfb):
+    """最終使用からidle_timeoutを超えたサーバーは、プール作成時とlease()時に停止される"""
+    owner = _pool(fake_xvfb, idle_timeout=None)
+    first, second = owner.lease(), owner.lease()
+    owner.release(first)
+    owner.release(second)
+    processes = dict(owner._processes)
+
+    # 作成時: 古いサーバー(:199)のみ停止
+    _age(fake_xvfb, 199, 120)
+    pool = _pool(fake_xvfb, idle_timeout=60)
+    processes[199].wait(timeout=5)
+    assert processes[200].poll() is None
+
+    # lease()時: 古くなったサーバー(:200)を停止してから貸し出す
+    _age(fake_xvfb, 200, 120)
+    display = pool.lease()
+    processes[200].wait(timeout=5)
+    assert display == 199 and xvfb_pool.is_display_ready(199)
+    pool.release(display)
+
+
+def test_own_servers_stopped_at_exit(fake_xvfb, tmp_path):
+    """プロセス終了時に、そのプロセスが起動したサーバーは停止される"""
+    script = tmp_path / "lease_and_exit.py"
+    script.write_text(textwrap.dedent(f'''
+        import sys
+        sys.path.insert(0, {str(Path(__file__).parent.parent)!r})
+        from scripts import xvfb_pool
+        xvfb_pool.X11_SOCKET_DIR = __import__("pathlib").Path({str(xvfb_pool.X11_SOCKET_DIR)!r})
+        xvfb_pool.xvfb_command = lambda display, screen="": {xvfb_pool.xvfb_command(0)[:2]!r} + [f":{{display}}"]
+        pool = xvfb_pool.XvfbDisplayPool(size=1, base_display=199, state_dir={str(fake_xvfb)!r})
+        with pool.display() as display:
+            print(f"PID={{pool._processes[display].pid}}")
+    '''))
+    output = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, check=True
+    ).stdout
+    pid = int(re.search(r"PID=(\d+)", output).group(1))
+
+    assert not (fake_xvfb / "display-199.pid").exists()
+    assert not xvfb_pool.is_display_ready(199)
+    assert not Path(f"/proc/{pid}").exists()
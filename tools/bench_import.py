@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+scriptsパッケージのインポート時間のベンチマーク
+
+公開名ごとに新しいPythonプロセスで `from scripts import <名前>` を実行し、
+インポートにかかった時間と、読み込まれた重い依存パッケージ（cadquery, OCP, solid2, ezdxf等）を報告する。
+SVGの解析だけを行うCLI等が不要な依存を読み込んでいないかの確認に使う。
+
+Usage:
+    python3 tools/bench_import.py
+    python3 tools/bench_import.py --names SVGParser OpenSCADRenderer --repeats 10
+    python3 tools/bench_import.py --output import_times.json
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+# 読み込まれたかを報告する重い依存パッケージ
+HEAVY_MODULES = ("cadquery", "OCP", "solid2", "ezdxf", "numpy")
+
+# 子プロセスで実行するコード（インポート時間と読み込まれた依存をJSONで出力）
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(statement: str, repeats: int = 5) -> dict:
+    """
+    インポート文を新しいプロセスで繰り返し実行して計測
+
+    Args:
+        statement: 計測するインポート文（例: "from scripts import SVGParser"）
+        repeats: 計測回数
+
+    Returns:
+        dict: {"statement", "min", "median", "max", "loaded"}
+    """
+    code = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    seconds = []
+    loaded: List[str] = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True
+        )
+        sample = json.loads(result.stdout.decode().strip().splitlines()[-1])
+        seconds.append(sample["seconds"])
+        loaded = sample["loaded"]
+
+    seconds.sort()
+    return {
+        "statement": statement,
+        "min": seconds[0],
+        "median": seconds[len(seconds) // 2],
+        "max": seconds[-1],
+        "loaded": loaded,
+    }
+
+
+def run_benchmark(names: List[str], repeats: int = 5) -> Dict[str, dict]:
+    """
+    パッケージ本体と公開名ごとのインポート時間を計測
+
+    Args:
+        names: 計測する公開名
+        repeats: 計測回数
+
+    Returns:
+        Dict[str, dict]: {対象: measure_import()の戻り値}
+    """
+    results = {"scripts": measure_import("import scripts", repeats)}
+    for name in names:
+        print(f"Measuring {name}...")
+        results[name] = measure_import(f"from scripts import {name}", repeats)
+    return results
+
+
+def print_report(results: Dict[str, dict]):
+    """計測結果を表形式で表示"""
+    print()
+    print(f"{'target':<36} {'median':>8} {'min':>8} {'max':>8}  loaded")
+    for target, stats in results.items():
+        print(f"{target:<36} {stats['median']:>7.3f}s {stats['min']:>7.3f}s {stats['max']:>7.3f}s  "
+              f"{', '.join(stats['loaded']) or '-'}")
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    sys.path.insert(0, str(ROOT))
+    import scripts
+
+    parser = argparse.ArgumentParser(
+        description="Measure import time of the scripts package per public name"
+    )
+    parser.add_argument(
+        "--names",
+        nargs="+",
+        default=list(scripts.__all__),
+        help="Public names to import (default: all names in scripts.__all__)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Fresh interpreter runs per name (default: 5)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the results to this JSON file"
+    )
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.names, args.repeats)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n[SUCCESS] Results saved: {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+OpenSCADレンダラーのベンチマーク
+
+サンプルのSCADファイル群を、プレビュー/完全レンダリング、透視/平行投影、
+複数の画像サイズの組み合わせでOpenSCADRendererに通し、
+構成ごとのパーセンタイル・スループットを報告する。
+ベースラインのJSONと比較して、遅くなった構成があれば終了コード1を返す。
+
+Usage:
+    # ベースラインを記録
+    python3 tools/bench_renderer.py --output bench_baseline.json
+
+    # 変更後に比較（p50/p95が15%以上悪化した構成を報告）
+    python3 tools/bench_renderer.py --baseline bench_baseline.json --threshold 0.15
+"""
+
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# scriptsモジュールをインポート可能にする
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.renderer import OpenSCADRenderer
+from scripts.render_backends import BACKENDS
+from scripts.render_cache import openscad_version
+
+
+# ベンチマーク対象（リポジトリルートからのglob）
+# SolidPythonのサンプルは.pyのため、生成先のoutputs/solidpythonも対象にする
+DEFAULT_CORPUS = (
+    "examples/openscad/*.scad",
+    "examples/solidpython/*.scad",
+    "outputs/solidpython/*.scad",
+    "outputs/cadquery/*.scad",
+)
+
+DEFAULT_MODES = ("preview", "render")
+DEFAULT_PROJECTIONS = ("p", "o")
+DEFAULT_SIZES = ((320, 240), (800, 600), (1920, 1080))
+
+
+def collect_corpus(patterns=DEFAULT_CORPUS, root: Path = ROOT) -> List[Path]:
+    """
+    ベンチマーク対象のSCADファイルを列挙
+
+    Args:
+        patterns: ルートからのglobパターン
+        root: リポジトリルート
+
+    Returns:
+        List[Path]: SCADファイル（重複なし・ソート済み）
+    """
+    files = set()
+    for pattern in patterns:
+        files.update(path.resolve() for path in root.glob(pattern))
+    return sorted(files)
+
+
+def config_name(mode: str, projection: str, imgsize: tuple) -> str:
+    """構成の識別子（例: "render-p-800x600"）"""
+    return f"{mode}-{projection}-{imgsize[0]}x{imgsize[1]}"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    線形補間によるパーセンタイル
+
+    Args:
+        values: 値のリスト
+        q: 0〜100
+
+    Returns:
+        float: パーセンタイル値
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(seconds: List[float], failures: int) -> dict:
+    """
+    1構成分の計測値を集計
+
+    Args:
+        seconds: 成功したレンダリングの所要時間
+        failures: 失敗数
+
+    Returns:
+        dict: {"runs", "failures", "mean", "p50", "p90", "p95", "p99", "max", "throughput"}
+    """
+    total = sum(seconds)
+    return {
+        "runs": len(seconds),
+        "failures": failures,
+        "mean": total / len(seconds) if seconds else 0.0,
+        "p50": percentile(seconds, 50),
+        "p90": percentile(seconds, 90),
+        "p95": percentile(seconds, 95),
+        "p99": percentile(seconds, 99),
+        "max": max(seconds, default=0.0),
+        # 逐次実行時の1秒あたりのレンダリング数
+        "throughput": len(seconds) / total if total else 0.0,
+    }
+
+
+def run_benchmark(
+    models: List[Path],
+    modes=DEFAULT_MODES,
+    projections=DEFAULT_PROJECTIONS,
+    sizes=DEFAULT_SIZES,
+    repeats: int = 3,
+    warmup: int = 1,
+    backend: str = None,
+    timeout: float = None
+) -> dict:
+    """
+    全構成×全モデルをレンダリングして計測
+
+    計測のばらつきを抑えるため、レンダリングは逐次実行し、キャッシュは使用しない。
+
+    Args:
+        models: SCADファイル
+        modes: "preview" / "render"
+        projections: "p" / "o"
+        sizes: 画像サイズのリスト
+        repeats: モデルごとの計測回数
+        warmup: 計測前にモデルごとに捨てるレンダリング回数
+        backend: 描画バックエンド
+        timeout: 1レンダリングのタイムアウト秒数
+
+    Returns:
+        dict: {"meta": {...}, "configs": {構成名: {集計値, "models": {モデル: p50}}}}
+    """
+    configs = {}
+    bench_start = time.time()
+
+    with tempfile.TemporaryDirectory(prefix="bench_renderer_") as out_dir, \
+            OpenSCADRenderer(backend=backend) as renderer:
+        for mode in modes:
+            for projection in projections:
+                for imgsize in sizes:
+                    name = config_name(mode, projection, imgsize)
+                    print(f"=== {name} ===")
+                    seconds = []
+                    failures = 0
+                    per_model = {}
+
+                    for model in models:
+                        output = str(Path(out_dir) / f"{model.stem}.png")
+                        options = {
+                            "imgsize": imgsize,
+                            "projection": projection,
+                            "render_mode": mode == "render",
+                            "timeout": timeout,
+                        }
+                        for _ in range(warmup):
+                            renderer.render(str(model), output, **options)
+
+                        model_seconds = []
+                        for _ in range(repeats):
+                            result = renderer.render(str(model), output, **options)
+                            if result:
+                                model_seconds.append(result.wall_seconds)
+                            else:
+                                failures += 1
+
+                        seconds.extend(model_seconds)
+                        per_model[str(model.relative_to(ROOT.resolve()))] = (
+                            percentile(model_seconds, 50) if model_seconds else None
+                        )
+
+                    configs[name] = {**summarize(seconds, failures), "models": per_model}
+
+        resolved_backend = renderer.backend
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "openscad": openscad_version(),
+            "backend": resolved_backend,
+            "models": len(models),
+            "repeats": repeats,
+            "warmup": warmup,
+            "wall_seconds": time.time() - bench_start,
+        },
+        "configs": configs,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = 0.15) -> List[dict]:
+    """
+    ベースラインとの比較
+
+    Args:
+        report: run_benchmark()の戻り値
+        baseline: 以前のrun_benchmark()の戻り値
+        threshold: 悪化とみなす比率（0.15 = 15%遅くなったら悪化）
+
+    Returns:
+        List[dict]: 悪化した構成 [{"config", "metric", "baseline", "current", "ratio"}, ...]
+    """
+    regressions = []
+    for name, current in report["configs"].items():
+        previous = baseline.get("configs", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("p50", "p95"):
+            if not previous.get(metric) or not current["runs"]:
+                continue
+            ratio = current[metric] / previous[metric]
+            if ratio > 1 + threshold:
+                regressions.append({
+                    "config": name,
+                    "metric": metric,
+                    "baseline": previous[metric],
+                    "current": current[metric],
+                    "ratio": ratio,
+                })
+    return regressions
+
+
+def print_report(report: dict, baseline: dict = None):
+    """構成ごとの集計値を表形式で表示"""
+    print()
+    print(f"{'config':<24} {'runs':>5} {'fail':>5} {'p50':>8} {'p95':>8} {'max':>8} "
+          f"{'renders/s':>10} {'vs base':>8}")
+    for name, stats in report["configs"].items():
+        delta = ""
+        previous = (baseline or {}).get("configs", {}).get(name)
+        if previous and previous.get("p50") and stats["runs"]:
+            delta = f"{(stats['p50'] / previous['p50'] - 1) * 100:+.1f}%"
+        print(f"{name:<24} {stats['runs']:>5} {stats['failures']:>5} "
+              f"{stats['p50']:>7.2f}s {stats['p95']:>7.2f}s {stats['max']:>7.2f}s "
+              f"{stats['throughput']:>10.2f} {delta:>8}")
+
+
+def main():
+    """コマンドライン実行時のエントリーポイント"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark OpenSCADRenderer over the example corpus"
+    )
+    parser.add_argument(
+        "--corpus",
+        nargs="+",
+        default=list(DEFAULT_CORPUS),
+        help="Glob patterns relative to the repository root (default: examples and outputs)"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=DEFAULT_MODES,
+        default=list(DEFAULT_MODES),
+        help="Render modes to benchmark (default: preview render)"
+    )
+    parser.add_argument(
+        "--projections",
+        nargs="+",
+        choices=DEFAULT_PROJECTIONS,
+        default=list(DEFAULT_PROJECTIONS),
+        help="Projections to benchmark (default: p o)"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=[f"{w}x{h}" for w, h in DEFAULT_SIZES],
+        help="Image sizes as WIDTHxHEIGHT (default: 320x240 800x600 1920x1080)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Measured renders per model and configuration (default: 3)"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Discarded renders per model and configuration (default: 1)"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="GL backend: xvfb, egl, software or auto (default: $OPENSCAD_RENDER_BACKEND or xvfb)"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Timeout per render in seconds"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write the benchmark report (usable as a baseline) to this JSON file"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare against a previous report and exit 1 on regressions"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Relative p50/p95 slowdown treated as a regression (default: 0.15)"
+    )
+
+    args = parser.parse_args()
+
+    models = collect_corpus(args.corpus)
+    if not models:
+        print("[FAILED] No SCAD files matched the corpus patterns")
+        return 1
+
+    sizes = [tuple(int(v) for v in size.lower().split("x")) for size in args.sizes]
+    print(f"Benchmarking {len(models)} models x "
+          f"{len(args.modes) * len(args.projections) * len(sizes)} configurations")
+
+    report = run_benchmark(
+        models,
+        modes=args.modes,
+        projections=args.projections,
+        sizes=sizes,
+        repeats=args.repeats,
+        warmup=args.warmup,
+        backend=args.backend,
+        timeout=args.timeout
+    )
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n[SUCCESS] Report saved: {args.output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"[REGRESSION] {r['config']} {r['metric']}: "
+                  f"{r['baseline']:.2f}s -> {r['current']:.2f}s ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"[SUCCESS] No regressions beyond {args.threshold * 100:.0f}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())